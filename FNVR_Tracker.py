@@ -3,6 +3,9 @@
 Fallout: New Virtual Reality Tracker
 Main entry point - launches GUI by default
 For CLI mode, use: python FNVR_Tracker.py --cli
+To replay a recorded pose trace: python FNVR_Tracker.py --replay pose_trace.npy
+To load test without SteamVR: python FNVR_Tracker.py --load-test 10000
+To record a motion gesture template: python FNVR_Tracker.py --record-motion pose_trace.npy reload.npy
 """
 
 import sys
@@ -11,16 +14,21 @@ from app_gui import FNVRTrackerGUI
 from tracker_logic import TrackerLogic
 
 
-def run_cli_mode():
+def run_cli_mode(record_path=None, backend=None):
     """Run tracker in CLI mode (legacy behavior)"""
     print("Starting FNVR Tracker in CLI mode...")
     tracker = TrackerLogic()
+    if backend:
+        tracker.config_variables['vr_backend'] = backend
     
     # Initialize VR
     if not tracker.init_vr():
         print("Failed to initialize VR. Make sure SteamVR is running.")
         return 1
         
+    if record_path:
+        tracker.start_recording(record_path)
+        
     try:
         # Run tracking loop directly (blocking)
         tracker.running = True
@@ -34,6 +42,63 @@ def run_cli_mode():
     return 0
 
 
+def run_replay_mode(trace_path, realtime=False):
+    """Replay a recorded pose trace through the tracking pipeline without SteamVR"""
+    from pose_trace import TraceReplay
+    
+    print(f"Replaying pose trace: {trace_path}")
+    tracker = TrackerLogic()
+    stats = TraceReplay(trace_path, realtime=realtime).run(tracker)
+    
+    print(f"Frames: {stats['frames']}")
+    print(f"Elapsed: {stats['elapsed_s']:.3f} s")
+    print(f"Throughput: {stats['frames_per_second']:.1f} frames/s "
+          f"({stats['avg_frame_time_ms']:.3f} ms/frame, recorded at {stats['recorded_rate_hz']:.1f} Hz)")
+    if stats['skipped_frames']:
+        print(f"Skipped: {stats['skipped_frames']} frames the tracker could not use")
+    return 1 if stats['stalled'] else 0
+
+
+def run_load_test(frames):
+    """Run the tracking loop against the synthetic backend and print per-stage cost"""
+    from vr_backend import LoadTestBenchmark
+    
+    tracker = TrackerLogic()
+    cfg = tracker.config_variables
+    results = LoadTestBenchmark.benchmark_tracking_loop(
+        tracker, frames,
+        profile=True,
+        controllers=cfg.get('synthetic_controllers', 2),
+        trackers=cfg.get('synthetic_trackers', 0),
+        frame_rate=cfg.get('synthetic_frame_rate', 90.0),
+        dropout_rate=cfg.get('synthetic_dropout_rate', 0.0),
+        dropout_frames=cfg.get('synthetic_dropout_frames', 10),
+        role_swap_interval=cfg.get('synthetic_role_swap_interval', 0.0),
+        seed=cfg.get('synthetic_seed', 0)
+    )
+    
+    print(f"Frames: {results['frames']} in {results['elapsed_s']:.3f} s "
+          f"({results['frames_per_second']:.0f} frames/s, {results['avg_frame_time_ms']:.3f} ms/frame, profiled)")
+    print(f"Device scans: {results['device_scans']}, dropouts: {results['dropouts']}, "
+          f"role changes: {results['role_changes']}")
+    for stage, ms in results['stage_ms_per_frame'].items():
+        print(f"  {stage:<22} {ms:.4f} ms/frame")
+    return 0
+
+
+def run_record_motion(trace_path, output_path, hand='right', segments=None):
+    """Cut motion gesture examples out of a recorded pose trace and save them as a template"""
+    from motion_gestures import record_examples, save_examples
+    
+    examples = record_examples(trace_path, hand, segments)
+    if not len(examples):
+        print("No motions found in the trace")
+        return 1
+    save_examples(output_path, examples)
+    print(f"Saved {len(examples)} {hand} hand examples to {output_path}")
+    return 0
+    
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description="Fallout: New Virtual Reality Tracker")
@@ -42,12 +107,64 @@ def main():
         action="store_true", 
         help="Run in CLI mode without GUI"
     )
+    parser.add_argument(
+        "--record",
+        metavar="TRACE",
+        help="Record raw poses to a .npy trace (CLI mode)"
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="TRACE",
+        help="Replay a recorded .npy trace instead of reading SteamVR"
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Replay at the recorded rate instead of maximum speed"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["openvr", "synthetic"],
+        help="VR backend for CLI mode (overrides config.ini)"
+    )
+    parser.add_argument(
+        "--record-motion",
+        nargs=2,
+        metavar=("TRACE", "TEMPLATE"),
+        help="Save the fast motions of a recorded trace as a motion gesture template (.npy)"
+    )
+    parser.add_argument(
+        "--hand",
+        choices=["left", "right"],
+        default="right",
+        help="Hand to take motions from (--record-motion)"
+    )
+    parser.add_argument(
+        "--segment",
+        nargs=2,
+        type=float,
+        action="append",
+        metavar=("START", "END"),
+        help="Seconds from the trace start to use as one example instead of detecting motions (repeatable)"
+    )
+    parser.add_argument(
+        "--load-test",
+        type=int,
+        metavar="FRAMES",
+        help="Run the tracking loop unpaced against the synthetic backend"
+    )
     
     args = parser.parse_args()
     
-    if args.cli:
+    if args.load_test:
+        return run_load_test(args.load_test)
+    elif args.record_motion:
+        return run_record_motion(*args.record_motion, args.hand, args.segment)
+    elif args.replay:
+        return run_replay_mode(args.replay, args.realtime)
+    elif args.cli:
         # Run in CLI mode
-        return run_cli_mode()
+        return run_cli_mode(args.record, args.backend)
     else:
         # Run with GUI (default)
         app = FNVRTrackerGUI()
@@ -0,0 +1,247 @@
+"""
+Deferred gesture actions
+Runs key presses and other timed actions on a worker thread so gesture
+callbacks return immediately and the tracking loop keeps its cadence
+"""
+
+import math
+import time
+import threading
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class RecordingKeyboard:
+    """
+    Stand-in for the keyboard module that records presses instead of sending them
+    
+    Pass it as the ActionExecutor backend to check action timing without a
+    game window, e.g. in ActionBenchmark.
+    """
+    
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            clock: Time source for the recorded events
+        """
+        self.clock = clock
+        self.events: List[Tuple[float, str, str]] = []  # (time, 'press' or 'release', key)
+        
+    def press(self, key: str):
+        self.events.append((self.clock(), 'press', key))
+        
+    def release(self, key: str):
+        self.events.append((self.clock(), 'release', key))
+        
+    def hold_durations(self, key: str) -> List[float]:
+        """Seconds between each press of a key and its following release"""
+        durations = []
+        pressed = None
+        for timestamp, action, event_key in self.events:
+            if event_key != key:
+                continue
+            if action == 'press':
+                pressed = timestamp
+            elif pressed is not None:
+                durations.append(timestamp - pressed)
+                pressed = None
+        return durations
+        
+
+class ActionExecutor:
+    """
+    Worker thread driven by a hashed timer wheel
+    
+    schedule() only files the action into the wheel slot of its due tick
+    and returns; the worker advances one tick at a time while actions are
+    pending and sleeps when the wheel is empty. Actions never run early and
+    run at most about one tick late. Keys pressed through press_key() are
+    reference counted, so overlapping holds of one key release it only at
+    the last release, and close() releases any key still held.
+    """
+    
+    def __init__(self, keyboard_backend, tick: float = 0.005, slots: int = 512,
+                 logger: Optional[logging.Logger] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            keyboard_backend: Object with press(key) and release(key), e.g. the
+                              keyboard module or a RecordingKeyboard
+            tick: Wheel resolution in seconds
+            slots: Wheel size; actions further out than slots * tick wait extra turns
+            logger: Optional logger instance
+            clock: Monotonic time source
+        """
+        self.keyboard = keyboard_backend
+        self.tick = tick
+        self.slots = [[] for _ in range(max(1, slots))]
+        self.logger = logger or logging.getLogger(__name__)
+        self.clock = clock
+        self.held_keys: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closing = False
+        self._start = clock()
+        self._current_tick = 0  # Next tick the worker processes
+        self._pending = 0
+        
+        # Statistics
+        self.scheduled = 0
+        self.executed = 0
+        self.failures = 0
+        self.max_late = 0.0
+        
+    def schedule(self, delay: float, action: Callable, *args):
+        """
+        Run action(*args) on the worker thread after delay seconds
+        
+        Args:
+            delay: Seconds from now (0 = next tick)
+            action: Callable to run
+            args: Arguments for the action
+        """
+        with self._condition:
+            now = self.clock()
+            if self._pending == 0:
+                # The worker is idle; move the wheel to the present
+                self._current_tick = max(self._current_tick, int((now - self._start) / self.tick))
+            due = now + max(0.0, delay)
+            target = max(self._current_tick, math.ceil((due - self._start) / self.tick))
+            self.slots[target % len(self.slots)].append((target, due, action, args))
+            self._pending += 1
+            self.scheduled += 1
+            
+            if self._thread is None or not self._thread.is_alive():
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name="ActionExecutor", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+            
+    def press_key(self, key: str, duration: float):
+        """Press a key on the next tick and release it duration seconds later"""
+        self.schedule(0.0, self._press, key)
+        self.schedule(duration, self._release, key)
+        
+    def _press(self, key: str):
+        count = self.held_keys.get(key, 0)
+        if count == 0:
+            self.keyboard.press(key)
+        self.held_keys[key] = count + 1
+        
+    def _release(self, key: str):
+        count = self.held_keys.get(key, 0)
+        if count <= 1:
+            self.held_keys.pop(key, None)
+            self.keyboard.release(key)
+        else:
+            self.held_keys[key] = count - 1
+            
+    def _run(self):
+        slots = self.slots
+        while True:
+            with self._condition:
+                while self._pending == 0 and not self._closing:
+                    self._condition.wait()
+                if self._closing:
+                    return
+                    
+                tick = self._current_tick
+                wait = self._start + tick * self.tick - self.clock()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    if self._closing:
+                        return
+                    continue  # Re-check; nothing can have been filed before this tick
+                    
+                slot = slots[tick % len(slots)]
+                ready = [entry for entry in slot if entry[0] <= tick]
+                if ready:
+                    slot[:] = [entry for entry in slot if entry[0] > tick]
+                    self._pending -= len(ready)
+                self._current_tick = tick + 1
+                
+            for _, due, action, args in ready:
+                late = self.clock() - due
+                if late > self.max_late:
+                    self.max_late = late
+                try:
+                    action(*args)
+                    self.executed += 1
+                except Exception:
+                    self.failures += 1
+                    self.logger.exception("Scheduled action failed")
+                    
+    def close(self, timeout: float = 1.0):
+        """Stop the worker, drop pending actions and release any key still held"""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            
+        with self._condition:
+            for slot in self.slots:
+                slot.clear()
+            self._pending = 0
+            self._thread = None
+            
+        for key in list(self.held_keys):
+            try:
+                self.keyboard.release(key)
+            except Exception:
+                self.logger.exception(f"Could not release {key}")
+        self.held_keys.clear()
+        
+    def get_stats(self) -> Dict:
+        """Get counts of scheduled and executed actions and the worst lateness"""
+        return {
+            'scheduled': self.scheduled,
+            'executed': self.executed,
+            'failures': self.failures,
+            'pending': self._pending,
+            'held_keys': sorted(self.held_keys),
+            'max_late_ms': self.max_late * 1000
+        }
+        
+
+class ActionBenchmark:
+    """Checks that gesture actions return immediately and keep their timing"""
+    
+    @staticmethod
+    def benchmark_key_presses(presses: int = 10, duration: float = 0.05, interval: float = 0.02,
+                              tick: float = 0.005) -> Dict:
+        """
+        Press keys through an executor with a RecordingKeyboard
+        
+        Args:
+            presses: Number of key presses
+            duration: Hold time per press in seconds
+            interval: Seconds between presses (overlapping holds are allowed)
+            tick: Executor wheel resolution
+            
+        Returns:
+            Dictionary with the slowest press_key() call in microseconds, the
+            measured hold durations' error range in milliseconds (per distinct
+            key, so overlapping presses do not merge) and the executor stats
+        """
+        keyboard = RecordingKeyboard()
+        executor = ActionExecutor(keyboard, tick=tick)
+        call_times = []
+        for i in range(presses):
+            start = time.perf_counter()
+            executor.press_key(f"key{i}", duration)
+            call_times.append(time.perf_counter() - start)
+            time.sleep(interval)
+        time.sleep(duration + 4 * tick)
+        executor.close()
+        
+        errors = [held - duration for i in range(presses) for held in keyboard.hold_durations(f"key{i}")]
+        return {
+            'max_call_us': max(call_times) * 1e6,
+            'holds': len(errors),
+            'min_error_ms': min(errors) * 1000 if errors else None,
+            'max_error_ms': max(errors) * 1000 if errors else None,
+            'stats': executor.get_stats()
+        }
+        
\ No newline at end of file
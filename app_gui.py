@@ -6,6 +6,30 @@ import datetime
 import json
 import os
 from tracker_logic import TrackerLogic
+from stage_profiler import STAGES
+from status_events import StatusEvent
+from telemetry import TELEMETRY_VALUES
+from gesture_recognition import GestureVisualizer
+
+# Status label changes per tracker event: (label key, text, color); text is
+# formatted with the event payload
+STATUS_LABEL_UPDATES = {
+    StatusEvent.VR_INITIALIZED: (("steamvr", "Connected", "green"), ("status", "Ready", "green")),
+    StatusEvent.VR_INIT_FAILED: (("steamvr", "Could not connect", "red"), ("status", "Error", "red")),
+    StatusEvent.TRACKING_STARTED: (("tracking", "Active", "green"), ("status", "success", "green")),
+    StatusEvent.TRACKING_STOPPED: (("tracking", "Stopped", "gray"), ("status", "Stopped", "gray")),
+    StatusEvent.HMD_NOT_CONNECTED: (("controller", "No HMD", "orange"),),
+    StatusEvent.TRACKING_ACTIVE: (("controller", "Being Tracked", "green"),),
+    StatusEvent.CONTROLLER_FOUND: (("controller", "Controler {index} Connected", "green"),),
+    StatusEvent.CONTROLLERS_CONNECTED: (("controller", "Controlers {left} + {right} Connected", "green"),),
+    StatusEvent.CONTROLLER_NOT_FOUND: (("controller", "Controler Not Found", "orange"),),
+    StatusEvent.CONFIG_LOADED: (("status", "Configuration Loaded", "blue"),),
+    StatusEvent.CONFIG_DEFAULTS: (("status", "No Config (Default)", "orange"),),
+    StatusEvent.MMAP_ACTIVE: (("status", "MMAP Active", "green"),),
+    StatusEvent.MMAP_FALLBACK: (("status", "MMAP Failed (INI)", "orange"),),
+    StatusEvent.MMAP_FAILED: (("status", "MMAP Failed", "red"),),
+    StatusEvent.INI_MODE: (("status", "INI Mode", "blue"),)
+}
 
 class ScrollableFrame(ttk.Frame):
     def __init__(self, container, *args, **kwargs):
@@ -41,6 +65,9 @@ class FNVRTrackerGUI:
         # Status queue for thread-safe updates
         self.status_queue = queue.Queue()
         
+        # Pending debounced preference save (root.after id)
+        self.save_job = None
+        
         # Tracker instance
         self.tracker = TrackerLogic(status_callback=self.queue_status_update)
         
@@ -57,6 +84,7 @@ class FNVRTrackerGUI:
         
         # Start status update loop
         self.update_status_display()
+        self.update_telemetry_display()
         
     def load_preferences(self):
         """Load user preferences from JSON file"""
@@ -75,6 +103,19 @@ class FNVRTrackerGUI:
                 json.dump(self.preferences, f, indent=2)
         except Exception as e:
             self.add_log(f"Preferences could not be saved: {e}", "error")
+            
+    def schedule_save_preferences(self, delay_ms: int = 500):
+        """Save preferences once input has been idle for delay_ms (e.g. while a slider is dragged)"""
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
+        self.save_job = self.root.after(delay_ms, self.flush_preferences)
+        
+    def flush_preferences(self):
+        """Write a pending debounced save now"""
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
+            self.save_job = None
+            self.save_preferences()
         
     def setup_ui(self):
         """Create the user interface"""
@@ -247,13 +288,57 @@ class FNVRTrackerGUI:
         self.smoothing_value_label = ttk.Label(smoothing_frame, text=f"{self.smoothing_strength_var.get():.1f}")
         self.smoothing_value_label.grid(row=1, column=2, padx=5)
         
+        # Telemetry panel (reads the tracker's latest snapshot, see update_telemetry_display)
+        telemetry_frame = ttk.LabelFrame(main_frame, text="Telemetry", padding="10")
+        telemetry_frame.grid(row=7, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
+        mono = ('Consolas', 9)
+        mono_bold = ('Consolas', 9, 'bold')
+        
+        self.frame_rate_label = ttk.Label(telemetry_frame, text="Frame rate: -", font=mono_bold)
+        self.frame_rate_label.grid(row=0, column=0, columnspan=7, sticky=tk.W, padx=5, pady=2)
+        
+        # Raw and smoothed inertia values
+        for column, name in enumerate(TELEMETRY_VALUES, start=1):
+            ttk.Label(telemetry_frame, text=name, font=mono_bold).grid(row=1, column=column, sticky=tk.E, padx=5)
+        self.inertia_labels = {}
+        for row, kind in enumerate(("raw", "smoothed"), start=2):
+            ttk.Label(telemetry_frame, text=kind, font=mono).grid(row=row, column=0, sticky=tk.W, padx=5)
+            labels = []
+            for column in range(1, len(TELEMETRY_VALUES) + 1):
+                label = ttk.Label(telemetry_frame, text="-", font=mono)
+                label.grid(row=row, column=column, sticky=tk.E, padx=5)
+                labels.append(label)
+            self.inertia_labels[kind] = labels
+            
+        # Gesture dwell progress, one row per configured gesture (see rebuild_gesture_rows)
+        self.gesture_frame = ttk.Frame(telemetry_frame)
+        self.gesture_frame.grid(row=4, column=0, columnspan=7, sticky=tk.W)
+        self.gesture_labels = {}
+        self.gesture_row_ids = None
+        self.rebuild_gesture_rows()
+        
+        # Per-stage latency percentiles
+        for column, heading in enumerate(("stage (us)", "p50", "p95", "p99", "max")):
+            ttk.Label(telemetry_frame, text=heading, font=mono_bold).grid(row=5, column=column, sticky=tk.E, padx=5, pady=(8, 0))
+        self.timing_labels = {}
+        for row, stage in enumerate(STAGES, start=6):
+            ttk.Label(telemetry_frame, text=stage, font=mono).grid(row=row, column=0, sticky=tk.W, padx=5)
+            labels = []
+            for column in range(1, 5):
+                label = ttk.Label(telemetry_frame, text="-", font=mono)
+                label.grid(row=row, column=column, sticky=tk.E, padx=5)
+                labels.append(label)
+            self.timing_labels[stage] = labels
+        self.telemetry_ticks = 0
+        self.last_snapshot = None
+        
         # Footer
         footer_label = ttk.Label(
             main_frame, 
             text="Fallout: New Virtual Reality - VR Motion Control", 
             font=('Arial', 8)
         )
-        footer_label.grid(row=7, column=0, columnspan=2, pady=5)
+        footer_label.grid(row=8, column=0, columnspan=2, pady=5)
         
         # Configure grid weights
         main_frame.rowconfigure(4, weight=1)
@@ -261,23 +346,70 @@ class FNVRTrackerGUI:
         log_frame.rowconfigure(0, weight=1)
         log_frame.columnconfigure(0, weight=1)
         
-    def queue_status_update(self, message, level="info"):
+    def queue_status_update(self, message, level="info", event=None, payload=None):
         """Queue a status update from the tracker thread"""
-        self.status_queue.put((message, level))
+        self.status_queue.put((message, level, event, payload))
         
     def update_status_display(self):
         """Process queued status updates"""
         try:
             while True:
-                message, level = self.status_queue.get_nowait()
+                message, level, event, payload = self.status_queue.get_nowait()
                 self.add_log(message, level)
-                self.update_status_labels(message, level)
+                self.update_status_labels(level, event, payload)
         except queue.Empty:
             pass
             
         # Schedule next update
         self.root.after(100, self.update_status_display)
         
+    def rebuild_gesture_rows(self):
+        """Recreate the gesture dwell rows if the recognizer's gesture ids changed"""
+        recognizer = self.tracker.gesture_recognizer
+        gesture_ids = list(recognizer.zones.ids) if recognizer else []
+        if gesture_ids == self.gesture_row_ids:
+            return
+        self.gesture_row_ids = gesture_ids
+        
+        for widget in self.gesture_frame.winfo_children():
+            widget.destroy()
+        self.gesture_labels = {}
+        mono = ('Consolas', 9)
+        for row, zone_id in enumerate(gesture_ids):
+            ttk.Label(self.gesture_frame, text=zone_id, font=mono).grid(row=row, column=0, sticky=tk.W, padx=5)
+            label = ttk.Label(self.gesture_frame, text="-", font=mono)
+            label.grid(row=row, column=1, sticky=tk.W, padx=5)
+            self.gesture_labels[zone_id] = label
+            
+    def update_telemetry_display(self):
+        """Refresh the telemetry panel from the tracker's latest snapshot (about 15 Hz)"""
+        self.rebuild_gesture_rows()  # The recognizer may be recreated or recompiled while running
+        snapshot = self.tracker.telemetry.latest
+        if snapshot is not None and snapshot is not self.last_snapshot:
+            self.last_snapshot = snapshot
+            self.frame_rate_label.config(text=f"Frame rate: {snapshot.frame_rate:.1f} Hz ({snapshot.frames} frames)")
+            for kind, values in (("raw", snapshot.raw), ("smoothed", snapshot.smoothed)):
+                for label, value in zip(self.inertia_labels[kind], values):
+                    label.config(text=f"{value:+.3f}")
+            for zone_id, label in self.gesture_labels.items():
+                status = snapshot.gestures.get(zone_id)
+                if status:
+                    label.config(text=f"{GestureVisualizer.get_progress_bar(status['progress'], 10)} "
+                                      f"{GestureVisualizer.get_status_text(status)}")
+                                      
+        # Percentiles are computed here on the GUI thread, at a lower rate
+        self.telemetry_ticks += 1
+        if self.tracker.running and self.telemetry_ticks % 8 == 0:
+            stats = self.tracker.get_stage_stats()
+            for stage, labels in self.timing_labels.items():
+                entry = stats.get(stage)
+                if not entry or not entry['count']:
+                    continue
+                for label, key in zip(labels, ('p50_us', 'p95_us', 'p99_us', 'max_us')):
+                    label.config(text=f"{entry[key]:.1f}")
+                    
+        self.root.after(66, self.update_telemetry_display)
+        
     def add_log(self, message, level="info"):
         """Add a message to the log"""
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
@@ -286,57 +418,18 @@ class FNVRTrackerGUI:
         self.log_text.insert(tk.END, log_entry, level)
         self.log_text.see(tk.END)
         
-    def update_status_labels(self, message, level):
-        """Update status labels based on messages"""
-        message_lower = message.lower()
-        
-        if "openvr initialized" in message_lower:
-            self.status_labels["steamvr"].config(text="Connected", foreground="green")
-            self.status_labels["status"].config(text="Ready", foreground="green")
-        elif "openvr init failed" in message_lower:
-            self.status_labels["steamvr"].config(text="Could not connect", foreground="red")
-            self.status_labels["status"].config(text="Error", foreground="red")
-        elif "tracking started" in message_lower:
-            self.status_labels["tracking"].config(text="Active", foreground="green")
-            self.status_labels["status"].config(text="success", foreground="green")
-        elif "tracking stopped" in message_lower:
-            self.status_labels["tracking"].config(text="Stopped", foreground="gray")
-            self.status_labels["status"].config(text="Stopped", foreground="gray")
-        elif "hmd not connected" in message_lower:
-            self.status_labels["controller"].config(text="No HMD", foreground="orange")
-        elif "tracking active" in message_lower:
-            self.status_labels["controller"].config(text="Being Tracked", foreground="green")
-        elif "controller found at index" in message_lower:
-            # Extract controller index from message
-            import re
-            match = re.search(r'index (\d+)', message)
-            if match:
-                index = match.group(1)
-                self.status_labels["controller"].config(text=f"Controler {index} Connected", foreground="green")
-            else:
-                self.status_labels["controller"].config(text="Controler Found", foreground="green")
-        elif "controller not found" in message_lower:
-            self.status_labels["controller"].config(text="Controler Not Found", foreground="orange")
-        elif "controller disconnected" in message_lower:
-            self.status_labels["controller"].config(text="Controler Disconnected", foreground="red")
-        elif "configuration loaded" in message_lower:
-            self.status_labels["status"].config(text="Configuration Loaded", foreground="blue")
-        elif "error" in message_lower or level == "error":
-            self.status_labels["status"].config(text="Error", foreground="red")
-        elif "config file not found" in message_lower:
-            self.status_labels["status"].config(text="No Config (Default)", foreground="orange")
-        elif "mmap communication initialized" in message_lower:
-            self.status_labels["status"].config(text="MMAP Active", foreground="green")
-        elif "mmap performance" in message_lower:
-            # Show performance info in log
-            pass
-        elif "mmap failed" in message_lower:
-            if "falling back" in message_lower:
-                self.status_labels["status"].config(text="MMAP Failed (INI)", foreground="orange")
-            else:
-                self.status_labels["status"].config(text="MMAP Failed", foreground="red")
-        elif "using ini file communication" in message_lower:
-            self.status_labels["status"].config(text="INI Mode", foreground="blue")
+    def update_status_labels(self, level, event, payload):
+        """Update status labels from a status event"""
+        updates = STATUS_LABEL_UPDATES.get(event)
+        if updates is None:
+            if level == "error":
+                self.status_labels["status"].config(text="Error", foreground="red")
+            return
+            
+        for key, text, color in updates:
+            if payload:
+                text = text.format_map(payload)
+            self.status_labels[key].config(text=text, foreground=color)
             
     def start_tracking(self):
         """Start VR tracking"""
@@ -383,6 +476,9 @@ class FNVRTrackerGUI:
         if self.tracker.running:
             self.stop_tracking()
             
+        # Write a save still waiting for its debounce
+        self.flush_preferences()
+        
         # Destroy window
         self.root.destroy()
         
@@ -417,12 +513,12 @@ class FNVRTrackerGUI:
         enabled = self.smoothing_enabled_var.get()
         self.tracker.config_variables['smoothing_enabled'] = enabled
         
-        # Reinitialize smoothing
+        # Queue the change; the tracking loop applies it at its next frame
         self.tracker.setup_smoothing()
         
         # Save preference
         self.preferences['smoothing_enabled'] = enabled
-        self.save_preferences()
+        self.schedule_save_preferences()
         
         status = "activated" if enabled else "disabled"
         self.add_log(f"Data smoothing {status}", "info")
@@ -435,13 +531,12 @@ class FNVRTrackerGUI:
         # Update tracker configuration
         self.tracker.config_variables['position_min_cutoff'] = 5.1 - strength  # Inverse for intuitive control
         
-        # Reinitialize smoothing if enabled
-        if self.tracker.config_variables.get('smoothing_enabled', True):
-            self.tracker.setup_smoothing()
-            
-        # Save preference
+        # Queue the new cutoff; filter state is kept, so dragging does not reset smoothing
+        self.tracker.setup_smoothing()
+        
+        # Save preference once the slider stops moving
         self.preferences['smoothing_strength'] = strength
-        self.save_preferences()
+        self.schedule_save_preferences()
         
     def on_dual_hand_toggle(self):
         """Handle dual hand mode toggle"""
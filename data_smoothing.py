@@ -3,12 +3,18 @@ Data smoothing algorithms for VR tracking data
 Reduces jitter and provides stable aiming
 """
 
+import math
+import time
+import threading
 import numpy as np
 from collections import deque
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, Sequence
 import logging
 
 
+TWO_PI = 2.0 * np.pi
+
+
 class SmoothingFilter:
     """Base class for smoothing filters"""
     
@@ -83,6 +89,16 @@ class OneEuroFilter(SmoothingFilter):
         self.d_cutoff = d_cutoff
         self.reset()
         
+    def set_params(self, min_cutoff: Optional[float] = None, beta: Optional[float] = None,
+                   d_cutoff: Optional[float] = None):
+        """Change filter parameters without resetting state (None keeps a value)"""
+        if min_cutoff is not None:
+            self.min_cutoff = min_cutoff
+        if beta is not None:
+            self.beta = beta
+        if d_cutoff is not None:
+            self.d_cutoff = d_cutoff
+            
     def reset(self):
         """Reset filter state"""
         self.x_prev = None
@@ -133,6 +149,254 @@ class OneEuroFilter(SmoothingFilter):
         return 1.0 / (1.0 + tau / dt)
         
 
+class FusedFilter:
+    """
+    Base class for filters over a whole state vector (e.g. 3D position or 6D pose)
+    
+    All axes share one timestamp per frame. The per-frame smooth() keeps its
+    state in plain float lists, since NumPy call overhead dominates at 3-6
+    values; smooth_array() runs the same recursion over a recorded
+    (frames, dims) array with NumPy state vectors. Both produce the same
+    values as one scalar filter per axis.
+    """
+    
+    def __init__(self, dims: int = 3):
+        self.dims = dims
+        self.reset()
+        
+    def reset(self):
+        """Reset filter state"""
+        raise NotImplementedError
+        
+    def set_params(self, **params):
+        """Change filter parameters without resetting state"""
+        raise NotImplementedError
+        
+    def smooth(self, values: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        """Smooth one frame (timestamp defaults to now for time-based filters)"""
+        raise NotImplementedError
+        
+    def smooth_array(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Smooth a whole recording from a fresh state; the filter's own state is not touched
+        
+        Args:
+            values: Samples, shape (frames, dims)
+            timestamps: Frame timestamps in seconds, shape (frames,) (time-based filters)
+            
+        Returns:
+            Smoothed samples, shape (frames, dims)
+        """
+        raise NotImplementedError
+        
+
+class FusedMovingAverageFilter(FusedFilter):
+    """Moving average over all axes with O(1) running sums"""
+    
+    # Frames between exact re-summations that discard running-sum rounding drift
+    RESUM_INTERVAL = 1024
+    
+    def __init__(self, window_size: int = 5, dims: int = 3):
+        self.window_size = max(1, window_size)
+        super().__init__(dims)
+        
+    def reset(self):
+        """Reset filter state"""
+        self.history = deque(maxlen=self.window_size)
+        self.sums = (0.0,) * self.dims
+        self.frames_since_resum = 0
+        
+    def set_params(self, window_size: Optional[int] = None):
+        """Change the window, keeping the most recent samples"""
+        if window_size is None or max(1, window_size) == self.window_size:
+            return
+        self.window_size = max(1, window_size)
+        self.history = deque(self.history, maxlen=self.window_size)
+        self.sums = tuple([sum(axis) for axis in zip(*self.history)]) if self.history else (0.0,) * self.dims
+        self.frames_since_resum = 0
+        
+    def smooth(self, values: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        """Apply moving average smoothing"""
+        history = self.history
+        full = len(history) == self.window_size
+        if self.dims == 3:
+            # Unrolled: a comprehension costs more than the arithmetic at three axes
+            x, y, z = values
+            sx, sy, sz = self.sums
+            if full:
+                ox, oy, oz = history[0]
+                sums = (sx + x - ox, sy + y - oy, sz + z - oz)
+            else:
+                sums = (sx + x, sy + y, sz + z)
+        elif full:
+            sums = tuple([s + v - o for s, v, o in zip(self.sums, values, history[0])])
+        else:
+            sums = tuple([s + v for s, v in zip(self.sums, values)])
+        history.append(tuple(values))
+        
+        self.frames_since_resum += 1
+        if self.frames_since_resum >= self.RESUM_INTERVAL:
+            sums = tuple([sum(axis) for axis in zip(*history)])
+            self.frames_since_resum = 0
+        self.sums = sums
+        
+        count = len(history)
+        return tuple([s / count for s in sums])
+        
+    def smooth_array(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        frames = len(values)
+        # Add the window oldest-first, as sum() over the scalar filter's deque does
+        sums = np.zeros_like(values)
+        for lag in range(self.window_size - 1, -1, -1):
+            if lag < frames:
+                sums[lag:] += values[:frames - lag]
+        counts = np.minimum(np.arange(1, frames + 1), self.window_size)
+        return sums / counts[:, None]
+        
+
+class FusedExponentialFilter(FusedFilter):
+    """Exponential moving average over all axes"""
+    
+    def __init__(self, alpha: float = 0.3, dims: int = 3):
+        """
+        Args:
+            alpha: Smoothing factor (0-1). Higher = less smoothing
+            dims: Number of axes
+        """
+        self.alpha = max(0.0, min(1.0, alpha))
+        super().__init__(dims)
+        
+    def reset(self):
+        """Reset filter state"""
+        self.ema = None
+        
+    def set_params(self, alpha: Optional[float] = None):
+        """Change the smoothing factor without resetting state"""
+        if alpha is not None:
+            self.alpha = max(0.0, min(1.0, alpha))
+            
+    def smooth(self, values: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        """Apply exponential moving average smoothing"""
+        ema = self.ema
+        if ema is None:
+            self.ema = tuple(values)
+            return self.ema
+            
+        alpha = self.alpha
+        keep = 1 - alpha
+        if self.dims == 3:
+            # Unrolled: a comprehension costs more than the arithmetic at three axes
+            x, y, z = values
+            ex, ey, ez = ema
+            self.ema = (alpha * x + keep * ex, alpha * y + keep * ey, alpha * z + keep * ez)
+        else:
+            self.ema = tuple([alpha * v + keep * e for v, e in zip(values, ema)])
+        return self.ema
+        
+    def smooth_array(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        output = np.empty_like(values)
+        if not len(values):
+            return output
+        alpha, keep = self.alpha, 1 - self.alpha
+        ema = output[0] = values[0]
+        for i in range(1, len(values)):
+            ema = output[i] = alpha * values[i] + keep * ema
+        return output
+        
+
+class FusedOneEuroFilter(FusedFilter):
+    """
+    One Euro Filter over all axes with one shared timestamp
+    
+    dt and the derivative smoothing factor are computed once per frame
+    instead of once per axis.
+    """
+    
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 0.007, d_cutoff: float = 1.0, dims: int = 3):
+        """
+        Args:
+            min_cutoff: Minimum cutoff frequency for position
+            beta: Speed coefficient (higher = less lag during fast movements)
+            d_cutoff: Cutoff frequency for derivative
+            dims: Number of axes
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        super().__init__(dims)
+        
+    def reset(self):
+        """Reset filter state"""
+        self.x_prev = None
+        self.dx_prev = (0.0,) * self.dims
+        self.t_prev = None
+        
+    def set_params(self, min_cutoff: Optional[float] = None, beta: Optional[float] = None,
+                   d_cutoff: Optional[float] = None):
+        """Change filter parameters without resetting state (None keeps a value)"""
+        if min_cutoff is not None:
+            self.min_cutoff = min_cutoff
+        if beta is not None:
+            self.beta = beta
+        if d_cutoff is not None:
+            self.d_cutoff = d_cutoff
+            
+    def smooth(self, values: Sequence[float], timestamp: Optional[float] = None) -> Tuple[float, ...]:
+        """Apply One Euro Filter (timestamp defaults to now)"""
+        if timestamp is None:
+            timestamp = time.time()
+        if self.x_prev is None:
+            self.x_prev = tuple(values)
+            self.t_prev = timestamp
+            return self.x_prev
+            
+        dt = timestamp - self.t_prev
+        if dt <= 0:
+            return self.x_prev
+            
+        a_d = 1.0 / (1.0 + (1.0 / (TWO_PI * self.d_cutoff)) / dt)
+        keep_d = 1 - a_d
+        min_cutoff, beta = self.min_cutoff, self.beta
+        
+        x_hat = []
+        dx_hat = []
+        for value, x_prev, dx_prev in zip(values, self.x_prev, self.dx_prev):
+            dx = a_d * ((value - x_prev) / dt) + keep_d * dx_prev
+            a = 1.0 / (1.0 + (1.0 / (TWO_PI * (min_cutoff + beta * abs(dx)))) / dt)
+            x_hat.append(a * value + (1 - a) * x_prev)
+            dx_hat.append(dx)
+            
+        self.x_prev = x_hat = tuple(x_hat)
+        self.dx_prev = dx_hat
+        self.t_prev = timestamp
+        return x_hat
+        
+    def smooth_array(self, values: np.ndarray, timestamps: Optional[np.ndarray] = None) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        output = np.empty_like(values)
+        if not len(values):
+            return output
+            
+        tau_d = 1.0 / (TWO_PI * self.d_cutoff)
+        x_prev = output[0] = values[0]
+        dx_prev = np.zeros(values.shape[1])
+        t_prev = timestamps[0]
+        for i in range(1, len(values)):
+            dt = float(timestamps[i] - t_prev)
+            if dt <= 0:
+                output[i] = x_prev
+                continue
+            a_d = 1.0 / (1.0 + tau_d / dt)
+            dx_prev = a_d * ((values[i] - x_prev) / dt) + (1 - a_d) * dx_prev
+            a = 1.0 / (1.0 + (1.0 / (TWO_PI * (self.min_cutoff + self.beta * np.abs(dx_prev)))) / dt)
+            x_prev = output[i] = a * values[i] + (1 - a) * x_prev
+            t_prev = timestamps[i]
+        return output
+        
+
 class VectorSmoother:
     """Smooths 3D vectors (position/rotation)"""
     
@@ -145,37 +409,34 @@ class VectorSmoother:
         self.filter_type = filter_type
         self.filter_params = filter_params
         
-        # Create filters for each axis
-        self.filters = {
-            'x': self._create_filter(),
-            'y': self._create_filter(),
-            'z': self._create_filter()
-        }
+        # One fused filter for all three axes
+        self.filter = self._create_filter()
         
-    def _create_filter(self) -> SmoothingFilter:
+    def _create_filter(self) -> FusedFilter:
         """Create a filter instance based on type"""
         if self.filter_type == "moving_average":
-            return MovingAverageFilter(**self.filter_params)
+            return FusedMovingAverageFilter(**self.filter_params)
         elif self.filter_type == "exponential":
-            return ExponentialMovingAverageFilter(**self.filter_params)
+            return FusedExponentialFilter(**self.filter_params)
         elif self.filter_type == "one_euro":
-            return OneEuroFilter(**self.filter_params)
+            return FusedOneEuroFilter(**self.filter_params)
         else:
             raise ValueError(f"Unknown filter type: {self.filter_type}")
             
-    def smooth(self, x: float, y: float, z: float) -> Tuple[float, float, float]:
-        """Smooth a 3D vector"""
-        return (
-            self.filters['x'].smooth(x),
-            self.filters['y'].smooth(y),
-            self.filters['z'].smooth(z)
-        )
+    def set_params(self, **filter_params):
+        """Change filter parameters without resetting state"""
+        self.filter_params.update(filter_params)
+        self.filter.set_params(**filter_params)
+        
+    def smooth(self, x: float, y: float, z: float,
+               timestamp: Optional[float] = None) -> Tuple[float, float, float]:
+        """Smooth a 3D vector (timestamp drives time-based filters when given)"""
+        return self.filter.smooth((x, y, z), timestamp)
         
     def reset(self):
         """Reset all filters"""
-        for filter in self.filters.values():
-            filter.reset()
-            
+        self.filter.reset()
+        
 
 class QuaternionSmoother:
     """Special smoother for quaternion rotations using SLERP"""
@@ -188,8 +449,20 @@ class QuaternionSmoother:
         self.alpha = max(0.0, min(1.0, alpha))
         self.prev_quat = None
         
-    def smooth(self, w: float, x: float, y: float, z: float) -> Tuple[float, float, float, float]:
-        """Smooth quaternion using SLERP (Spherical Linear Interpolation)"""
+    def set_params(self, alpha: Optional[float] = None):
+        """Change the interpolation factor without resetting state"""
+        if alpha is not None:
+            self.alpha = max(0.0, min(1.0, alpha))
+            
+    def smooth(self, w: float, x: float, y: float, z: float,
+               timestamp: Optional[float] = None) -> Tuple[float, float, float, float]:
+        """
+        Smooth quaternion using SLERP (Spherical Linear Interpolation)
+        
+        The fixed alpha is applied per call, so the effective smoothing depends
+        on the loop rate (timestamp is accepted for a common interface and
+        ignored); see TimeConstantQuaternionSmoother.
+        """
         # Normalize input quaternion
         norm = np.sqrt(w*w + x*x + y*y + z*z)
         if norm == 0:
@@ -231,8 +504,221 @@ class QuaternionSmoother:
         self.prev_quat = None
         
 
+def _slerp(q1: Tuple[float, float, float, float], q2: Tuple[float, float, float, float],
+           t: float) -> Tuple[float, float, float, float]:
+    """Spherical interpolation from unit quaternion q1 toward q2 along the shorter arc"""
+    w1, x1, y1, z1 = q1
+    w2, x2, y2, z2 = q2
+    dot = w1*w2 + x1*x2 + y1*y2 + z1*z2
+    if dot < 0:
+        w2, x2, y2, z2 = -w2, -x2, -y2, -z2
+        dot = -dot
+        
+    if dot > 0.9995:
+        # Nearly identical; normalized linear interpolation
+        w = w1 + t * (w2 - w1)
+        x = x1 + t * (x2 - x1)
+        y = y1 + t * (y2 - y1)
+        z = z1 + t * (z2 - z1)
+        norm = math.sqrt(w*w + x*x + y*y + z*z)
+        return (w / norm, x / norm, y / norm, z / norm)
+        
+    theta = math.acos(dot)
+    sin_theta = math.sin(theta)
+    s1 = math.sin((1 - t) * theta) / sin_theta
+    s2 = math.sin(t * theta) / sin_theta
+    return (s1*w1 + s2*w2, s1*x1 + s2*x2, s1*y1 + s2*y2, s1*z1 + s2*z2)
+    
+
+def _normalize_quaternion(w: float, x: float, y: float, z: float) -> Optional[Tuple[float, float, float, float]]:
+    norm = math.sqrt(w*w + x*x + y*y + z*z)
+    if norm == 0:
+        return None
+    return (w / norm, x / norm, y / norm, z / norm)
+    
+
+def quaternion_angle(q1: Sequence[float], q2: Sequence[float]) -> float:
+    """Angle in radians of the rotation between two unit quaternions"""
+    dot = abs(q1[0]*q2[0] + q1[1]*q2[1] + q1[2]*q2[2] + q1[3]*q2[3])
+    return 2.0 * math.acos(min(1.0, dot))
+    
+
+def _angular_velocity(q1: Tuple[float, float, float, float], q2: Tuple[float, float, float, float],
+                      dt: float) -> Tuple[float, float, float]:
+    """Angular velocity vector (rad/s, in q1's frame) that turns q1 into q2 in dt seconds"""
+    w1, x1, y1, z1 = q1
+    w2, x2, y2, z2 = q2
+    # Relative rotation conj(q1) * q2
+    w = w1*w2 + x1*x2 + y1*y2 + z1*z2
+    x = w1*x2 - x1*w2 - y1*z2 + z1*y2
+    y = w1*y2 + x1*z2 - y1*w2 - z1*x2
+    z = w1*z2 - x1*y2 + y1*x2 - z1*w2
+    if w < 0:
+        w, x, y, z = -w, -x, -y, -z
+    norm = math.sqrt(x*x + y*y + z*z)
+    scale = 2.0 * math.atan2(norm, w) / norm / dt if norm > 1e-12 else 2.0 / dt
+    return (x * scale, y * scale, z * scale)
+    
+
+def _low_pass_step(output: Tuple[float, float, float, float], previous: Tuple[float, float, float, float],
+                   current: Tuple[float, float, float, float], dt: float,
+                   time_constant: float) -> Tuple[float, float, float, float]:
+    """
+    Advance a first-order low-pass on rotations by dt
+    
+    The input is taken to move linearly (along the arc) from the previous
+    sample to the current one, the exact discretization of the continuous
+    filter for such input. A steady turn therefore lags by time_constant
+    regardless of the loop rate or skipped frames, where the usual
+    per-sample update lags by roughly time_constant - dt / 2.
+    """
+    x = dt / time_constant
+    decay = math.exp(-x)
+    hold = (1.0 - decay) / x  # Weight of the previous sample plus decay
+    target = _slerp(previous, current, (1.0 - hold) / (1.0 - decay))
+    return _slerp(output, target, 1.0 - decay)
+    
+
+class TimeConstantQuaternionSmoother:
+    """
+    SLERP smoother with a time constant instead of a per-call alpha
+    
+    The update is derived from the frame time (see _low_pass_step), so the
+    smoothing and the lag it adds are the same at 45 Hz and 120 Hz and a
+    missed frame is caught up in one step. QuaternionSmoother with alpha a
+    at rate r corresponds to roughly time_constant = -1 / (r * ln(1 - a)).
+    """
+    
+    def __init__(self, time_constant: float = 0.016):
+        """
+        Args:
+            time_constant: Seconds for the output to cover ~63% of a step (0 = no smoothing)
+        """
+        self.time_constant = max(0.0, time_constant)
+        self.reset()
+        
+    def set_params(self, time_constant: Optional[float] = None):
+        """Change the time constant without resetting state"""
+        if time_constant is not None:
+            self.time_constant = max(0.0, time_constant)
+            
+    def smooth(self, w: float, x: float, y: float, z: float,
+               timestamp: Optional[float] = None) -> Tuple[float, float, float, float]:
+        """Smooth one rotation sample (timestamp defaults to now)"""
+        q = _normalize_quaternion(w, x, y, z)
+        if q is None:
+            return (1, 0, 0, 0)
+        if timestamp is None:
+            timestamp = time.time()
+            
+        if self.prev_quat is None or self.time_constant <= 0:
+            self.prev_quat = self.prev_input = q
+            self.t_prev = timestamp
+            return q
+            
+        dt = timestamp - self.t_prev
+        if dt <= 0:
+            return self.prev_quat
+        self.t_prev = timestamp
+        
+        self.prev_quat = _low_pass_step(self.prev_quat, self.prev_input, q, dt, self.time_constant)
+        self.prev_input = q
+        return self.prev_quat
+        
+    def reset(self):
+        """Reset smoother state"""
+        self.prev_quat = None
+        self.prev_input = None
+        self.t_prev = None
+        
+
+class OneEuroQuaternionFilter:
+    """
+    One Euro filter on the rotation manifold
+    
+    The cutoff rises with the angular speed (rad/s) of the raw samples, so
+    slow rotations are smoothed strongly and fast ones pass with little lag.
+    The angular velocity is low-passed as a vector, so measurement noise
+    averages out instead of adding to the speed, and all terms are derived
+    from dt, making it independent of the loop rate like
+    TimeConstantQuaternionSmoother.
+    """
+    
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, d_cutoff: float = 1.0):
+        """
+        Args:
+            min_cutoff: Cutoff frequency in Hz when the controller is still
+            beta: Cutoff increase per rad/s of angular speed
+            d_cutoff: Cutoff frequency for the angular speed estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+        
+    def set_params(self, min_cutoff: Optional[float] = None, beta: Optional[float] = None,
+                   d_cutoff: Optional[float] = None):
+        """Change filter parameters without resetting state (None keeps a value)"""
+        if min_cutoff is not None:
+            self.min_cutoff = min_cutoff
+        if beta is not None:
+            self.beta = beta
+        if d_cutoff is not None:
+            self.d_cutoff = d_cutoff
+            
+    def smooth(self, w: float, x: float, y: float, z: float,
+               timestamp: Optional[float] = None) -> Tuple[float, float, float, float]:
+        """Smooth one rotation sample (timestamp defaults to now)"""
+        q = _normalize_quaternion(w, x, y, z)
+        if q is None:
+            return (1, 0, 0, 0)
+        if timestamp is None:
+            timestamp = time.time()
+            
+        if self.prev_quat is None:
+            self.prev_quat = self.prev_input = q
+            self.t_prev = timestamp
+            return q
+            
+        dt = timestamp - self.t_prev
+        if dt <= 0:
+            return self.prev_quat
+        self.t_prev = timestamp
+        
+        # Angular velocity between raw samples, smoothed
+        wx, wy, wz = _angular_velocity(self.prev_input, q, dt)
+        a_d = 1.0 - math.exp(-TWO_PI * self.d_cutoff * dt)
+        ox, oy, oz = self.omega
+        ox += a_d * (wx - ox)
+        oy += a_d * (wy - oy)
+        oz += a_d * (wz - oz)
+        self.omega = (ox, oy, oz)
+        self.speed = math.sqrt(ox*ox + oy*oy + oz*oz)
+        
+        # Speed-dependent cutoff
+        cutoff = self.min_cutoff + self.beta * self.speed
+        self.prev_quat = _low_pass_step(self.prev_quat, self.prev_input, q, dt, 1.0 / (TWO_PI * cutoff))
+        self.prev_input = q
+        return self.prev_quat
+        
+    def reset(self):
+        """Reset filter state"""
+        self.prev_quat = None
+        self.prev_input = None
+        self.t_prev = None
+        self.omega = (0.0, 0.0, 0.0)
+        self.speed = 0.0
+        
+
 class TrackingSmoother:
-    """Complete smoothing solution for VR tracking data"""
+    """
+    Complete smoothing solution for VR tracking data
+    
+    Parameters can be changed from any thread with update_params(); the
+    change is only recorded there and applied by the tracking thread at its
+    next begin_frame(), so a frame never mixes old and new parameters and
+    filter state is kept (except when the filter type itself changes).
+    """
     
     def __init__(self, config: Dict, logger: Optional[logging.Logger] = None):
         """
@@ -244,17 +730,30 @@ class TrackingSmoother:
         """
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pending = None
         
-        # Check if smoothing is enabled
-        self.enabled = config.get('smoothing_enabled', True)
-        if not self.enabled:
+        params = self.params_from_config(config)
+        self.enabled = params['enabled']
+        self.filter_type = params['filter_type']
+        self.rotation_filter = params['rotation_filter']
+        
+        # Position smoother
+        self.position_smoother = VectorSmoother(self.filter_type, **params['position'])
+        
+        # Rotation smoother (quaternion)
+        self.rotation_smoother = self._create_rotation_smoother(self.rotation_filter, params['rotation'])
+        
+        if self.enabled:
+            self.logger.info(f"Smoothing initialized with {self.filter_type} filter, "
+                             f"{self.rotation_filter} rotation filter")
+        else:
             self.logger.info("Smoothing disabled")
-            return
             
-        # Get filter settings
+    @staticmethod
+    def params_from_config(config: Dict) -> Dict:
+        """Extract smoothing parameters from a configuration dictionary"""
         filter_type = config.get('smoothing_filter', 'one_euro')
-        
-        # Position smoother
         if filter_type == 'one_euro':
             pos_params = {
                 'min_cutoff': config.get('position_min_cutoff', 1.0),
@@ -265,29 +764,273 @@ class TrackingSmoother:
         else:  # moving_average
             pos_params = {'window_size': config.get('position_window_size', 5)}
             
-        self.position_smoother = VectorSmoother(filter_type, **pos_params)
+        rotation_filter = config.get('rotation_filter', 'time_constant')
+        if rotation_filter == 'time_constant':
+            rot_params = {'time_constant': config.get('rotation_time_constant', 0.016)}
+        elif rotation_filter == 'one_euro':
+            rot_params = {
+                'min_cutoff': config.get('rotation_min_cutoff', 1.0),
+                'beta': config.get('rotation_beta', 10.0),
+                'd_cutoff': config.get('rotation_d_cutoff', 1.0)
+            }
+        else:  # slerp
+            rot_params = {'alpha': config.get('rotation_alpha', 0.5)}
+            
+        return {
+            'enabled': config.get('smoothing_enabled', True),
+            'filter_type': filter_type,
+            'position': pos_params,
+            'rotation_filter': rotation_filter,
+            'rotation': rot_params
+        }
         
-        # Rotation smoother (quaternion)
-        self.rotation_smoother = QuaternionSmoother(
-            alpha=config.get('rotation_alpha', 0.5)
-        )
+    @staticmethod
+    def _create_rotation_smoother(rotation_filter: str, params: Dict):
+        """Create a rotation smoother instance based on type"""
+        if rotation_filter == 'time_constant':
+            return TimeConstantQuaternionSmoother(**params)
+        elif rotation_filter == 'one_euro':
+            return OneEuroQuaternionFilter(**params)
+        elif rotation_filter == 'slerp':
+            return QuaternionSmoother(**params)
+        else:
+            raise ValueError(f"Unknown rotation filter type: {rotation_filter}")
+            
+    def update_params(self, config: Dict):
+        """Queue new parameters from a configuration dictionary (thread-safe, never blocks on a frame)"""
+        params = self.params_from_config(config)
+        with self._lock:
+            self._pending = params
+            
+    def begin_frame(self) -> bool:
+        """
+        Apply queued parameters; call from the tracking thread before smoothing a frame
+        
+        Returns:
+            True if smoothing is enabled for this frame
+        """
+        if self._pending is not None:
+            with self._lock:
+                params, self._pending = self._pending, None
+            self._apply(params)
+        return self.enabled
+        
+    def _apply(self, params: Dict):
+        if params['filter_type'] != self.filter_type:
+            # A different filter cannot inherit state; start it fresh
+            self.filter_type = params['filter_type']
+            self.position_smoother = VectorSmoother(self.filter_type, **params['position'])
+            self.logger.info(f"Smoothing filter changed to {self.filter_type}")
+        else:
+            self.position_smoother.set_params(**params['position'])
+            
+        if params['rotation_filter'] != self.rotation_filter:
+            self.rotation_filter = params['rotation_filter']
+            self.rotation_smoother = self._create_rotation_smoother(self.rotation_filter, params['rotation'])
+            self.logger.info(f"Rotation filter changed to {self.rotation_filter}")
+        else:
+            self.rotation_smoother.set_params(**params['rotation'])
         
-        self.logger.info(f"Smoothing initialized with {filter_type} filter")
+        if params['enabled'] and not self.enabled:
+            # History from before smoothing was disabled is stale
+            self.reset()
+        self.enabled = params['enabled']
         
-    def smooth_position(self, x: float, y: float, z: float) -> Tuple[float, float, float]:
+    def smooth_position(self, x: float, y: float, z: float,
+                        timestamp: Optional[float] = None) -> Tuple[float, float, float]:
         """Smooth position data"""
         if not self.enabled:
             return (x, y, z)
-        return self.position_smoother.smooth(x, y, z)
+        return self.position_smoother.smooth(x, y, z, timestamp)
         
-    def smooth_quaternion(self, w: float, x: float, y: float, z: float) -> Tuple[float, float, float, float]:
-        """Smooth rotation quaternion"""
+    def smooth_quaternion(self, w: float, x: float, y: float, z: float,
+                          timestamp: Optional[float] = None) -> Tuple[float, float, float, float]:
+        """Smooth rotation quaternion (timestamp drives time-based filters when given)"""
         if not self.enabled:
             return (w, x, y, z)
-        return self.rotation_smoother.smooth(w, x, y, z)
+        return self.rotation_smoother.smooth(w, x, y, z, timestamp)
         
     def reset(self):
         """Reset all smoothers"""
-        if self.enabled:
-            self.position_smoother.reset()
-            self.rotation_smoother.reset()
\ No newline at end of file
+        self.position_smoother.reset()
+        self.rotation_smoother.reset()
+        
+
+class SmoothingBenchmark:
+    """Compares the fused filters with one scalar filter per axis"""
+    
+    SCALAR_FILTERS = {
+        'moving_average': (MovingAverageFilter, FusedMovingAverageFilter, {'window_size': 5}),
+        'exponential': (ExponentialMovingAverageFilter, FusedExponentialFilter, {'alpha': 0.3}),
+        'one_euro': (OneEuroFilter, FusedOneEuroFilter, {'min_cutoff': 1.0, 'beta': 0.007})
+    }
+    
+    @staticmethod
+    def benchmark_filters(positions: np.ndarray, timestamps: np.ndarray) -> Dict:
+        """
+        Run every filter type over the same samples
+        
+        Args:
+            positions: Samples, shape (frames, dims), e.g. a controller's
+                       trace['matrices'][:, SLOT_RIGHT, :, 3]
+            timestamps: Frame timestamps in seconds, shape (frames,)
+            
+        Returns:
+            Dictionary per filter type with microseconds per frame for the
+            scalar, fused and batch paths and their largest deviation from scalar
+        """
+        positions = np.asarray(positions, dtype=np.float64)
+        rows = positions.tolist()
+        times = np.asarray(timestamps, dtype=np.float64).tolist()
+        frames = len(rows)
+        clock = time.perf_counter
+        results = {'frames': frames}
+        
+        for name, (scalar_type, fused_type, params) in SmoothingBenchmark.SCALAR_FILTERS.items():
+            scalar = [scalar_type(**params) for _ in range(positions.shape[1])]
+            start = clock()
+            if name == 'one_euro':
+                expected = [[f.smooth_with_time(v, t) for f, v in zip(scalar, row)] for row, t in zip(rows, times)]
+            else:
+                expected = [[f.smooth(v) for f, v in zip(scalar, row)] for row in rows]
+            scalar_time = clock() - start
+            
+            fused = fused_type(dims=positions.shape[1], **params)
+            start = clock()
+            actual = [fused.smooth(row, t) for row, t in zip(rows, times)]
+            fused_time = clock() - start
+            
+            start = clock()
+            batch = fused.smooth_array(positions, timestamps)
+            batch_time = clock() - start
+            
+            expected = np.array(expected)
+            results[name] = {
+                'scalar_us': scalar_time / frames * 1e6,
+                'fused_us': fused_time / frames * 1e6,
+                'batch_us': batch_time / frames * 1e6,
+                'fused_max_error': float(np.abs(np.array(actual) - expected).max()),
+                'batch_max_error': float(np.abs(batch - expected).max())
+            }
+        return results
+        
+    @staticmethod
+    def benchmark_trace(path: str, slot: int = 2) -> Dict:
+        """
+        Benchmark on a recorded pose trace
+        
+        Args:
+            path: Trace file from PoseTraceRecorder
+            slot: Device slot to use (default: right controller)
+        """
+        from pose_trace import load_trace
+        
+        trace = load_trace(path)
+        valid = trace['valid'][:, slot]
+        return SmoothingBenchmark.benchmark_filters(
+            trace['matrices'][valid, slot, :, 3], trace['timestamp'][valid]
+        )
+        
+    ROTATION_FILTERS = {
+        'slerp': (QuaternionSmoother, {'alpha': 0.5}),
+        'time_constant': (TimeConstantQuaternionSmoother, {'time_constant': 0.016}),
+        'one_euro': (OneEuroQuaternionFilter, {'min_cutoff': 1.0, 'beta': 10.0})
+    }
+    
+    @staticmethod
+    def synthetic_rotation_trace(rate: float, duration: float = 3.0, speed_deg: float = 90.0,
+                                 noise_deg: float = 0.3, drop_rate: float = 0.0,
+                                 seed: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Rotation about a tilted axis: held still for a third of the duration,
+        then turning at a constant speed, then oscillating
+        
+        Args:
+            rate: Sample rate in Hz
+            duration: Trace length in seconds
+            speed_deg: Turn speed in degrees per second
+            noise_deg: Approximate RMS measurement noise in degrees
+            drop_rate: Fraction of frames dropped at random (uneven dt)
+            seed: Random seed
+            
+        Returns:
+            Dictionary with timestamp (n,), truth and measured (n, 4) w, x, y, z
+            quaternions, segment (n,) 0 = still, 1 = constant speed, 2 = oscillating
+            and speed (rad/s of the constant segment)
+        """
+        rng = np.random.default_rng(seed)
+        timestamp = np.arange(0.0, duration, 1.0 / rate)
+        if drop_rate > 0:
+            timestamp = timestamp[rng.random(len(timestamp)) >= drop_rate]
+            
+        third = duration / 3
+        speed = np.radians(speed_deg)
+        segment = np.minimum((timestamp // third).astype(np.int64), 2)
+        ramp_end = speed * third
+        angle = np.where(segment == 0, 0.0,
+                         np.where(segment == 1, speed * (timestamp - third),
+                                  ramp_end + speed / (2 * np.pi) * np.sin(2 * np.pi * (timestamp - 2 * third))))
+                                  
+        axis = np.array([0.2, 1.0, 0.3])
+        axis /= np.linalg.norm(axis)
+        truth = np.empty((len(timestamp), 4))
+        truth[:, 0] = np.cos(angle / 2)
+        truth[:, 1:] = np.sin(angle / 2)[:, None] * axis
+        
+        # Isotropic 4D noise of sigma s rotates by about 2s radians
+        measured = truth + rng.normal(0.0, np.radians(noise_deg) / 2, truth.shape)
+        measured /= np.linalg.norm(measured, axis=1)[:, None]
+        return {'timestamp': timestamp, 'truth': truth, 'measured': measured,
+                'segment': segment, 'speed': speed}
+                
+    @staticmethod
+    def evaluate_rotation_rates(rates: Sequence[float] = (45, 60, 90, 120),
+                                filters: Optional[Dict] = None, **trace_params) -> Dict:
+        """
+        Run each rotation filter over the same motion sampled at several rates
+        
+        A frame-rate independent filter shows the same lag at every rate
+        (jitter still falls slightly as more samples are averaged); the
+        fixed-alpha SLERP smoother smooths less and lags less as the rate rises.
+        
+        Args:
+            rates: Sample rates in Hz
+            filters: name -> (class, params); default ROTATION_FILTERS
+            trace_params: Passed to synthetic_rotation_trace()
+            
+        Returns:
+            Dictionary per filter with, per rate, still_jitter_deg (RMS error
+            while held still), lag_ms (error during the constant-speed turn
+            divided by the speed), rms_error_deg and us_per_frame, plus
+            lag_spread_ms (largest minus smallest lag across rates)
+        """
+        filters = filters or SmoothingBenchmark.ROTATION_FILTERS
+        traces = {rate: SmoothingBenchmark.synthetic_rotation_trace(rate, **trace_params) for rate in rates}
+        results = {}
+        
+        for name, (filter_type, params) in filters.items():
+            per_rate = {}
+            for rate, trace in traces.items():
+                rotation_filter = filter_type(**params)
+                times = trace['timestamp'].tolist()
+                rows = trace['measured'].tolist()
+                start = time.perf_counter()
+                output = [rotation_filter.smooth(w, x, y, z, t) for (w, x, y, z), t in zip(rows, times)]
+                elapsed = time.perf_counter() - start
+                
+                dots = np.abs(np.einsum('ij,ij->i', np.array(output), trace['truth']))
+                error = 2 * np.arccos(np.minimum(dots, 1.0))
+                
+                # Skip the settling time at the start of each segment
+                settled = (trace['timestamp'] % (trace['timestamp'][-1] / 3)) > 0.3
+                still = error[(trace['segment'] == 0) & settled]
+                turning = error[(trace['segment'] == 1) & settled]
+                per_rate[rate] = {
+                    'still_jitter_deg': float(np.degrees(np.sqrt(np.mean(still ** 2)))),
+                    'lag_ms': float(turning.mean() / trace['speed'] * 1000),
+                    'rms_error_deg': float(np.degrees(np.sqrt(np.mean(error ** 2)))),
+                    'us_per_frame': elapsed / len(times) * 1e6
+                }
+            lags = [entry['lag_ms'] for entry in per_rate.values()]
+            results[name] = {'rates': per_rate, 'lag_spread_ms': max(lags) - min(lags)}
+        return results
@@ -0,0 +1,128 @@
+"""
+Cached tracked-device topology for the tracking loop
+Keeps controller indices and roles, refreshed on OpenVR device events
+"""
+
+import time
+import logging
+import openvr
+from typing import Callable, Dict, List, Optional
+
+
+# Events that can change which controllers exist or which hand they are on
+TOPOLOGY_EVENTS = frozenset((
+    openvr.VREvent_TrackedDeviceActivated,
+    openvr.VREvent_TrackedDeviceDeactivated,
+    openvr.VREvent_TrackedDeviceRoleChanged,
+    openvr.VREvent_TrackedDeviceUpdated
+))
+
+
+class DeviceRegistry:
+    """
+    Caches connected controllers and their roles
+    
+    A full device scan only runs when OpenVR reports a topology event, or
+    on a slow timer as a safety net when no events arrive. Between scans
+    the tracking loop reads the cached attributes without driver calls.
+    """
+    
+    def __init__(self, vr_system, refresh_interval: float = 2.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            vr_system: IVRSystem (or compatible) instance
+            refresh_interval: Seconds between timer-driven rescans (0 disables the timer)
+            clock: Time source for the refresh timer
+            logger: Optional logger instance
+        """
+        self.vr_system = vr_system
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.logger = logger or logging.getLogger(__name__)
+        
+        self.hmd_index = openvr.k_unTrackedDeviceIndex_Hmd
+        self.max_devices = openvr.k_unMaxTrackedDeviceCount
+        
+        # Cached topology
+        self.hmd_connected = False
+        self.controllers: List[int] = []
+        self.roles: Dict[int, str] = {}
+        self.left_index: Optional[int] = None
+        self.right_index: Optional[int] = None
+        
+        self.scan_count = 0
+        self.last_refresh = None
+        self._event = openvr.VREvent_t()
+        self._dirty = True
+        
+    def poll(self) -> bool:
+        """
+        Drain pending device events and rescan if the topology may have changed
+        
+        Returns:
+            True if a rescan was performed
+        """
+        event = self._event
+        poll_event = self.vr_system.pollNextEvent
+        while poll_event(event):
+            if event.eventType in TOPOLOGY_EVENTS:
+                self._dirty = True
+                self.logger.debug(f"Device event {event.eventType} for index {event.trackedDeviceIndex}")
+                
+        now = self.clock()
+        if not self._dirty and self.refresh_interval > 0:
+            if now - self.last_refresh >= self.refresh_interval:
+                self._dirty = True
+                
+        if self._dirty:
+            self.refresh(now)
+            return True
+        return False
+        
+    def refresh(self, now: Optional[float] = None):
+        """Scan all device slots and rebuild the cached topology"""
+        vr_system = self.vr_system
+        controllers = []
+        roles = {}
+        left_index = None
+        right_index = None
+        
+        for i in range(self.max_devices):
+            if vr_system.getTrackedDeviceClass(i) != openvr.TrackedDeviceClass_Controller:
+                continue
+            if not vr_system.isTrackedDeviceConnected(i):
+                continue
+                
+            controllers.append(i)
+            role = self._role_name(vr_system.getControllerRoleForTrackedDeviceIndex(i))
+            roles[i] = role
+            if role == "left":
+                left_index = i
+            elif role == "right":
+                right_index = i
+                
+        self.hmd_connected = vr_system.isTrackedDeviceConnected(self.hmd_index)
+        self.controllers = controllers
+        self.roles = roles
+        self.left_index = left_index
+        self.right_index = right_index
+        
+        self.scan_count += 1
+        self.last_refresh = self.clock() if now is None else now
+        self._dirty = False
+        
+    def invalidate(self):
+        """Force a rescan on the next poll()"""
+        self._dirty = True
+        
+    @staticmethod
+    def _role_name(role: int) -> str:
+        """Map an OpenVR controller role to 'left', 'right' or 'unknown'"""
+        if role == openvr.TrackedControllerRole_LeftHand:
+            return "left"
+        elif role == openvr.TrackedControllerRole_RightHand:
+            return "right"
+        else:
+            return "unknown"
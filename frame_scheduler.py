@@ -0,0 +1,143 @@
+"""
+Deadline-based frame pacing for the tracking loop
+Keeps a steady cadence with absolute perf_counter deadlines
+"""
+
+import time
+import logging
+import openvr
+from typing import Callable, Dict, Optional
+
+
+class FrameScheduler:
+    """
+    Paces a loop to a target rate against absolute deadlines
+    
+    Deadlines advance by a fixed period from the loop start, so processing
+    time does not accumulate as drift. The wait sleeps until shortly before
+    the deadline and spins for the remainder to avoid OS sleep granularity.
+    """
+    
+    def __init__(self, target_hz: float = 90.0, spin_threshold: float = 0.001,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            target_hz: Loop rate in Hz (0 or less runs unpaced)
+            spin_threshold: Seconds before a deadline to stop sleeping and spin
+            clock: Monotonic time source
+            sleep: Sleep function
+            logger: Optional logger instance
+        """
+        self.clock = clock
+        self.sleep = sleep
+        self.spin_threshold = max(0.0, spin_threshold)
+        self.logger = logger or logging.getLogger(__name__)
+        
+        # Display pacing
+        self.vr_system = None
+        self.vsync_to_photons = 0.0
+        
+        self.set_rate(target_hz)
+        self.reset()
+        
+    def set_rate(self, target_hz: float):
+        """Change the target rate; takes effect from the next deadline"""
+        self.target_hz = target_hz
+        self.period = 1.0 / target_hz if target_hz > 0 else 0.0
+        
+    def reset(self):
+        """Restart deadlines and statistics from now"""
+        now = self.clock()
+        self.start_time = now
+        self.next_deadline = now + self.period
+        self.frame_count = 0
+        self.overruns = 0
+        self.max_lateness = 0.0
+        
+    def sync_to_display(self, vr_system) -> bool:
+        """
+        Pace to the HMD display frequency and predict poses to photon time
+        
+        Args:
+            vr_system: IVRSystem (or compatible) instance
+            
+        Returns:
+            True if the display timing could be read
+        """
+        hmd = openvr.k_unTrackedDeviceIndex_Hmd
+        try:
+            display_hz = vr_system.getFloatTrackedDeviceProperty(hmd, openvr.Prop_DisplayFrequency_Float)
+            vsync_to_photons = vr_system.getFloatTrackedDeviceProperty(hmd, openvr.Prop_SecondsFromVsyncToPhotons_Float)
+        except Exception as e:
+            self.logger.warning(f"Display timing unavailable, keeping {self.target_hz:.0f} Hz: {e}")
+            return False
+            
+        if display_hz <= 0:
+            return False
+            
+        self.vr_system = vr_system
+        self.vsync_to_photons = vsync_to_photons
+        self.set_rate(display_hz)
+        self.reset()
+        self.logger.info(f"Pacing to display at {display_hz:.1f} Hz")
+        return True
+        
+    def predicted_seconds(self) -> float:
+        """Seconds from now until the photons of the next frame are emitted"""
+        if self.vr_system is None:
+            return 0.0
+            
+        has_vsync, since_vsync, _ = self.vr_system.getTimeSinceLastVsync()
+        if not has_vsync:
+            return 0.0
+        return self.period - since_vsync + self.vsync_to_photons
+        
+    def wait(self):
+        """Block until the next frame deadline"""
+        self.frame_count += 1
+        if self.period <= 0:
+            return
+            
+        clock = self.clock
+        deadline = self.next_deadline
+        now = clock()
+        remaining = deadline - now
+        
+        if remaining <= 0:
+            # Overrun: the frame took longer than its slot
+            lateness = -remaining
+            self.overruns += 1
+            if lateness > self.max_lateness:
+                self.max_lateness = lateness
+                
+            if lateness >= self.period:
+                # Too far behind to catch up; drop the missed slots
+                self.next_deadline = now + self.period
+            else:
+                self.next_deadline = deadline + self.period
+            return
+            
+        if remaining > self.spin_threshold:
+            self.sleep(remaining - self.spin_threshold)
+        while clock() < deadline:
+            pass
+            
+        self.next_deadline = deadline + self.period
+        
+    def pause(self, seconds: float):
+        """Sleep outside the frame cadence (error back-off) and resynchronize"""
+        self.sleep(seconds)
+        self.next_deadline = self.clock() + self.period
+        
+    def get_stats(self) -> Dict:
+        """Get achieved rate and overrun statistics"""
+        elapsed = self.clock() - self.start_time
+        return {
+            'target_hz': self.target_hz,
+            'achieved_hz': self.frame_count / elapsed if elapsed > 0 else 0.0,
+            'frames': self.frame_count,
+            'overruns': self.overruns,
+            'max_lateness_ms': self.max_lateness * 1000
+        }
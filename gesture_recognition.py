@@ -3,13 +3,162 @@ Advanced gesture recognition system for VR controllers
 Prevents accidental triggers and provides reliable gesture detection
 """
 
+import math
 import time
+from array import array
+from functools import partial
 import numpy as np
 from collections import deque
-from typing import Tuple, Optional, Dict, Callable
+from typing import Tuple, Optional, Dict, Callable, List, Sequence
 import logging
 
 
+# Gesture state machine: states, per-frame events and effects
+STATE_IDLE, STATE_DWELL, STATE_FIRED = range(3)
+EVENT_OUT, EVENT_IN, EVENT_MOVING, EVENT_COOLING, EVENT_READY = range(5)
+EFFECT_NONE, EFFECT_ENTER, EFFECT_LEAVE, EFFECT_RESTART, EFFECT_FIRE = range(5)
+
+# TRANSITIONS[state][event] -> (next state, effect)
+TRANSITIONS = (
+    # IDLE: any inside event starts a dwell
+    ((STATE_IDLE, EFFECT_NONE), (STATE_DWELL, EFFECT_ENTER), (STATE_DWELL, EFFECT_ENTER),
+     (STATE_DWELL, EFFECT_ENTER), (STATE_DWELL, EFFECT_ENTER)),
+    # DWELL: moving too fast restarts the dwell, cooldown waits, ready fires
+    ((STATE_IDLE, EFFECT_LEAVE), (STATE_DWELL, EFFECT_NONE), (STATE_DWELL, EFFECT_RESTART),
+     (STATE_DWELL, EFFECT_NONE), (STATE_FIRED, EFFECT_FIRE)),
+    # FIRED: wait for the controller to leave before the gesture can fire again
+    ((STATE_IDLE, EFFECT_LEAVE), (STATE_FIRED, EFFECT_NONE), (STATE_FIRED, EFFECT_NONE),
+     (STATE_FIRED, EFFECT_NONE), (STATE_FIRED, EFFECT_NONE))
+)
+
+HAND_MASKS = {'any': 3, 'left': 1, 'right': 2}
+ORIENTATION_AXES = ('roll', 'pitch', 'yaw')
+GESTURE_ACTIONS = ('none', 'pipboy', 'pause', 'key')
+
+# Config sections declaring gestures: [gesture:<id>]
+GESTURE_SECTION_PREFIX = 'gesture:'
+
+
+def validate_action(gesture_id: str, action: str):
+    """Raise ValueError unless action is 'pipboy', 'pause', 'key:<key>[:<seconds>]' or 'none'"""
+    action_name, _, argument = action.partition(':')
+    if action_name.strip().lower() not in GESTURE_ACTIONS:
+        raise ValueError(f"Gesture {gesture_id}: unknown action '{action}'")
+    if action_name.strip().lower() == 'key' and not argument.split(':')[0].strip():
+        raise ValueError(f"Gesture {gesture_id}: key action needs a key, e.g. key:g:0.05")
+        
+
+def bind_action(gesture_id: str, action: str, action_handlers: Dict[str, Callable],
+                logger: Optional[logging.Logger] = None) -> Optional[Callable]:
+    """
+    Resolve an action string to a callable
+    
+    Args:
+        gesture_id: Gesture the action belongs to (for the log message)
+        action: Validated action string
+        action_handlers: Callables by action name; 'key' takes (key, seconds)
+        logger: Optional logger instance
+        
+    Returns:
+        Callable without arguments, or None for 'none' and actions without a handler
+    """
+    name, _, argument = action.partition(':')
+    name = name.strip().lower()
+    if name in ('', 'none'):
+        return None
+    handler = action_handlers.get(name)
+    if handler is None:
+        (logger or logging.getLogger(__name__)).debug(f"Gesture {gesture_id}: no handler for action '{action}'")
+        return None
+    if name == 'key':
+        key, _, duration = argument.partition(':')
+        return partial(handler, key.strip(), float(duration) if duration else 0.05)
+    return handler
+    
+
+class GestureDefinition:
+    """
+    Declarative description of a dwell gesture
+    
+    Per-gesture dwell_time, max_velocity and cooldown left as None use the
+    recognizer's [gesture_recognition] values.
+    """
+    
+    def __init__(self, gesture_id: str, center: Tuple[float, float, float], radius: float,
+                 dwell_time: Optional[float] = None, max_velocity: Optional[float] = None,
+                 cooldown: Optional[float] = None, hand: str = 'any',
+                 orientation: Optional[Dict[str, Tuple[float, float]]] = None,
+                 action: str = 'none'):
+        """
+        Args:
+            gesture_id: Unique identifier
+            center: Zone center, controller position relative to the HMD (meters)
+            radius: Zone radius (meters)
+            dwell_time: Seconds to hold still in the zone
+            max_velocity: Highest controller speed (m/s) that still counts as holding
+            cooldown: Seconds before the gesture can fire again
+            hand: 'any', 'left' or 'right'
+            orientation: Optional {'roll'|'pitch'|'yaw': (min, max)} controller
+                         angles in degrees; min > max wraps through +-180
+            action: 'pipboy', 'pause', 'key:<key>[:<seconds>]' or 'none'
+        """
+        if hand not in HAND_MASKS:
+            raise ValueError(f"Gesture {gesture_id}: unknown hand '{hand}'")
+        for axis in (orientation or {}):
+            if axis not in ORIENTATION_AXES:
+                raise ValueError(f"Gesture {gesture_id}: unknown orientation axis '{axis}'")
+        validate_action(gesture_id, action)
+        self.gesture_id = gesture_id
+        self.center = tuple(center)
+        self.radius = radius
+        self.dwell_time = dwell_time
+        self.max_velocity = max_velocity
+        self.cooldown = cooldown
+        self.hand = hand
+        self.orientation = dict(orientation or {})
+        self.action = action
+        
+    @classmethod
+    def from_config_section(cls, gesture_id: str, section) -> 'GestureDefinition':
+        """Build a definition from a configparser section (see config.ini for the keys)"""
+        if not section.get('center'):
+            raise ValueError(f"Gesture {gesture_id}: center is required")
+        center = tuple(float(v) for v in section.get('center').split(','))
+        if len(center) != 3:
+            raise ValueError(f"Gesture {gesture_id}: center needs x, y, z")
+            
+        orientation = {}
+        for axis in ORIENTATION_AXES:
+            if axis in section:
+                low, high = (float(v) for v in section.get(axis).split(','))
+                orientation[axis] = (low, high)
+                
+        return cls(
+            gesture_id, center, section.getfloat('radius', fallback=0.1),
+            dwell_time=section.getfloat('dwell_time', fallback=None),
+            max_velocity=section.getfloat('max_velocity', fallback=None),
+            cooldown=section.getfloat('cooldown', fallback=None),
+            hand=section.get('hand', fallback='any').strip().lower(),
+            orientation=orientation,
+            action=section.get('action', fallback='none').strip()
+        )
+        
+
+def load_gesture_definitions(config, logger: Optional[logging.Logger] = None) -> List[GestureDefinition]:
+    """Read every [gesture:<id>] section of a ConfigParser; invalid sections are logged and skipped"""
+    logger = logger or logging.getLogger(__name__)
+    definitions = []
+    for name in config.sections():
+        if not name.lower().startswith(GESTURE_SECTION_PREFIX):
+            continue
+        gesture_id = name[len(GESTURE_SECTION_PREFIX):].strip()
+        try:
+            definitions.append(GestureDefinition.from_config_section(gesture_id, config[name]))
+        except ValueError as e:
+            logger.error(f"Ignoring gesture section [{name}]: {e}")
+    return definitions
+    
+
 class GestureZone:
     """Represents a 3D zone for gesture detection"""
     
@@ -23,9 +172,6 @@ class GestureZone:
         self.center = np.array(center)
         self.radius = radius
         self.gesture_id = gesture_id
-        self.entry_time = None
-        self.is_inside = False
-        self.last_trigger_time = 0
         
     def check_position(self, pos: Tuple[float, float, float]) -> bool:
         """Check if position is inside the gesture zone"""
@@ -34,135 +180,485 @@ class GestureZone:
         return distance < self.radius
         
 
+class _PackedCell:
+    """Grid cell with enough zones to be tested in one vectorized pass"""
+    
+    __slots__ = ('indices', 'centers', 'radius_sq')
+    
+    def __init__(self, indices: np.ndarray, centers: np.ndarray, radius_sq: np.ndarray):
+        self.indices = indices
+        self.centers = centers
+        self.radius_sq = radius_sq
+        
+
+class GestureZoneSet:
+    """
+    Packed gesture zones with a uniform-grid index and per-zone state arrays
+    
+    Zone centers and squared radii are kept in (n, 3) and (n,) arrays; the
+    dwell state of all zones lives in arrays indexed the same way. Zones are
+    bucketed into grid cells one zone diameter wide, so a position only has
+    to be tested against the few zones sharing its cell and the per-frame
+    cost stays flat as the set grows. Cells are tested in plain Python
+    (cheaper than a NumPy call for a handful of zones) unless they hold more
+    than DENSE_CELL zones, which get one vectorized squared-distance pass.
+    """
+    
+    DENSE_CELL = 16
+    
+    def __init__(self, zones: Sequence[GestureZone] = ()):
+        """
+        Args:
+            zones: Initial zones (ids must be unique; a later zone replaces an earlier one)
+        """
+        self.zones: List[GestureZone] = []
+        self.index: Dict[str, int] = {}
+        for zone in zones:
+            self._insert(zone)
+        self.rebuild()
+        
+    def __len__(self) -> int:
+        return len(self.zones)
+        
+    def add(self, zone: GestureZone) -> int:
+        """Add or replace a zone and rebuild the index; returns the zone's index"""
+        index = self._insert(zone)
+        self.rebuild()
+        return index
+        
+    def _insert(self, zone: GestureZone) -> int:
+        index = self.index.get(zone.gesture_id)
+        if index is None:
+            index = self.index[zone.gesture_id] = len(self.zones)
+            self.zones.append(zone)
+        else:
+            self.zones[index] = zone
+        return index
+        
+    def rebuild(self):
+        """Repack the arrays and grid from self.zones; clears the dwell state"""
+        count = len(self.zones)
+        self.ids = [zone.gesture_id for zone in self.zones]
+        self.centers = np.array([zone.center for zone in self.zones], dtype=np.float64).reshape(count, 3)
+        radii = np.array([zone.radius for zone in self.zones], dtype=np.float64)
+        self.radius_sq = radii * radii
+        
+        # Cells as wide as the largest zone, so a zone spans at most 2 cells per axis
+        self.inv_cell = 1.0 / (2.0 * radii.max()) if count and radii.max() > 0 else 1.0
+        cells = {}
+        for index in range(count):
+            low = np.floor((self.centers[index] - radii[index]) * self.inv_cell).astype(int)
+            high = np.floor((self.centers[index] + radii[index]) * self.inv_cell).astype(int)
+            for cx in range(low[0], high[0] + 1):
+                for cy in range(low[1], high[1] + 1):
+                    for cz in range(low[2], high[2] + 1):
+                        cells.setdefault((cx, cy, cz), []).append(index)
+                        
+        self.grid = {}
+        for key, indices in cells.items():
+            if len(indices) > self.DENSE_CELL:
+                indices = np.array(indices)
+                self.grid[key] = _PackedCell(indices, self.centers[indices], self.radius_sq[indices])
+            else:
+                self.grid[key] = tuple((index, *self.centers[index].tolist(), float(self.radius_sq[index]))
+                                       for index in indices)
+                                       
+        self.reset_state()
+        
+    def reset_state(self):
+        """Mark every zone as empty, with no dwell in progress and no cooldown"""
+        self.last_trigger = np.full(len(self.zones), -np.inf)
+        self.clear_dwell()
+        
+    def clear_dwell(self):
+        """Mark every zone as empty, keeping cooldowns"""
+        count = len(self.zones)
+        self.state = np.zeros(count, dtype=np.int8)  # STATE_* per zone
+        self.entry_time = np.full(count, np.nan)  # Start of the current dwell
+        self.occupied = set()  # Indices not in STATE_IDLE, for a cheap empty check
+        
+    def query(self, position: Tuple[float, float, float]) -> List[int]:
+        """Indices of the zones containing a position, in ascending order"""
+        x, y, z = position
+        inv = self.inv_cell
+        cell = self.grid.get((math.floor(x * inv), math.floor(y * inv), math.floor(z * inv)))
+        if not cell:
+            return []
+        if type(cell) is tuple:
+            return [index for index, cx, cy, cz, radius_sq in cell
+                    if (x - cx) ** 2 + (y - cy) ** 2 + (z - cz) ** 2 < radius_sq]
+        delta = cell.centers - position
+        delta *= delta
+        return cell.indices[delta.sum(axis=1) < cell.radius_sq].tolist()
+        
+    def contains(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Vectorized test of positions against every zone (no index)
+        
+        Args:
+            positions: (3,) or (frames, 3) positions
+            
+        Returns:
+            (zones,) or (frames, zones) boolean array
+        """
+        delta = np.asarray(positions, dtype=np.float64)[..., None, :] - self.centers
+        return np.einsum('...k,...k->...', delta, delta) < self.radius_sq
+        
+
 class VelocityTracker:
-    """Tracks velocity of controller movement"""
+    """
+    Tracks velocity of controller movement
+    
+    Samples and the segments between them are kept in fixed-size ring
+    buffers with running sums, so update() and the getters take constant
+    time whatever the window size and allocate nothing (get_direction()
+    returns a new array). The sums are recomputed from the buffers every
+    RESUM_INTERVAL updates to stop floating-point drift.
+    
+    Methods:
+        mean: Average of the per-segment speeds and unit directions
+        least_squares: Slope of a least-squares line through the window's
+                       positions over time; less sensitive to jitter in
+                       single samples
+    """
     
-    def __init__(self, window_size: int = 10):
+    RESUM_INTERVAL = 1024
+    METHODS = ('mean', 'least_squares')
+    
+    def __init__(self, window_size: int = 10, method: str = 'mean'):
         """
         Args:
             window_size: Number of samples to use for velocity calculation
+            method: 'mean' or 'least_squares'
         """
-        self.positions = deque(maxlen=window_size)
-        self.timestamps = deque(maxlen=window_size)
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown velocity method: {method}")
+        self.window_size = max(2, int(window_size))
+        self.method = method
+        
+        # Sample ring (times relative to self.t0) and segment ring (one fewer)
+        size = self.window_size
+        self._t, self._x, self._y, self._z = (array('d', bytes(8 * size)) for _ in range(4))
+        self._speed, self._ux, self._uy, self._uz = (array('d', bytes(8 * (size - 1))) for _ in range(4))
+        self._speed_valid = array('b', bytes(size - 1))
+        self._dir_valid = array('b', bytes(size - 1))
+        self.reset()
         
     def update(self, position: Tuple[float, float, float], timestamp: float = None):
         """Update with new position"""
         if timestamp is None:
             timestamp = time.time()
+        if self.t0 is None:
+            self.t0 = timestamp
+        x, y, z = position
+        t = timestamp - self.t0
+        size = self.window_size
+        
+        if self.count:
+            # Segment from the previous sample
+            last = (self.head - 1) % size
+            dx = x - self._x[last]
+            dy = y - self._y[last]
+            dz = z - self._z[last]
+            dt = t - self._t[last]
+            norm = math.sqrt(dx*dx + dy*dy + dz*dz)
+            
+            slot = self.segment_head
+            if self.segments == size - 1:
+                self._remove_segment(slot)
+            else:
+                self.segments += 1
+            self.segment_head = (slot + 1) % (size - 1)
             
-        self.positions.append(np.array(position))
-        self.timestamps.append(timestamp)
+            if dt > 0:
+                speed = norm / dt
+                self._speed[slot] = speed
+                self._speed_valid[slot] = 1
+                self.speed_sum += speed
+                self.speed_count += 1
+            else:
+                self._speed[slot] = 0.0
+                self._speed_valid[slot] = 0
+            if norm > 0:
+                ux, uy, uz = dx / norm, dy / norm, dz / norm
+                self._ux[slot] = ux
+                self._uy[slot] = uy
+                self._uz[slot] = uz
+                self._dir_valid[slot] = 1
+                self.dir_x += ux
+                self.dir_y += uy
+                self.dir_z += uz
+                self.dir_count += 1
+            else:
+                self._dir_valid[slot] = 0
+                
+        slot = self.head
+        if self.count == size:
+            self._remove_sample(slot)
+        else:
+            self.count += 1
+        self.head = (slot + 1) % size
+        self._t[slot] = t
+        self._x[slot] = x
+        self._y[slot] = y
+        self._z[slot] = z
+        self._add_sample(t, x, y, z)
         
+        self.updates += 1
+        if self.updates % self.RESUM_INTERVAL == 0:
+            self._resum()
+            
     def get_velocity(self) -> float:
         """Calculate current velocity magnitude"""
-        if len(self.positions) < 2:
-            return 0.0
+        if self.method == 'least_squares':
+            slope = self._slope()
+            if slope is None:
+                return 0.0
+            vx, vy, vz = slope
+            return math.sqrt(vx*vx + vy*vy + vz*vz)
             
-        # Calculate average velocity over the window
-        velocities = []
-        for i in range(1, len(self.positions)):
-            dt = self.timestamps[i] - self.timestamps[i-1]
-            if dt > 0:
-                dp = self.positions[i] - self.positions[i-1]
-                velocity = np.linalg.norm(dp) / dt
-                velocities.append(velocity)
-                
-        return np.mean(velocities) if velocities else 0.0
+        if self.speed_count == 0:
+            return 0.0
+        return max(0.0, self.speed_sum / self.speed_count)
         
     def get_direction(self) -> Optional[np.ndarray]:
         """Get average movement direction"""
-        if len(self.positions) < 2:
+        if self.method == 'least_squares':
+            direction = self._slope()
+        elif self.dir_count:
+            direction = (self.dir_x, self.dir_y, self.dir_z)
+        else:
+            direction = None
+        if direction is None:
             return None
             
-        # Calculate average direction
-        directions = []
-        for i in range(1, len(self.positions)):
-            dp = self.positions[i] - self.positions[i-1]
-            norm = np.linalg.norm(dp)
-            if norm > 0:
-                directions.append(dp / norm)
-                
-        if directions:
-            avg_direction = np.mean(directions, axis=0)
-            norm = np.linalg.norm(avg_direction)
-            if norm > 0:
-                return avg_direction / norm
-                
+        dx, dy, dz = direction
+        norm = math.sqrt(dx*dx + dy*dy + dz*dz)
+        if norm > 1e-12:
+            return np.array((dx / norm, dy / norm, dz / norm))
         return None
         
     def reset(self):
         """Reset velocity tracking"""
-        self.positions.clear()
-        self.timestamps.clear()
+        self.t0 = None
+        self.count = self.head = 0
+        self.segments = self.segment_head = 0
+        self.updates = 0
+        self._clear_sums()
+        
+    def _clear_sums(self):
+        self.speed_sum = 0.0
+        self.speed_count = 0
+        self.dir_x = self.dir_y = self.dir_z = 0.0
+        self.dir_count = 0
+        self.sum_t = self.sum_tt = 0.0
+        self.sum_x = self.sum_y = self.sum_z = 0.0
+        self.sum_tx = self.sum_ty = self.sum_tz = 0.0
         
+    def _add_sample(self, t: float, x: float, y: float, z: float):
+        self.sum_t += t
+        self.sum_tt += t * t
+        self.sum_x += x
+        self.sum_y += y
+        self.sum_z += z
+        self.sum_tx += t * x
+        self.sum_ty += t * y
+        self.sum_tz += t * z
+        
+    def _remove_sample(self, slot: int):
+        t, x, y, z = self._t[slot], self._x[slot], self._y[slot], self._z[slot]
+        self.sum_t -= t
+        self.sum_tt -= t * t
+        self.sum_x -= x
+        self.sum_y -= y
+        self.sum_z -= z
+        self.sum_tx -= t * x
+        self.sum_ty -= t * y
+        self.sum_tz -= t * z
+        
+    def _remove_segment(self, slot: int):
+        if self._speed_valid[slot]:
+            self.speed_sum -= self._speed[slot]
+            self.speed_count -= 1
+        if self._dir_valid[slot]:
+            self.dir_x -= self._ux[slot]
+            self.dir_y -= self._uy[slot]
+            self.dir_z -= self._uz[slot]
+            self.dir_count -= 1
+            
+    def _slope(self) -> Optional[Tuple[float, float, float]]:
+        """Least-squares velocity vector over the window, None if undefined"""
+        n = self.count
+        if n < 2:
+            return None
+        mean_t = self.sum_t / n
+        denominator = self.sum_tt - mean_t * self.sum_t
+        if denominator <= 1e-12:
+            return None
+        return ((self.sum_tx - mean_t * self.sum_x) / denominator,
+                (self.sum_ty - mean_t * self.sum_y) / denominator,
+                (self.sum_tz - mean_t * self.sum_z) / denominator)
+                
+    def _resum(self):
+        """Recompute the sums from the buffers, moving the time origin to the newest sample"""
+        size = self.window_size
+        shift = self._t[(self.head - 1) % size]
+        self.t0 += shift
+        self._clear_sums()
+        for slot in range(self.count):
+            self._t[slot] -= shift
+            self._add_sample(self._t[slot], self._x[slot], self._y[slot], self._z[slot])
+        for slot in range(self.segments):
+            if self._speed_valid[slot]:
+                self.speed_sum += self._speed[slot]
+                self.speed_count += 1
+            if self._dir_valid[slot]:
+                self.dir_x += self._ux[slot]
+                self.dir_y += self._uy[slot]
+                self.dir_z += self._uz[slot]
+                self.dir_count += 1
+                
 
 class GestureRecognizer:
-    """Advanced gesture recognition with velocity and dwell time"""
+    """
+    Advanced gesture recognition with velocity and dwell time
+    
+    Gestures are GestureDefinitions: the built-in pipboy and pause gestures
+    plus any [gesture:<id>] config sections. compile() turns them into one
+    rule row (dwell, velocity, cooldown, hand, orientation) and one bound
+    action per zone; update() then runs every zone the grid index reports,
+    plus the ones already occupied, through the TRANSITIONS table in a
+    single pass, so the per-frame cost does not grow with the number of
+    gestures.
+    """
     
-    def __init__(self, config: Dict, logger: Optional[logging.Logger] = None):
+    def __init__(self, config: Dict, logger: Optional[logging.Logger] = None,
+                 action_handlers: Optional[Dict[str, Callable]] = None):
         """
         Initialize gesture recognizer
         
         Args:
-            config: Configuration dictionary
+            config: Configuration dictionary (gesture_definitions: extra GestureDefinitions)
             logger: Optional logger instance
+            action_handlers: Callables for definition actions by name, e.g.
+                             {'pipboy': f, 'pause': g, 'key': press_key(key, seconds)}
         """
         self.config = config
         self.logger = logger or logging.getLogger(__name__)
         
-        # Gesture parameters
+        # Gesture parameters (defaults for definitions that do not set their own)
         self.dwell_time = config.get('gesture_dwell_time', 0.5)
         self.cooldown_time = config.get('gesture_cooldown', 1.0)
         self.max_velocity = config.get('gesture_max_velocity', 0.5)
         self.enabled = config.get('gesture_recognition_enabled', True)
+        self.action_handlers = dict(action_handlers or {})
         
-        # Create gesture zones
-        self.gesture_zones = {}
-        self._create_gesture_zones()
-        
+        # Gesture definitions by id; later ones replace built-ins with the same id
+        self.definitions: Dict[str, GestureDefinition] = {}
+        for definition in self._builtin_definitions() + list(config.get('gesture_definitions', ())):
+            self.definitions[definition.gesture_id] = definition
+            
         # Velocity tracker
-        self.velocity_tracker = VelocityTracker()
+        self.velocity_tracker = VelocityTracker(
+            window_size=config.get('gesture_velocity_window', 10),
+            method=config.get('gesture_velocity_method', 'mean')
+        )
         
-        # Gesture callbacks
+        # Gesture callbacks (override a definition's action)
         self.gesture_callbacks = {}
         
-        self.logger.info("Advanced gesture recognition initialized")
+        self.compile()
+        self.logger.info(f"Advanced gesture recognition initialized ({len(self.definitions)} gestures)")
         
-    def _create_gesture_zones(self):
-        """Create gesture detection zones from config"""
-        # Pipboy gesture
-        self.gesture_zones['pipboy'] = GestureZone(
-            center=(
-                self.config.get('gesture_x', 0.12),
-                self.config.get('gesture_y', 0.24),
-                self.config.get('gesture_z', -0.29)
+    def _builtin_definitions(self) -> List[GestureDefinition]:
+        """Pipboy and pause menu gestures from their config sections"""
+        config = self.config
+        return [
+            GestureDefinition(
+                'pipboy',
+                (config.get('gesture_x', 0.12), config.get('gesture_y', 0.24), config.get('gesture_z', -0.29)),
+                config.get('gesture_threshold', 0.1),
+                action='pipboy'
             ),
-            radius=self.config.get('gesture_threshold', 0.1),
-            gesture_id='pipboy'
-        )
+            GestureDefinition(
+                'pause',
+                (config.get('pause_x', -0.3158), config.get('pause_y', -0.1897), config.get('pause_z', -0.1316)),
+                config.get('pause_threshold', 0.1),
+                action='pause'
+            )
+        ]
         
-        # Pause menu gesture
-        self.gesture_zones['pause'] = GestureZone(
-            center=(
-                self.config.get('pause_x', -0.3158),
-                self.config.get('pause_y', -0.1897),
-                self.config.get('pause_z', -0.1316)
-            ),
-            radius=self.config.get('pause_threshold', 0.1),
-            gesture_id='pause'
-        )
+    def compile(self):
+        """Rebuild zones, rule rows and bound actions from self.definitions (clears all gesture state)"""
+        # Zone descriptors by id; geometry and state packed in self.zones
+        self.gesture_zones = {gesture_id: GestureZone(definition.center, definition.radius, gesture_id)
+                              for gesture_id, definition in self.definitions.items()}
+        self.zones = GestureZoneSet(self.gesture_zones.values())
+        
+        self.rules = []
+        self.actions = []
+        for gesture_id in self.zones.ids:
+            definition = self.definitions[gesture_id]
+            orientation = tuple((ORIENTATION_AXES.index(axis), low, high)
+                                for axis, (low, high) in definition.orientation.items())
+            self.rules.append((
+                self.dwell_time if definition.dwell_time is None else definition.dwell_time,
+                self.max_velocity if definition.max_velocity is None else definition.max_velocity,
+                self.cooldown_time if definition.cooldown is None else definition.cooldown,
+                HAND_MASKS[definition.hand],
+                orientation or None
+            ))
+            self.actions.append(self.gesture_callbacks.get(gesture_id) or self._bind_action(definition))
+            
+        self.constrained = any(rule[3] != HAND_MASKS['any'] or rule[4] for rule in self.rules)
+        self.needs_orientation = any(rule[4] for rule in self.rules)
+        
+    def _bind_action(self, definition: GestureDefinition) -> Optional[Callable]:
+        """Resolve a definition's action string to a callable"""
+        return bind_action(definition.gesture_id, definition.action, self.action_handlers, self.logger)
+        
+    def add_gesture(self, definition: GestureDefinition):
+        """Add or replace a gesture and recompile (clears all gesture state)"""
+        self.definitions[definition.gesture_id] = definition
+        self.compile()
+        
+    def add_gesture_zone(self, zone: GestureZone):
+        """Add or replace a plain dwell gesture with default parameters and no action"""
+        self.add_gesture(GestureDefinition(zone.gesture_id, tuple(zone.center.tolist()), zone.radius))
         
     def register_gesture_callback(self, gesture_id: str, callback: Callable):
-        """Register a callback for when a gesture is recognized"""
+        """Register a callback for when a gesture is recognized (replaces its configured action)"""
         self.gesture_callbacks[gesture_id] = callback
+        index = self.zones.index.get(gesture_id)
+        if index is not None:
+            self.actions[index] = callback
+            
+    @staticmethod
+    def _matches(rule: tuple, rotation: Optional[Sequence[float]], hand: Optional[str]) -> bool:
+        """Check a rule's hand and orientation constraints"""
+        hand_mask, orientation = rule[3], rule[4]
+        if hand_mask != HAND_MASKS['any'] and not HAND_MASKS.get(hand, 0) & hand_mask:
+            return False
+        if orientation:
+            if rotation is None:
+                return False
+            for axis, low, high in orientation:
+                angle = rotation[axis]
+                if not (low <= angle <= high if low <= high else angle >= low or angle <= high):
+                    return False
+        return True
         
-    def update(self, position: Tuple[float, float, float], timestamp: float = None) -> Optional[str]:
+    def update(self, position: Tuple[float, float, float], timestamp: float = None,
+               rotation: Optional[Sequence[float]] = None, hand: Optional[str] = None) -> Optional[str]:
         """
         Update gesture recognition with new position
         
         Args:
             position: Current controller position
             timestamp: Optional timestamp
+            rotation: Controller (roll, pitch, yaw) in degrees; only needed
+                      when a gesture has an orientation constraint
+            hand: 'left' or 'right'; gestures bound to a hand never match when None
             
         Returns:
             Gesture ID if a gesture was triggered, None otherwise
@@ -175,88 +671,105 @@ class GestureRecognizer:
             
         # Update velocity tracking
         self.velocity_tracker.update(position, timestamp)
-        velocity = self.velocity_tracker.get_velocity()
         
+        zones = self.zones
+        inside = zones.query(position)
+        occupied = zones.occupied
+        if not inside and not occupied:
+            return None
+        if inside and self.constrained:
+            rules = self.rules
+            inside = [index for index in inside if self._matches(rules[index], rotation, hand)]
+            
         triggered_gesture = None
+        velocity = None
+        state = zones.state
+        entry_time = zones.entry_time
+        last_trigger = zones.last_trigger
         
-        # Check each gesture zone
-        for zone_id, zone in self.gesture_zones.items():
-            is_inside = zone.check_position(position)
-            
-            if is_inside and not zone.is_inside:
-                # Just entered the zone
-                zone.is_inside = True
-                zone.entry_time = timestamp
-                self.logger.debug(f"Entered {zone_id} gesture zone")
+        for index in sorted(occupied.union(inside)) if occupied else inside:
+            current = state[index]
+            if index not in inside:
+                event = EVENT_OUT
+            elif current != STATE_DWELL:
+                event = EVENT_IN
+            else:
+                dwell_time, max_velocity, cooldown = self.rules[index][:3]
+                if timestamp - entry_time[index] < dwell_time:
+                    event = EVENT_IN
+                else:
+                    # Must be relatively still, then out of cooldown
+                    if velocity is None:
+                        velocity = self.velocity_tracker.get_velocity()
+                    if velocity > max_velocity:
+                        event = EVENT_MOVING
+                    elif timestamp - last_trigger[index] < cooldown:
+                        event = EVENT_COOLING
+                    else:
+                        event = EVENT_READY
+                        
+            state[index], effect = TRANSITIONS[current][event]
+            if effect == EFFECT_NONE:
+                continue
+            if effect == EFFECT_ENTER:
+                occupied.add(index)
+                entry_time[index] = timestamp
+                self.logger.debug(f"Entered {zones.ids[index]} gesture zone")
+            elif effect == EFFECT_LEAVE:
+                occupied.discard(index)
+                entry_time[index] = np.nan
+                self.logger.debug(f"Left {zones.ids[index]} gesture zone")
+            elif effect == EFFECT_RESTART:
+                # Moving too fast, reset entry time
+                entry_time[index] = timestamp
+            else:  # EFFECT_FIRE
+                zone_id = zones.ids[index]
+                last_trigger[index] = timestamp
+                entry_time[index] = np.nan
+                triggered_gesture = zone_id
                 
-            elif not is_inside and zone.is_inside:
-                # Just left the zone
-                zone.is_inside = False
-                zone.entry_time = None
-                self.logger.debug(f"Left {zone_id} gesture zone")
+                self.logger.info(f"Gesture triggered: {zone_id}")
                 
-            elif is_inside and zone.is_inside:
-                # Still inside the zone
-                if zone.entry_time is not None:
-                    # Check dwell time
-                    dwell_duration = timestamp - zone.entry_time
+                action = self.actions[index]
+                if action is not None:
+                    action()
                     
-                    if dwell_duration >= self.dwell_time:
-                        # Check velocity (must be relatively still)
-                        if velocity <= self.max_velocity:
-                            # Check cooldown
-                            time_since_last = timestamp - zone.last_trigger_time
-                            
-                            if time_since_last >= self.cooldown_time:
-                                # Trigger gesture!
-                                zone.last_trigger_time = timestamp
-                                zone.entry_time = None  # Reset to prevent re-triggering
-                                triggered_gesture = zone_id
-                                
-                                self.logger.info(f"Gesture triggered: {zone_id}")
-                                
-                                # Call registered callback
-                                if zone_id in self.gesture_callbacks:
-                                    self.gesture_callbacks[zone_id]()
-                                    
-                        else:
-                            # Moving too fast, reset entry time
-                            zone.entry_time = timestamp
-                            
         return triggered_gesture
         
-    def get_zone_status(self, zone_id: str) -> Dict:
-        """Get current status of a gesture zone"""
-        if zone_id not in self.gesture_zones:
+    def get_zone_status(self, zone_id: str, now: float = None) -> Dict:
+        """Get current status of a gesture zone (now: timestamp on the update() clock)"""
+        index = self.zones.index.get(zone_id)
+        if index is None:
             return {}
             
-        zone = self.gesture_zones[zone_id]
-        now = time.time()
+        zones = self.zones
+        if now is None:
+            now = time.time()
+        dwell_time, _, cooldown = self.rules[index][:3]
+        state = zones.state[index]
         
         status = {
-            'is_inside': zone.is_inside,
+            'is_inside': bool(state != STATE_IDLE),
             'progress': 0.0,
             'can_trigger': True
         }
         
-        if zone.is_inside and zone.entry_time is not None:
-            dwell_duration = now - zone.entry_time
-            status['progress'] = min(1.0, dwell_duration / self.dwell_time)
+        if state == STATE_DWELL:
+            dwell_duration = now - float(zones.entry_time[index])
+            status['progress'] = min(1.0, dwell_duration / dwell_time) if dwell_time > 0 else 1.0
             
         # Check cooldown
-        time_since_last = now - zone.last_trigger_time
-        if time_since_last < self.cooldown_time:
+        time_since_last = now - float(zones.last_trigger[index])
+        if time_since_last < cooldown:
             status['can_trigger'] = False
-            status['cooldown_remaining'] = self.cooldown_time - time_since_last
+            status['cooldown_remaining'] = cooldown - time_since_last
             
         return status
         
     def reset(self):
         """Reset all gesture states"""
-        for zone in self.gesture_zones.values():
-            zone.is_inside = False
-            zone.entry_time = None
-            
+        self.zones.clear_dwell()
+        
         self.velocity_tracker.reset()
         
 
@@ -284,4 +797,179 @@ class GestureVisualizer:
         if progress < 1.0:
             return f"Dolduruluyor: {int(progress * 100)}%"
         else:
-            return "Hazır!"
\ No newline at end of file
+            return "Hazır!"
+            
+
+class GestureBenchmark:
+    """Measures zone testing cost as the number of gesture zones grows"""
+    
+    @staticmethod
+    def random_zones(count: int, radius: float = 0.08, extent: float = 0.6, seed: int = 0) -> List[GestureZone]:
+        """Zones scattered in a cube of +-extent meters around the HMD"""
+        rng = np.random.default_rng(seed)
+        centers = rng.uniform(-extent, extent, (count, 3))
+        return [GestureZone(tuple(center), radius, f"zone{i}") for i, center in enumerate(centers.tolist())]
+        
+    @staticmethod
+    def benchmark_zone_counts(counts: Sequence[int] = (2, 10, 50, 100, 200), frames: int = 2000,
+                              seed: int = 0) -> Dict:
+        """
+        Test a random controller path against growing zone sets
+        
+        Args:
+            counts: Zone set sizes
+            frames: Positions per measurement
+            seed: Random seed for zones and path
+            
+        Returns:
+            Dictionary per zone count with microseconds per frame for the
+            per-zone loop (GestureZone.check_position), the vectorized pass
+            over all zones and the grid query, and whether all three agree
+        """
+        rng = np.random.default_rng(seed + 1)
+        path = np.cumsum(rng.normal(0.0, 0.01, (frames, 3)), axis=0)
+        path = np.clip(path, -0.6, 0.6)
+        positions = [tuple(p) for p in path.tolist()]
+        clock = time.perf_counter
+        results = {}
+        
+        for count in counts:
+            zones = GestureBenchmark.random_zones(count, seed=seed)
+            zone_set = GestureZoneSet(zones)
+            
+            start = clock()
+            loop = [[i for i, zone in enumerate(zones) if zone.check_position(p)] for p in positions]
+            loop_time = clock() - start
+            
+            start = clock()
+            vectorized = [np.flatnonzero(zone_set.contains(p)).tolist() for p in positions]
+            vectorized_time = clock() - start
+            
+            start = clock()
+            grid = [zone_set.query(p) for p in positions]
+            grid_time = clock() - start
+            
+            results[count] = {
+                'loop_us': loop_time / frames * 1e6,
+                'vectorized_us': vectorized_time / frames * 1e6,
+                'grid_us': grid_time / frames * 1e6,
+                'hits': sum(map(len, grid)),
+                'match': loop == vectorized == grid
+            }
+        return results
+        
+    @staticmethod
+    def benchmark_gesture_counts(counts: Sequence[int] = (2, 10, 50, 100), frames: int = 3000,
+                                 seed: int = 0) -> Dict:
+        """
+        Per-frame GestureRecognizer.update cost as gestures are added
+        
+        Half of the added gestures carry hand and orientation constraints.
+        The controller path visits zone centers and dwells there, so zones
+        are entered, held, fired and left throughout.
+        
+        Returns:
+            Dictionary per gesture count with update_us per frame and the
+            number of gestures fired
+        """
+        rng = np.random.default_rng(seed + 2)
+        results = {}
+        for count in counts:
+            recognizer = GestureRecognizer({'gesture_dwell_time': 0.2, 'gesture_cooldown': 0.5})
+            for i, zone in enumerate(GestureBenchmark.random_zones(max(0, count - 2), seed=seed)):
+                constraints = {'hand': 'right', 'orientation': {'roll': (-90.0, 90.0)}} if i % 2 else {}
+                recognizer.definitions[zone.gesture_id] = GestureDefinition(
+                    zone.gesture_id, tuple(zone.center.tolist()), zone.radius, **constraints)
+            recognizer.compile()
+            
+            centers = recognizer.zones.centers
+            targets = centers[rng.integers(len(centers), size=frames // 30 + 1)]
+            path = np.repeat(targets, 30, axis=0)[:frames] + rng.normal(0.0, 0.002, (frames, 3))
+            positions = [tuple(p) for p in path.tolist()]
+            rotations = [(float(a), 0.0, 0.0) for a in rng.uniform(-120.0, 120.0, frames)]
+            
+            fired = 0
+            start = time.perf_counter()
+            for i, (p, rotation) in enumerate(zip(positions, rotations)):
+                if recognizer.update(p, 1000.0 + i / 90.0, rotation, 'right') is not None:
+                    fired += 1
+            elapsed = time.perf_counter() - start
+            results[count] = {'update_us': elapsed / frames * 1e6, 'fired': fired}
+        return results
+        
+    @staticmethod
+    def _rescan_velocity(positions: deque, timestamps: deque) -> float:
+        """Previous VelocityTracker.get_velocity: mean segment speed rescanned every call"""
+        velocities = []
+        for i in range(1, len(positions)):
+            dt = timestamps[i] - timestamps[i-1]
+            if dt > 0:
+                velocities.append(np.linalg.norm(positions[i] - positions[i-1]) / dt)
+        return float(np.mean(velocities)) if velocities else 0.0
+        
+    @staticmethod
+    def benchmark_velocity_windows(windows: Sequence[int] = (5, 10, 30, 100), frames: int = 3000,
+                                   rate: float = 90.0, seed: int = 0) -> Dict:
+        """
+        Per-frame velocity cost for growing window sizes
+        
+        Args:
+            windows: VelocityTracker window sizes
+            frames: Samples per measurement
+            rate: Sample rate in Hz
+            seed: Random seed for the path
+            
+        Returns:
+            Dictionary per window with microseconds per frame (update plus
+            get_velocity) for the previous rescanning tracker, the incremental
+            mean and least squares, the largest difference between rescan and
+            incremental mean, and recognizer_us: GestureRecognizer.update while
+            dwelling in a zone, where the velocity is read every frame
+        """
+        rng = np.random.default_rng(seed)
+        path = np.cumsum(rng.normal(0.0, 0.002, (frames, 3)), axis=0)
+        positions = [tuple(p) for p in path.tolist()]
+        timestamps = (1000.0 + np.arange(frames) / rate).tolist()
+        clock = time.perf_counter
+        results = {}
+        
+        for window in windows:
+            history = deque(maxlen=window)
+            stamps = deque(maxlen=window)
+            start = clock()
+            rescan = []
+            for p, t in zip(positions, timestamps):
+                history.append(np.array(p))
+                stamps.append(t)
+                rescan.append(GestureBenchmark._rescan_velocity(history, stamps))
+            rescan_time = clock() - start
+            
+            timings = {}
+            for method in VelocityTracker.METHODS:
+                tracker = VelocityTracker(window, method)
+                start = clock()
+                speeds = []
+                for p, t in zip(positions, timestamps):
+                    tracker.update(p, t)
+                    speeds.append(tracker.get_velocity())
+                timings[method] = clock() - start
+                if method == 'mean':
+                    error = float(np.abs(np.array(speeds) - rescan).max())
+                    
+            # Dwell on a zone around the path with the velocity limit never met
+            recognizer = GestureRecognizer({'gesture_velocity_window': window, 'gesture_max_velocity': 0.0,
+                                            'gesture_dwell_time': 0.0})
+            recognizer.add_gesture_zone(GestureZone(tuple(path.mean(axis=0)), 10.0, 'dwell'))
+            start = clock()
+            for p, t in zip(positions, timestamps):
+                recognizer.update(p, t)
+            recognizer_time = clock() - start
+            
+            results[window] = {
+                'rescan_us': rescan_time / frames * 1e6,
+                'mean_us': timings['mean'] / frames * 1e6,
+                'least_squares_us': timings['least_squares'] / frames * 1e6,
+                'max_error': error,
+                'recognizer_us': recognizer_time / frames * 1e6
+            }
+        return results
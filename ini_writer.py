@@ -0,0 +1,323 @@
+"""
+Asynchronous game INI writer
+Keeps filesystem latency out of the tracking thread
+"""
+
+import os
+import time
+import threading
+import logging
+from typing import Callable, Dict, Optional, Tuple
+
+
+INI_WRITE_MODES = ('replace', 'inplace')
+
+
+class IniTemplate:
+    """
+    Precompiled [Standard] section renderer
+    
+    The section is compiled once into a bytes template with fixed-width
+    numeric fields (right-aligned; the game trims the padding), so each
+    frame is a single formatting call and the file length normally stays
+    the same from frame to frame.
+    """
+    
+    FIELDS = ('fiX', 'fiY', 'fiZ', 'fiXr', 'fiZr', 'fpZr')
+    
+    def __init__(self, width: int = 12, precision: int = 4, newline: str = os.linesep):
+        """
+        Args:
+            width: Field width in characters
+            precision: Decimal places
+            newline: Line terminator (platform default, as text-mode writes used)
+        """
+        lines = ["[Standard]", "fCanIOpenThis = 1"]
+        lines += [f"{name} = %{width}.{precision}f" for name in self.FIELDS]
+        self.template = (newline.join(lines) + newline).encode('ascii')
+        self.length = len(self.template % ((0.0,) * len(self.FIELDS)))
+        
+    def render(self, values: Tuple[float, ...]) -> bytes:
+        """
+        Render scaled output values
+        
+        Args:
+            values: fCanIOpenThis, fiX, fiY, fiZ, fiXr, fiZr, fpZr (see OutputTransform)
+        """
+        return self.template % values[1:]
+        
+
+class IniFileWriter:
+    """
+    Writes rendered INI bytes with one write call
+    
+    Modes:
+        replace: Write a temp file and os.replace() it over the INI (atomic)
+        inplace: Keep the INI open and overwrite it at offset 0 (pwrite where
+                 available); fastest, but a reader can catch a half-written file
+    """
+    
+    def __init__(self, mode: str = 'replace'):
+        """
+        Args:
+            mode: One of INI_WRITE_MODES
+        """
+        if mode not in INI_WRITE_MODES:
+            raise ValueError(f"Unknown INI write mode: {mode}")
+        self.mode = mode
+        self._fd = None
+        self._fd_path = None
+        self._fd_length = -1
+        
+    def write(self, path: str, data: bytes):
+        """Write data as the full file contents; raises OSError on failure"""
+        if self.mode == 'replace':
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            return
+            
+        if path != self._fd_path:
+            self.close()
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0))
+            self._fd_path = path
+            self._fd_length = -1
+            
+        fd = self._fd
+        length = len(data)
+        try:
+            if length != self._fd_length:
+                # Length changed (first write or a field overflowed its width)
+                os.ftruncate(fd, length)
+                self._fd_length = length
+            if hasattr(os, 'pwrite'):
+                os.pwrite(fd, data, 0)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, data)
+        except OSError:
+            self.close()
+            raise
+            
+    def close(self):
+        """Close the file kept open by the inplace mode"""
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+        self._fd_path = None
+        
+
+class AsyncIniWriter:
+    """
+    Writes the game INI from a background thread
+    
+    submit() only stores the latest values in a single-slot mailbox, so the
+    tracking loop never waits for the disk; frames that arrive while a write
+    is in progress or rate limited are coalesced (latest value wins). Each
+    write goes to a temp file that atomically replaces the INI, so the game
+    never reads a truncated file, and unchanged output is not rewritten.
+    """
+    
+    def __init__(self, max_rate: float = 90.0,
+                 error_callback: Optional[Callable[[str, str], None]] = None,
+                 logger: Optional[logging.Logger] = None,
+                 template: Optional[IniTemplate] = None, write_mode: str = 'replace'):
+        """
+        Args:
+            max_rate: Maximum writes per second (0 = unlimited)
+            error_callback: Called with (message, level) when a write fails
+            logger: Optional logger instance
+            template: INI renderer (default: IniTemplate())
+            write_mode: One of INI_WRITE_MODES
+        """
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.template = template or IniTemplate()
+        self.file_writer = IniFileWriter(write_mode)
+        self.error_callback = error_callback
+        self.logger = logger or logging.getLogger(__name__)
+        
+        self._condition = threading.Condition()
+        self._pending = None  # (path, values)
+        self._stop = threading.Event()
+        self._thread = None
+        self._next_write = 0.0
+        self._last_path = None
+        self._last_text = None
+        self._last_error = None
+        
+        # Statistics
+        self.submitted = 0
+        self.coalesced = 0
+        self.written = 0
+        self.skipped_identical = 0
+        self.errors = 0
+        self.last_write_ms = 0.0
+        
+    def start(self):
+        """Start the writer thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="IniWriter", daemon=True)
+        self._thread.start()
+        
+    def submit(self, path: str, values: Tuple[float, ...]):
+        """Queue values for writing; never blocks on I/O"""
+        if self._thread is None:
+            self.start()
+        with self._condition:
+            if self._pending is not None:
+                self.coalesced += 1
+            self._pending = (path, values)
+            self.submitted += 1
+            self._condition.notify()
+            
+    def close(self, timeout: float = 1.0):
+        """Write any pending values and stop the thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        with self._condition:
+            self._condition.notify()
+        thread.join(timeout)
+        self._thread = None
+        self.file_writer.close()
+        
+    def get_stats(self) -> Dict:
+        """Get write statistics"""
+        return {
+            'submitted': self.submitted,
+            'coalesced': self.coalesced,
+            'written': self.written,
+            'skipped_identical': self.skipped_identical,
+            'errors': self.errors,
+            'last_write_ms': self.last_write_ms
+        }
+        
+    def _run(self):
+        condition = self._condition
+        while True:
+            with condition:
+                while self._pending is None and not self._stop.is_set():
+                    condition.wait()
+                if self._pending is None:
+                    return
+                    
+            # Rate limit; newer frames replace the pending one meanwhile
+            delay = self._next_write - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+                
+            with condition:
+                item, self._pending = self._pending, None
+            if item is not None and not self._write(*item):
+                # Keep failed values for a retry unless newer ones arrived
+                with condition:
+                    if self._pending is None:
+                        self._pending = item
+                if self._stop.is_set():
+                    return
+                    
+    def _write(self, path: str, values: Tuple[float, ...]) -> bool:
+        """Write one frame; returns False if it should be retried"""
+        text = self.template.render(values)
+        if text == self._last_text and path == self._last_path:
+            self.skipped_identical += 1
+            return True
+            
+        start = time.perf_counter()
+        self._next_write = start + self.min_interval
+        try:
+            self.file_writer.write(path, text)
+        except FileNotFoundError:
+            self._report_error(f"INI file not found: {path}", f"INI directory not found for: {path}")
+            return True  # Retrying cannot help until the path changes
+        except PermissionError:
+            # The game may briefly hold the file open; retry on the next slot
+            self._report_error(f"Permission denied writing to INI: {path}", f"Permission denied for INI file: {path}")
+            return False
+        except Exception as e:
+            self._report_error(f"INI update error: {e}", f"Unexpected error updating INI file: {e}")
+            return True
+            
+        self.last_write_ms = (time.perf_counter() - start) * 1000
+        self.written += 1
+        self._last_path = path
+        self._last_text = text
+        self._last_error = None
+        return True
+        
+    def _report_error(self, message: str, log_message: str):
+        """Report an error once until a write succeeds again"""
+        self.errors += 1
+        if message == self._last_error:
+            return
+        self._last_error = message
+        self.logger.error(log_message)
+        if self.error_callback:
+            self.error_callback(message, "error")
+            
+
+class IniWriterBenchmark:
+    """Microbenchmark comparing INI rendering and write paths"""
+    
+    @staticmethod
+    def benchmark_write_paths(directory: str, iterations: int = 2000) -> Dict:
+        """
+        Compare the legacy per-line f-string writes with the precompiled template
+        
+        Args:
+            directory: Scratch directory for the INI file
+            iterations: Frames per path
+            
+        Returns:
+            Dictionary with average microseconds per frame for rendering and writing
+        """
+        path = os.path.join(directory, 'fnvr_benchmark.ini')
+        frames = [(1.0, 0.1 * i, -0.2 * i, 3.0, -40.5, 75.25, -7.5) for i in range(100)]
+        template = IniTemplate()
+        clock = time.perf_counter
+        
+        def legacy_render(values):
+            _, fiX, fiY, fiZ, fiXr, fiZr, fpZr = values
+            return ["[Standard]\n", f'fCanIOpenThis = {1}\n',
+                    f"fiX = {fiX:.4f}\n", f"fiY = {fiY:.4f}\n", f"fiZ = {fiZ:.4f}\n",
+                    f"fiXr = {fiXr:.4f}\n", f"fiZr = {fiZr:.4f}\n", f"fpZr = {fpZr:.4f}\n"]
+                    
+        def legacy_write(values):
+            with open(path, "w") as f:
+                for line in legacy_render(values):
+                    f.write(line)
+                    
+        results = {'iterations': iterations}
+        
+        start = clock()
+        for i in range(iterations):
+            legacy_render(frames[i % 100])
+        results['legacy_render_us'] = (clock() - start) / iterations * 1e6
+        
+        start = clock()
+        for i in range(iterations):
+            template.render(frames[i % 100])
+        results['template_render_us'] = (clock() - start) / iterations * 1e6
+        
+        start = clock()
+        for i in range(iterations):
+            legacy_write(frames[i % 100])
+        results['legacy_write_us'] = (clock() - start) / iterations * 1e6
+        
+        for mode in INI_WRITE_MODES:
+            writer = IniFileWriter(mode)
+            start = clock()
+            for i in range(iterations):
+                writer.write(path, template.render(frames[i % 100]))
+            results[f'template_{mode}_write_us'] = (clock() - start) / iterations * 1e6
+            writer.close()
+            
+        os.remove(path)
+        return results
\ No newline at end of file
@@ -0,0 +1,929 @@
+"""
+Motion gesture recognition for VR controllers
+Matches swipes, drawn shapes and reload motions against recorded templates
+while the controller moves, keeping the per-frame cost low with many templates
+"""
+
+import os
+import math
+import bisect
+import time
+import logging
+import numpy as np
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from gesture_recognition import HAND_MASKS, validate_action, bind_action
+from pose_math import PoseKernel
+from pose_trace import load_trace, SLOT_HMD, SLOT_LEFT, SLOT_RIGHT, TRACE_SLOTS
+
+
+# Points per resampled template and candidate window
+TEMPLATE_POINTS = 16
+
+# Trace slot recorded for each hand
+HAND_SLOTS = {'left': SLOT_LEFT, 'right': SLOT_RIGHT}
+
+# Config sections declaring motion gestures: [motion:<id>]
+MOTION_SECTION_PREFIX = 'motion:'
+
+
+def resample_path(positions: Sequence, count: int = TEMPLATE_POINTS) -> np.ndarray:
+    """
+    Resample a polyline to points evenly spaced along its length
+    
+    Args:
+        positions: (points, 3) path in meters
+        count: Number of output points
+        
+    Returns:
+        (count, 3) array
+    """
+    points = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    segments = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    keep = np.concatenate(([True], segments > 0))
+    points = points[keep]
+    distance = np.concatenate(([0.0], np.cumsum(segments[segments > 0])))
+    if len(points) < 2:
+        raise ValueError("Path has no length")
+    targets = np.linspace(0.0, distance[-1], count)
+    return np.column_stack([np.interp(targets, distance, points[:, axis]) for axis in range(3)])
+    
+
+def path_length(points: np.ndarray) -> float:
+    """Length of a polyline in meters"""
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+    
+
+@lru_cache(maxsize=None)
+def _band_cells(n: int, band: int) -> Tuple[np.ndarray, np.ndarray, Tuple[Tuple[int, int], ...]]:
+    """Row and column indices of the cells inside a Sakoe-Chiba band, and each row's column range"""
+    rows = [(max(0, i - band), min(n, i + band + 1)) for i in range(n)]
+    cells = [(i, j) for i, (low, high) in enumerate(rows) for j in range(low, high)]
+    return (np.array([i for i, _ in cells], dtype=np.intp), np.array([j for _, j in cells], dtype=np.intp),
+            tuple(rows))
+            
+
+def dtw_distance(a: np.ndarray, b: np.ndarray, band: int, limit: float = math.inf,
+                 remaining: Optional[Sequence[float]] = None) -> float:
+    """
+    Banded dynamic time warping cost between two equal-length paths
+    
+    The cost is the sum of the distances of matched points; point i of one
+    path can only be matched to points within band of i in the other.
+    
+    Args:
+        a, b: (points, 3) arrays
+        band: Sakoe-Chiba band radius in points
+        limit: Stop early and return inf once the cost is sure to reach this
+        remaining: Optional lower bound on the cost of the rows after each
+                   row of a, which lets rows be abandoned earlier
+                   
+    Returns:
+        DTW cost, or inf if abandoned
+    """
+    n = len(a)
+    rows, columns, ranges = _band_cells(n, band)
+    delta = a[rows] - b[columns]
+    cost = np.sqrt(np.einsum('ij,ij->i', delta, delta)).tolist()
+    inf = math.inf
+    
+    # Row arrays are shifted by one so previous[0] stands for the cell before (0, 0)
+    previous = [0.0] + [inf] * n
+    cell = 0
+    for i, (low, high) in enumerate(ranges):
+        current = [inf] * (n + 1)
+        row_min = value = inf
+        for j in range(low, high):
+            best = previous[j + 1]
+            if previous[j] < best:
+                best = previous[j]
+            if value < best:
+                best = value
+            value = best + cost[cell]
+            cell += 1
+            current[j + 1] = value
+            if value < row_min:
+                row_min = value
+        if row_min + (remaining[i] if remaining is not None else 0.0) >= limit:
+            return inf
+        previous = current
+    return previous[n]
+    
+
+def find_motions(timestamps: np.ndarray, positions: np.ndarray, min_speed: float = 0.5,
+                 min_length: float = 0.15, max_gap: float = 0.1) -> List[Tuple[float, float]]:
+    """
+    Find the stretches of fast controller movement in a recording
+    
+    Args:
+        timestamps: (frames,) seconds
+        positions: (frames, 3) positions in meters
+        min_speed: Slowest speed (m/s) that counts as moving
+        min_length: Shortest path (meters) kept as a motion
+        max_gap: Slower stretches up to this many seconds are bridged
+        
+    Returns:
+        (start, end) times in seconds from the first sample
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if len(timestamps) < 2:
+        return []
+    steps = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+    dt = np.diff(timestamps)
+    moving = steps >= min_speed * np.where(dt > 0, dt, np.inf)
+    
+    # Runs of moving segments as [first segment, last segment]
+    runs = []
+    for index in np.flatnonzero(moving).tolist():
+        if runs and timestamps[index] - timestamps[runs[-1][1] + 1] <= max_gap:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+            
+    t0 = timestamps[0]
+    return [(float(timestamps[first] - t0), float(timestamps[last + 1] - t0)) for first, last in runs
+            if steps[first:last + 1].sum() >= min_length]
+            
+
+def trace_positions(trace: Union[str, np.ndarray], hand: str = 'right') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Controller positions relative to the HMD for each frame of a pose trace
+    
+    These are the positions the tracking loop passes to
+    MotionGestureRecognizer.update().
+    
+    Args:
+        trace: Trace path or frame array from load_trace()
+        hand: 'left' or 'right'
+        
+    Returns:
+        (timestamps, positions) for the frames where the HMD and the hand are valid
+    """
+    if isinstance(trace, str):
+        trace = load_trace(trace)
+    slot = HAND_SLOTS[hand]
+    frames = np.flatnonzero(trace['valid'][:, SLOT_HMD] & trace['valid'][:, slot])
+    
+    kernel = PoseKernel(TRACE_SLOTS)
+    positions = np.empty((len(frames), 3))
+    for row, frame in enumerate(frames.tolist()):
+        kernel.matrices[:] = trace['matrices'][frame]
+        kernel.solve(SLOT_HMD)
+        positions[row] = kernel.relative_positions[slot]
+    return np.asarray(trace['timestamp'][frames], dtype=np.float64), positions
+    
+
+def examples_from_positions(timestamps: np.ndarray, positions: np.ndarray,
+                            segments: Optional[Sequence[Tuple[float, float]]] = None,
+                            min_speed: float = 0.5, min_length: float = 0.15) -> np.ndarray:
+    """
+    Cut gesture examples out of a recorded controller path
+    
+    Args:
+        timestamps: (frames,) seconds
+        positions: (frames, 3) positions relative to the HMD
+        segments: (start, end) seconds from the first sample; found with
+                  find_motions() when None
+        min_speed, min_length: find_motions() settings
+        
+    Returns:
+        (examples, TEMPLATE_POINTS, 3) resampled paths in meters
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if segments is None:
+        segments = find_motions(timestamps, positions, min_speed, min_length)
+    examples = []
+    elapsed = timestamps - timestamps[0] if len(timestamps) else timestamps
+    for start, end in segments:
+        selected = positions[(elapsed >= start) & (elapsed <= end)]
+        if len(selected) >= 2 and path_length(selected) > 0:
+            examples.append(resample_path(selected))
+    return np.array(examples).reshape(-1, TEMPLATE_POINTS, 3)
+    
+
+def record_examples(trace: Union[str, np.ndarray], hand: str = 'right',
+                    segments: Optional[Sequence[Tuple[float, float]]] = None,
+                    min_speed: float = 0.5, min_length: float = 0.15) -> np.ndarray:
+    """Cut gesture examples out of a pose trace (see examples_from_positions)"""
+    timestamps, positions = trace_positions(trace, hand)
+    return examples_from_positions(timestamps, positions, segments, min_speed, min_length)
+    
+
+def save_examples(path: str, examples: np.ndarray):
+    """Write gesture examples to a .npy template file"""
+    np.save(path, np.asarray(examples, dtype=np.float64))
+    
+
+def load_examples(path: str) -> np.ndarray:
+    """Read a template file written by save_examples()"""
+    examples = np.load(path)
+    if examples.ndim != 3 or examples.shape[2] != 3 or examples.shape[1] < 2:
+        raise ValueError(f"Not a motion template: {path}")
+    return examples
+    
+
+class MotionGesture:
+    """
+    A motion gesture: one or more example paths of the same movement
+    
+    Examples are controller paths relative to the HMD in meters (see
+    trace_positions), resampled to TEMPLATE_POINTS points. Matching ignores
+    where the motion happens and, within the recognizer's scale range, how
+    large it is, but not its direction: a left swipe and a right swipe are
+    different gestures. threshold, max_duration and cooldown left as None
+    use the recognizer's [motion_gestures] values.
+    """
+    
+    def __init__(self, gesture_id: str, examples: Sequence, hand: str = 'any', action: str = 'none',
+                 threshold: Optional[float] = None, max_duration: Optional[float] = None,
+                 cooldown: Optional[float] = None):
+        """
+        Args:
+            gesture_id: Unique identifier
+            examples: Example paths, each (points, 3) in meters
+            hand: 'any', 'left' or 'right'
+            action: 'pipboy', 'pause', 'key:<key>[:<seconds>]' or 'none'
+            threshold: Largest mean point distance, as a fraction of the path length, that still matches
+            max_duration: Longest time in seconds the motion may take
+            cooldown: Seconds before the gesture can fire again
+        """
+        if hand not in HAND_MASKS:
+            raise ValueError(f"Motion gesture {gesture_id}: unknown hand '{hand}'")
+        validate_action(gesture_id, action)
+        if not len(examples):
+            raise ValueError(f"Motion gesture {gesture_id}: no examples")
+        self.gesture_id = gesture_id
+        self.examples = np.array([resample_path(example) for example in examples])
+        self.hand = hand
+        self.action = action
+        self.threshold = threshold
+        self.max_duration = max_duration
+        self.cooldown = cooldown
+        
+    @classmethod
+    def from_config_section(cls, gesture_id: str, section, base_dir: str = '') -> 'MotionGesture':
+        """Build a gesture from a configparser section (see config.ini for the keys)"""
+        if section.get('template'):
+            template = section.get('template').strip()
+            if not os.path.isabs(template):
+                template = os.path.join(base_dir, template)
+            examples = load_examples(template)
+        elif section.get('path'):
+            points = [tuple(float(v) for v in point.split(',')) for point in section.get('path').split(';')]
+            if len(points) < 2 or any(len(point) != 3 for point in points):
+                raise ValueError(f"Motion gesture {gesture_id}: path needs two or more x, y, z points")
+            examples = [points]
+        else:
+            raise ValueError(f"Motion gesture {gesture_id}: template or path is required")
+            
+        return cls(
+            gesture_id, examples,
+            hand=section.get('hand', fallback='any').strip().lower(),
+            action=section.get('action', fallback='none').strip(),
+            threshold=section.getfloat('threshold', fallback=None),
+            max_duration=section.getfloat('max_duration', fallback=None),
+            cooldown=section.getfloat('cooldown', fallback=None)
+        )
+        
+
+def load_motion_gestures(config, logger: Optional[logging.Logger] = None, base_dir: str = '') -> List[MotionGesture]:
+    """Read every [motion:<id>] section of a ConfigParser; invalid sections are logged and skipped"""
+    logger = logger or logging.getLogger(__name__)
+    gestures = []
+    for name in config.sections():
+        if not name.lower().startswith(MOTION_SECTION_PREFIX):
+            continue
+        gesture_id = name[len(MOTION_SECTION_PREFIX):].strip()
+        try:
+            gestures.append(MotionGesture.from_config_section(gesture_id, config[name], base_dir))
+        except (ValueError, OSError) as e:
+            logger.error(f"Ignoring motion gesture section [{name}]: {e}")
+    return gestures
+    
+
+class MotionPath:
+    """
+    Ring buffer of controller positions resampled along the path
+    
+    update() adds a point each time the controller is step meters away
+    from the previous point, placing it on the line towards the sample, so
+    the buffer holds the recent path at even spacing whatever the frame
+    rate or hand speed. Distances are measured from the last point rather
+    than summed per frame, so tracking jitter while holding still adds
+    nothing. Points carry the timestamp of the frame that produced them.
+    """
+    
+    def __init__(self, step: float = 0.02, capacity: int = 64, max_jump: float = 0.3):
+        """
+        Args:
+            step: Spacing of the points in meters
+            capacity: Points kept
+            max_jump: Movement in one frame (meters) treated as a tracking glitch
+                      that restarts the path
+        """
+        self.step = step
+        self.capacity = max(2, int(capacity))
+        self.max_jump = max_jump
+        self.points = np.zeros((self.capacity, 3))
+        self.times = np.zeros(self.capacity)
+        self.reset()
+        
+    def reset(self):
+        """Forget the path; the next sample starts a new one"""
+        self.count = 0  # Points added since the reset
+        self.head = -1  # Slot of the newest point
+        self.last = None  # Newest point as (x, y, z)
+        self.last_time = -math.inf  # Timestamp of the newest point
+        
+    def update(self, position: Tuple[float, float, float], timestamp: float) -> int:
+        """Add a controller sample; returns the number of points added"""
+        x, y, z = position
+        if self.last is None:
+            self._add(x, y, z, timestamp)
+            return 1
+            
+        px, py, pz = self.last
+        dx, dy, dz = x - px, y - py, z - pz
+        distance = math.sqrt(dx*dx + dy*dy + dz*dz)
+        step = self.step
+        if distance < step:
+            return 0
+        if distance > self.max_jump:
+            self.reset()
+            self._add(x, y, z, timestamp)
+            return 1
+            
+        added = 0
+        f = step / distance
+        dx, dy, dz = dx * f, dy * f, dz * f
+        while distance >= step:
+            px += dx
+            py += dy
+            pz += dz
+            self._add(px, py, pz, timestamp)
+            distance -= step
+            added += 1
+        return added
+        
+    def _add(self, x: float, y: float, z: float, timestamp: float):
+        head = (self.head + 1) % self.capacity
+        self.points[head] = (x, y, z)
+        self.times[head] = timestamp
+        self.head = head
+        self.last = (x, y, z)
+        self.last_time = timestamp
+        self.count += 1
+        
+
+class MotionGestureRecognizer:
+    """
+    Streaming template matcher for motion gestures
+    
+    Each hand's recent path is kept in a MotionPath. Whenever a new point
+    is added, windows ending at it are cut out for a range of lengths
+    (every template length times the recognizer's scales), resampled to
+    TEMPLATE_POINTS points, centered and scaled to unit length like the
+    templates. Every (template, window) pair allowed by hand, duration and
+    cooldown is then scored in three stages:
+    
+    1. LB_Keogh: distance of each window point to the template's envelope
+       within the DTW band, for all pairs in one vectorized pass
+    2. The same bound the other way round (template points against the
+       window's envelope) for the pairs that survive 1
+    3. Banded DTW in ascending bound order, abandoned as soon as a row can
+       no longer beat the best match so far or the gesture's threshold
+       
+    Neither bound exceeds the DTW cost, so pruning does not change the
+    result. Frames that add no point (the hand is still or moving slowly)
+    cost only the path update.
+    
+    The best match of a stroke is held until the hand settles (no point
+    for settle_time) and fired then, so the start of a longer gesture that
+    resembles a shorter one, e.g. the first quarter of a circle, does not
+    fire the shorter one.
+    """
+    
+    BAND = 2  # Sakoe-Chiba band radius in points
+    SCALE_STEPS = 7  # Window lengths tried per template between min_scale and max_scale
+    
+    def __init__(self, config: Dict, logger: Optional[logging.Logger] = None,
+                 action_handlers: Optional[Dict[str, Callable]] = None):
+        """
+        Args:
+            config: Configuration dictionary (motion_gestures: MotionGesture list)
+            logger: Optional logger instance
+            action_handlers: Callables for gesture actions by name (see GestureRecognizer)
+        """
+        self.config = config
+        self.logger = logger or logging.getLogger(__name__)
+        self.action_handlers = dict(action_handlers or {})
+        
+        # Matching parameters (defaults for gestures that do not set their own)
+        self.enabled = config.get('motion_gestures_enabled', True)
+        self.step = config.get('motion_step', 0.02)
+        self.threshold = config.get('motion_threshold', 0.06)
+        self.min_scale = config.get('motion_min_scale', 0.75)
+        self.max_scale = config.get('motion_max_scale', 1.35)
+        self.max_duration = config.get('motion_max_duration', 1.0)
+        self.cooldown = config.get('motion_cooldown', 0.5)
+        self.settle_time = config.get('motion_settle_time', 0.08)
+        
+        self.gestures: Dict[str, MotionGesture] = {}
+        for gesture in config.get('motion_gestures', ()):
+            self.gestures[gesture.gesture_id] = gesture
+            
+        self.compile()
+        self.logger.info(f"Motion gesture recognition initialized ({len(self.gestures)} gestures, "
+                         f"{len(self.templates)} templates)")
+                         
+    def compile(self):
+        """Rebuild templates, windows and pairs from self.gestures (clears the paths and cooldowns)"""
+        n = TEMPLATE_POINTS
+        gestures = list(self.gestures.values())
+        self.ids = [gesture.gesture_id for gesture in gestures]
+        
+        # Per gesture rules
+        self.thresholds = np.array([self.threshold if g.threshold is None else g.threshold for g in gestures])
+        self.max_durations = np.array([self.max_duration if g.max_duration is None else g.max_duration
+                                       for g in gestures])
+        self.cooldowns = np.array([self.cooldown if g.cooldown is None else g.cooldown for g in gestures])
+        self.actions = [bind_action(g.gesture_id, g.action, self.action_handlers, self.logger) for g in gestures]
+        self.last_fired = np.full(len(gestures), -np.inf)
+        
+        # Templates: every example of every gesture, centered and scaled to unit length
+        raw = np.array([example for g in gestures for example in g.examples]).reshape(-1, n, 3)
+        owners = np.array([index for index, g in enumerate(gestures) for _ in g.examples], dtype=np.intp)
+        lengths = np.linalg.norm(np.diff(raw, axis=1), axis=2).sum(axis=1)
+        self.templates = (raw - raw.mean(axis=1, keepdims=True)) / lengths[:, None, None]
+        self.upper = np.empty_like(self.templates)
+        self.lower = np.empty_like(self.templates)
+        for i in range(n):
+            band = self.templates[:, max(0, i - self.BAND):i + self.BAND + 1]
+            self.upper[:, i] = band.max(axis=1)
+            self.lower[:, i] = band.min(axis=1)
+            
+        # Windows: path lengths in points, shared by templates of similar length.
+        # Windows are sorted by length and pairs by window, so the pairs whose
+        # window fits in a young path are a prefix of the pair arrays
+        scales = np.geomspace(self.min_scale, self.max_scale, self.SCALE_STEPS)
+        pairs = set()
+        for template, length in enumerate(lengths.tolist()):
+            for scale in scales.tolist():
+                pairs.add((max(2, int(round(length * scale / self.step))), template))
+        self.window_points = np.array(sorted({points for points, _ in pairs}), dtype=np.intp)
+        self._window_list = self.window_points.tolist()
+        pairs = sorted(pairs)
+        self.pair_window = np.searchsorted(self.window_points, [points for points, _ in pairs]).astype(np.intp)
+        self.pair_template = np.array([template for _, template in pairs], dtype=np.intp)
+        self.pair_gesture = owners[self.pair_template]
+        self.pair_limit = self.thresholds[self.pair_gesture] * n if len(pairs) else np.zeros(0)
+        self.pair_max_duration = self.max_durations[self.pair_gesture] if len(pairs) else np.zeros(0)
+        self._pair_end = np.searchsorted(self.pair_window, np.arange(len(self.window_points) + 1)).tolist()
+        
+        # Gather offsets back from the newest point: each window point lies
+        # between a newer and an older ring point
+        back = (self.window_points[:, None] * np.linspace(1.0, 0.0, n)).ravel()
+        newer = np.floor(back).astype(np.intp)
+        self._newer = newer
+        self._older = np.minimum(newer + 1, np.repeat(self.window_points, n))
+        self._fraction = (back - newer)[:, None]
+        self._scale = (1.0 / (self.window_points * self.step))[:, None, None]
+        
+        # Pairs each hand may use
+        pair_hands = np.array([HAND_MASKS[gestures[g].hand] for g in self.pair_gesture.tolist()], dtype=np.intp)
+        self._pair_allowed = {
+            hand: (pair_hands == HAND_MASKS['any']) | (pair_hands & HAND_MASKS.get(hand, 0) != 0)
+            for hand in ('left', 'right', None)
+        }
+        
+        capacity = int(self.window_points.max()) + 2 if len(self.window_points) else 2
+        self.paths = {hand: MotionPath(self.step, capacity) for hand in ('left', 'right')}
+        self.pending = {hand: None for hand in self.paths}  # Best (gesture, score) of the current stroke
+        self._cooling_until = -math.inf  # No gesture is in cooldown after this time
+        self.reset_stats()
+        
+    def add_gesture(self, gesture: MotionGesture):
+        """Add or replace a gesture and recompile"""
+        self.gestures[gesture.gesture_id] = gesture
+        self.compile()
+        
+    def register_gesture_callback(self, gesture_id: str, callback: Callable):
+        """Run callback instead of the gesture's configured action"""
+        if gesture_id in self.ids:
+            self.actions[self.ids.index(gesture_id)] = callback
+            
+    def update(self, position: Tuple[float, float, float], timestamp: float = None,
+               hand: Optional[str] = 'right') -> Optional[str]:
+        """
+        Add a controller sample and match the motion that ends at it
+        
+        Args:
+            position: Controller position relative to the HMD (meters)
+            timestamp: Optional timestamp
+            hand: 'left' or 'right'; each hand has its own path, and gestures
+                  bound to a hand never match when None
+                  
+        Returns:
+            Gesture ID if a gesture was triggered, None otherwise
+        """
+        if not self.enabled or not len(self.pair_template):
+            return None
+        if timestamp is None:
+            timestamp = time.time()
+            
+        side = 'left' if hand == 'left' else 'right'
+        path = self.paths[side]
+        pending = self.pending[side]
+        if not path.update(position, timestamp):
+            if pending is None or timestamp - path.last_time < self.settle_time:
+                return None
+            return self._fire(side, pending, timestamp)
+            
+        self.stats['points'] += 1
+        match = self.match(path, timestamp, hand)
+        if match is not None and (pending is None or match[1] < pending[1]):
+            self.pending[side] = match
+        return None
+        
+    def _fire(self, side: str, match: Tuple[int, float], timestamp: float) -> str:
+        """Run a held match's action and start a new stroke"""
+        gesture, score = match
+        gesture_id = self.ids[gesture]
+        self.last_fired[gesture] = timestamp
+        self._cooling_until = max(self._cooling_until, timestamp + float(self.cooldowns[gesture]))
+        self.pending[side] = None
+        self.paths[side].reset()  # The motion is used up; start a new path from here
+        self.logger.info(f"Motion gesture triggered: {gesture_id} (distance {score:.3f})")
+        
+        action = self.actions[gesture]
+        if action is not None:
+            action()
+        return gesture_id
+        
+    def candidates(self, path: MotionPath, timestamp: float, hand: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Normalized windows ending at the newest point and the pairs allowed to match them
+        
+        Returns:
+            (windows, pairs): (window lengths, TEMPLATE_POINTS, 3) array and
+            indices into the pair arrays
+        """
+        # A window needs its full length of path, recorded within the gesture's duration
+        available = bisect.bisect_left(self._window_list, path.count)
+        end = self._pair_end[available]
+        head = path.head
+        capacity = path.capacity
+        durations = timestamp - path.times[(head - self.window_points[:available]) % capacity]
+        window = self.pair_window[:end]
+        allowed = self._pair_allowed.get(hand, self._pair_allowed[None])[:end]
+        allowed = allowed & (durations[window] <= self.pair_max_duration[:end])
+        if timestamp < self._cooling_until:
+            gesture = self.pair_gesture[:end]
+            allowed &= timestamp - self.last_fired[gesture] >= self.cooldowns[gesture]
+        pairs = np.flatnonzero(allowed)
+        if not len(pairs):
+            return np.zeros((0, TEMPLATE_POINTS, 3)), pairs
+            
+        # Resample, center and scale the windows up to the longest one in use
+        size = (int(window[pairs[-1]]) + 1) * TEMPLATE_POINTS
+        points = path.points
+        newer = points[(head - self._newer[:size]) % capacity]
+        older = points[(head - self._older[:size]) % capacity]
+        older -= newer
+        older *= self._fraction[:size]
+        newer += older
+        windows = newer.reshape(-1, TEMPLATE_POINTS, 3)
+        windows -= windows.sum(axis=1, keepdims=True) * (1.0 / TEMPLATE_POINTS)
+        windows *= self._scale[:len(windows)]
+        return windows, pairs
+        
+    def match(self, path: MotionPath, timestamp: float, hand: Optional[str]) -> Optional[Tuple[int, float]]:
+        """
+        Find the best matching gesture for the motion ending at the path's newest point
+        
+        Returns:
+            (gesture index, mean point distance) or None
+        """
+        windows, pairs = self.candidates(path, timestamp, hand)
+        stats = self.stats
+        stats['pairs'] += len(pairs)
+        if not len(pairs):
+            return None
+            
+        # LB_Keogh: every window point is matched to a template point within the band
+        templates = self.pair_template[pairs]
+        candidate = windows[self.pair_window[pairs]]
+        excess = np.maximum(candidate - self.upper[templates], 0.0)
+        excess += np.maximum(self.lower[templates] - candidate, 0.0)
+        point_bounds = np.sqrt(np.einsum('ijk,ijk->ij', excess, excess))
+        bounds = point_bounds.sum(axis=1)
+        limits = self.pair_limit[pairs]
+        keep = np.flatnonzero(bounds < limits)
+        
+        if len(keep):
+            # Reverse LB_Keogh for the survivors: template points against the window's envelope
+            candidate = candidate[keep]
+            band = 2 * self.BAND + 1
+            padded = np.concatenate((candidate[:, :1].repeat(self.BAND, axis=1), candidate,
+                                     candidate[:, -1:].repeat(self.BAND, axis=1)), axis=1)
+            sliding = np.lib.stride_tricks.sliding_window_view(padded, band, axis=1)
+            template = self.templates[templates[keep]]
+            excess = np.maximum(template - sliding.max(axis=-1), 0.0)
+            excess += np.maximum(sliding.min(axis=-1) - template, 0.0)
+            reverse = np.sqrt(np.einsum('ijk,ijk->ij', excess, excess)).sum(axis=1)
+            bounds[keep] = np.maximum(bounds[keep], reverse)
+            keep = keep[bounds[keep] < limits[keep]]
+        stats['pruned'] += len(pairs) - len(keep)
+        
+        best = math.inf
+        best_pair = None
+        bounds = bounds.tolist()
+        limits = limits.tolist()
+        for i in sorted(keep.tolist(), key=bounds.__getitem__):
+            if bounds[i] >= best:
+                break
+            limit = min(best, limits[i])
+            if bounds[i] >= limit:
+                continue
+            stats['dtw'] += 1
+            remaining = np.cumsum(point_bounds[i, :0:-1])[::-1].tolist() + [0.0]
+            cost = dtw_distance(windows[self.pair_window[pairs[i]]], self.templates[templates[i]],
+                                self.BAND, limit, remaining)
+            if cost < limit:
+                best = cost
+                best_pair = pairs[i]
+            elif cost == math.inf:
+                stats['dtw_abandoned'] += 1
+                
+        if best_pair is None:
+            return None
+        return int(self.pair_gesture[best_pair]), best / TEMPLATE_POINTS
+        
+    def reset(self):
+        """Forget both hands' paths and held matches (cooldowns are kept)"""
+        for side, path in self.paths.items():
+            path.reset()
+            self.pending[side] = None
+            
+    def reset_stats(self):
+        """Zero the pruning counters"""
+        self.stats = {'points': 0, 'pairs': 0, 'pruned': 0, 'dtw': 0, 'dtw_abandoned': 0}
+        
+    def get_stats(self) -> Dict:
+        """Get matching counts: points matched, pairs considered, pairs pruned by the bound and DTW runs"""
+        return dict(self.stats)
+        
+
+class MotionBenchmark:
+    """Measures motion gesture accuracy and per-frame cost on synthetic controller paths"""
+    
+    # Gesture shapes relative to the HMD (x right, y up, z back), in meters
+    SHAPES = {
+        'swipe_left': [(0.25, -0.25, -0.4), (-0.2, -0.25, -0.4)],
+        'swipe_right': [(-0.2, -0.25, -0.4), (0.25, -0.25, -0.4)],
+        'swipe_up': [(0.15, -0.5, -0.4), (0.15, -0.05, -0.4)],
+        'swipe_down': [(0.15, -0.05, -0.4), (0.15, -0.5, -0.4)],
+        'circle': [(0.15 + 0.13 * math.cos(a), -0.25 + 0.13 * math.sin(a), -0.4)
+                   for a in np.linspace(-0.5 * math.pi, 1.5 * math.pi, 25).tolist()],
+        'check': [(-0.05, -0.2, -0.4), (0.05, -0.32, -0.4), (0.3, -0.02, -0.4)],
+        'reload': [(0.2, -0.25, -0.4), (0.2, -0.45, -0.2), (0.15, -0.35, -0.1), (0.1, -0.2, -0.25)]
+    }
+    
+    @staticmethod
+    def perform(shape: Sequence, rng: np.random.Generator, rate: float = 90.0,
+                scale: Tuple[float, float] = (0.8, 1.25), duration: Tuple[float, float] = (0.35, 0.7),
+                angle: float = 15.0, noise: float = 0.001) -> np.ndarray:
+        """
+        One synthetic performance of a shape
+        
+        The shape is scaled, tilted by up to angle degrees, moved by up to
+        10 cm and traced with a minimum-jerk speed profile plus position noise.
+        
+        Returns:
+            (frames, 3) positions sampled at rate
+        """
+        dense = resample_path(shape, 64)
+        center = dense.mean(axis=0)
+        roll, yaw = np.radians(rng.uniform(-angle, angle, 2))
+        rotation = np.array([[math.cos(roll), -math.sin(roll), 0.0],
+                             [math.sin(roll), math.cos(roll), 0.0],
+                             [0.0, 0.0, 1.0]]) @ np.array([[math.cos(yaw), 0.0, math.sin(yaw)],
+                                                           [0.0, 1.0, 0.0],
+                                                           [-math.sin(yaw), 0.0, math.cos(yaw)]])
+        dense = (dense - center) @ rotation.T * rng.uniform(*scale) + center + rng.uniform(-0.1, 0.1, 3)
+        
+        frames = max(2, int(rng.uniform(*duration) * rate))
+        s = np.linspace(0.0, 1.0, frames)
+        progress = (10 * s ** 3 - 15 * s ** 4 + 6 * s ** 5) * (len(dense) - 1)
+        positions = np.column_stack([np.interp(progress, np.arange(len(dense)), dense[:, axis])
+                                     for axis in range(3)])
+        return positions + rng.normal(0.0, noise, positions.shape)
+        
+    @staticmethod
+    def wander(start: np.ndarray, rng: np.random.Generator, seconds: float, rate: float = 90.0,
+               speed: float = 0.05, noise: float = 0.001) -> np.ndarray:
+        """Slow random drift away from start, as between gestures"""
+        frames = max(1, int(seconds * rate))
+        steps = rng.normal(0.0, speed / rate, (frames, 3))
+        return start + np.cumsum(steps, axis=0) + rng.normal(0.0, noise, (frames, 3))
+        
+    @staticmethod
+    def distractor(rng: np.random.Generator, rate: float = 90.0) -> np.ndarray:
+        """A fast curved reach between two random points that is not a gesture"""
+        start = rng.uniform((-0.3, -0.6, -0.6), (0.4, 0.0, -0.1))
+        end = start + rng.normal(0.0, 0.25, 3)
+        bend = (start + end) / 2 + rng.normal(0.0, 0.12, 3)
+        t = np.linspace(0.0, 1.0, 16)[:, None]
+        curve = (1 - t) ** 2 * start + 2 * (1 - t) * t * bend + t ** 2 * end
+        return MotionBenchmark.perform(curve, rng, rate, scale=(1.0, 1.0), angle=0.0)
+        
+    @staticmethod
+    def session(shape: Optional[Sequence], rng: np.random.Generator, rate: float = 90.0) -> Tuple[np.ndarray, int]:
+        """Drift, then the shape (or a distractor if None), then drift; returns positions and the motion's first frame"""
+        motion = MotionBenchmark.perform(shape, rng, rate) if shape is not None else MotionBenchmark.distractor(rng, rate)
+        before = MotionBenchmark.wander(motion[0], rng, rng.uniform(0.5, 1.0), rate)[::-1]
+        after = MotionBenchmark.wander(motion[-1], rng, rng.uniform(0.5, 1.0), rate)
+        return np.concatenate((before, motion, after)), len(before)
+        
+    @staticmethod
+    def build_recognizer(examples: int = 3, extra_templates: int = 0, seed: int = 0, rate: float = 90.0,
+                         config: Optional[Dict] = None) -> MotionGestureRecognizer:
+        """
+        Recognizer with the SHAPES as gestures, each recorded from synthetic performances
+        
+        Args:
+            examples: Recorded examples per shape
+            extra_templates: Additional random curved gestures, to grow the template count
+            seed: Random seed
+            rate: Sample rate of the recordings in Hz
+            config: Optional recognizer settings
+        """
+        rng = np.random.default_rng(seed)
+        gestures = []
+        for name, shape in MotionBenchmark.SHAPES.items():
+            recorded = []
+            for _ in range(examples):
+                positions, _ = MotionBenchmark.session(shape, rng, rate)
+                timestamps = np.arange(len(positions)) / rate
+                found = examples_from_positions(timestamps, positions)
+                if len(found):
+                    recorded.append(max(found, key=path_length))
+            gestures.append(MotionGesture(name, recorded or [shape]))
+            
+        for i in range(extra_templates):
+            curve = np.cumsum(rng.normal(0.0, 0.15, (4, 3)), axis=0)
+            gestures.append(MotionGesture(f"extra{i}", [curve]))
+            
+        settings = dict(config or {})
+        settings['motion_gestures'] = gestures
+        return MotionGestureRecognizer(settings, logging.getLogger(__name__ + '.benchmark'))
+        
+    @staticmethod
+    def benchmark_accuracy(trials: int = 20, examples: int = 3, seed: int = 0, rate: float = 90.0,
+                           config: Optional[Dict] = None) -> Dict:
+        """
+        Recognition accuracy on synthetic performances
+        
+        Each trial streams drift, a varied performance of one shape (or a
+        distractor reach) and drift again through a fresh recognizer state.
+        
+        Returns:
+            Dictionary with the overall accuracy, per gesture counts of
+            correct, wrong (another gesture fired first) and missed trials,
+            and the number and rate of distractors that fired a gesture
+        """
+        recognizer = MotionBenchmark.build_recognizer(examples, 0, seed, rate, config)
+        rng = np.random.default_rng(seed + 1)
+        per_gesture = {}
+        clock = 1000.0
+        
+        def run(positions):
+            nonlocal clock
+            recognizer.reset()
+            fired = None
+            for p in positions.tolist():
+                clock += 1.0 / rate
+                gesture_id = recognizer.update(p, clock, 'right')
+                if gesture_id is not None and fired is None:
+                    fired = gesture_id
+            return fired
+            
+        for name, shape in MotionBenchmark.SHAPES.items():
+            counts = per_gesture[name] = {'correct': 0, 'wrong': 0, 'missed': 0}
+            for _ in range(trials):
+                fired = run(MotionBenchmark.session(shape, rng, rate)[0])
+                counts['correct' if fired == name else 'missed' if fired is None else 'wrong'] += 1
+                
+        false_positives = sum(run(MotionBenchmark.session(None, rng, rate)[0]) is not None
+                              for _ in range(trials * len(MotionBenchmark.SHAPES)))
+        correct = sum(counts['correct'] for counts in per_gesture.values())
+        distractors = trials * len(MotionBenchmark.SHAPES)
+        return {
+            'accuracy': correct / (trials * len(per_gesture)),
+            'false_positive_rate': false_positives / distractors,
+            'per_gesture': per_gesture,
+            'distractors': distractors,
+            'false_positives': false_positives
+        }
+        
+    @staticmethod
+    def benchmark_template_counts(counts: Sequence[int] = (7, 25, 50, 100), sessions: int = 40,
+                                  seed: int = 0, rate: float = 90.0, brute_force: bool = True) -> Dict:
+        """
+        Per-frame update cost as templates are added
+        
+        Args:
+            counts: Template counts (the SHAPES plus random curves)
+            sessions: Gesture and distractor sessions streamed per count
+            seed: Random seed
+            rate: Sample rate in Hz
+            brute_force: Also time full DTW on every allowed pair, and check
+                         the pruned search finds the same best match
+                         
+        Returns:
+            Dictionary per template count with mean and p99 microseconds
+            per frame, microseconds per added point, pruning counts per
+            added point and the brute-force comparison
+        """
+        results = {}
+        shapes = list(MotionBenchmark.SHAPES.values())
+        for count in counts:
+            recognizer = MotionBenchmark.build_recognizer(1, max(0, count - len(shapes)), seed, rate)
+            recognizer.cooldowns[:] = 0.0
+            rng = np.random.default_rng(seed + 2)
+            positions = np.concatenate([
+                MotionBenchmark.session(shapes[i % len(shapes)] if i % 2 else None, rng, rate)[0]
+                for i in range(sessions)
+            ]).tolist()
+            
+            frame_times = []
+            point_times = []
+            clock = time.perf_counter
+            for i, p in enumerate(positions):
+                points = recognizer.stats['points']
+                start = clock()
+                recognizer.update(p, 1000.0 + i / rate, 'right')
+                elapsed = clock() - start
+                frame_times.append(elapsed)
+                if recognizer.stats['points'] != points:
+                    point_times.append(elapsed)
+                    
+            stats = recognizer.get_stats()
+            points = max(1, stats['points'])
+            frame_us = np.array(frame_times) * 1e6
+            entry = {
+                'templates': len(recognizer.templates),
+                'pairs': len(recognizer.pair_template),
+                'frames': len(frame_times),
+                'mean_us': float(frame_us.mean()),
+                'p99_us': float(np.percentile(frame_us, 99)),
+                'point_us': float(np.mean(point_times)) * 1e6 if point_times else 0.0,
+                'pairs_per_point': stats['pairs'] / points,
+                'pruned_per_point': stats['pruned'] / points,
+                'dtw_per_point': stats['dtw'] / points,
+                'dtw_abandoned_per_point': stats['dtw_abandoned'] / points
+            }
+            if brute_force:
+                entry.update(MotionBenchmark._compare_brute_force(recognizer, positions, rate))
+            results[count] = entry
+        return results
+        
+    @staticmethod
+    def _compare_brute_force(recognizer: MotionGestureRecognizer, positions: List, rate: float) -> Dict:
+        """Time full DTW over every allowed pair and compare its best match with match()"""
+        recognizer.reset()
+        path = recognizer.paths['right']
+        pruned_time = brute_time = 0.0
+        mismatches = 0
+        points = 0
+        clock = time.perf_counter
+        for i, p in enumerate(positions):
+            timestamp = 1000.0 + i / rate
+            if not path.update(p, timestamp):
+                continue
+            points += 1
+            
+            start = clock()
+            match = recognizer.match(path, timestamp, 'right')
+            pruned_time += clock() - start
+            
+            start = clock()
+            windows, pairs = recognizer.candidates(path, timestamp, 'right')
+            best, best_gesture = math.inf, None
+            for pair in pairs.tolist():
+                template = recognizer.pair_template[pair]
+                cost = dtw_distance(windows[recognizer.pair_window[pair]], recognizer.templates[template],
+                                    recognizer.BAND)
+                if cost < recognizer.pair_limit[pair] and cost < best:
+                    best, best_gesture = cost, int(recognizer.pair_gesture[pair])
+            brute_time += clock() - start
+            
+            if (match[0] if match else None) != best_gesture:
+                mismatches += 1
+                
+        return {
+            'pruned_point_us': pruned_time / max(1, points) * 1e6,
+            'brute_force_point_us': brute_time / max(1, points) * 1e6,
+            'match': mismatches == 0
+        }
+        
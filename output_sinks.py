@@ -0,0 +1,376 @@
+"""
+Pluggable output sinks for scaled tracking values
+The game is fed through the MMAP block or the INI file; further sinks such as
+the UDP datagram stream can be fanned out alongside it, e.g. for a telemetry
+viewer that should not compete for the mmap file
+"""
+
+import socket
+import struct
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from mmap_communication import MMAPCommunicator, MMAP_MAGIC
+from ini_writer import AsyncIniWriter, IniFileWriter, IniTemplate
+
+
+# UDP frame (little-endian, one datagram per frame):
+#   offset  0  uint32   magic 'FNVR'
+#   offset  4  uint16   frame version
+#   offset  6  uint16   payload size in bytes
+#   offset  8  uint64   frame id
+#   offset 16  float64  frame timestamp (seconds)
+#   offset 24  7 x f32  fCanIOpenThis, fiX, fiY, fiZ, fiXr, fiZr, fpZr
+UDP_FRAME_FORMAT = '<IHHQd7f'
+UDP_FRAME_VERSION = 1
+UDP_FRAME_SIZE = struct.calcsize(UDP_FRAME_FORMAT)
+UDP_PAYLOAD_SIZE = struct.calcsize('<7f')
+
+
+class OutputSink:
+    """
+    Base class for output sinks
+    
+    Subclasses implement _write(); write() wraps it with latency counters
+    so every sink reports its cost the same way.
+    """
+    
+    name = 'sink'
+    
+    def __init__(self):
+        self.writes = 0
+        self.failures = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.last_ns = 0
+        
+    def write(self, values: Tuple[float, ...], timestamp: float) -> bool:
+        """
+        Write one frame of scaled output values
+        
+        Args:
+            values: fCanIOpenThis, fiX, fiY, fiZ, fiXr, fiZr, fpZr (see OutputTransform)
+            timestamp: Frame timestamp in seconds
+            
+        Returns:
+            True if the frame was written (or handed off for writing)
+        """
+        start = time.perf_counter_ns()
+        ok = self._write(values, timestamp)
+        elapsed = time.perf_counter_ns() - start
+        
+        self.writes += 1
+        self.total_ns += elapsed
+        self.last_ns = elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        if not ok:
+            self.failures += 1
+        return ok
+        
+    def _write(self, values: Tuple[float, ...], timestamp: float) -> bool:
+        raise NotImplementedError
+        
+    def close(self):
+        """Release resources held by the sink"""
+        
+    def reset_stats(self):
+        """Clear the latency counters"""
+        self.writes = self.failures = self.total_ns = self.max_ns = self.last_ns = 0
+        
+    def get_stats(self) -> Dict:
+        """Get write count and latency counters for this sink"""
+        return {
+            'name': self.name,
+            'writes': self.writes,
+            'failures': self.failures,
+            'avg_us': self.total_ns / self.writes / 1000 if self.writes else 0.0,
+            'max_us': self.max_ns / 1000,
+            'last_us': self.last_ns / 1000
+        }
+        
+
+class MMAPSink(OutputSink):
+    """Writes frames into the shared MMAP block"""
+    
+    name = 'mmap'
+    
+    def __init__(self, mmap_comm: MMAPCommunicator):
+        """
+        Args:
+            mmap_comm: Initialized MMAPCommunicator (owned by the sink)
+        """
+        super().__init__()
+        self.mmap_comm = mmap_comm
+        
+    def _write(self, values: Tuple[float, ...], timestamp: float) -> bool:
+        return self.mmap_comm.write_values(values, timestamp)
+        
+    def close(self):
+        self.mmap_comm.cleanup()
+        
+
+class IniSink(OutputSink):
+    """
+    Writes frames to the game INI file
+    
+    The path is read from the configuration on every frame so a path changed
+    in the GUI takes effect immediately. Asynchronous mode hands frames to an
+    AsyncIniWriter; otherwise the file is written in the calling thread.
+    """
+    
+    name = 'ini'
+    
+    def __init__(self, config: Dict,
+                 status_callback: Optional[Callable[[str, str], None]] = None,
+                 logger: Optional[logging.Logger] = None,
+                 template: Optional[IniTemplate] = None):
+        """
+        Args:
+            config: Configuration dictionary (file_path, ini_async, ini_max_rate, ini_write_mode)
+            status_callback: Called with (message, level) when a write fails
+            logger: Optional logger instance
+            template: INI renderer (default: IniTemplate())
+        """
+        super().__init__()
+        self.config = config
+        self.status_callback = status_callback
+        self.logger = logger or logging.getLogger(__name__)
+        self.template = template or IniTemplate()
+        self.async_writer = None
+        self.file_writer = None
+        
+    def _write(self, values: Tuple[float, ...], timestamp: float) -> bool:
+        cfg = self.config
+        file_path = cfg.get('file_path', 'E:/SteamLibrary/steamapps/common/Fallout New Vegas/Data/Config/Meh.ini')
+        
+        if cfg.get('ini_async', True):
+            # Handed to the writer thread; never blocks the tracking loop
+            if self.async_writer is None:
+                self.async_writer = AsyncIniWriter(
+                    max_rate=cfg.get('ini_max_rate', 90.0),
+                    error_callback=self.status_callback,
+                    logger=self.logger,
+                    template=self.template,
+                    write_mode=cfg.get('ini_write_mode', 'replace')
+                )
+            self.async_writer.submit(file_path, values)
+            return True
+            
+        try:
+            if self.file_writer is None:
+                self.file_writer = IniFileWriter(cfg.get('ini_write_mode', 'replace'))
+            self.file_writer.write(file_path, self.template.render(values))
+            return True
+        except FileNotFoundError:
+            self._report(f"INI file not found: {file_path}")
+            self.logger.error(f"INI file not found at: {file_path}")
+        except PermissionError:
+            self._report(f"Permission denied writing to INI: {file_path}")
+            self.logger.error(f"Permission denied for INI file: {file_path}")
+        except Exception as e:
+            self._report(f"INI update error: {e}")
+            self.logger.exception("Unexpected error updating INI file")
+        return False
+        
+    def _report(self, message: str):
+        if self.status_callback:
+            self.status_callback(message, "error")
+            
+    def close(self):
+        if self.async_writer:
+            self.async_writer.close()
+            self.async_writer = None
+        if self.file_writer:
+            self.file_writer.close()
+            self.file_writer = None
+            
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        if self.async_writer:
+            stats['async'] = self.async_writer.get_stats()
+        return stats
+        
+
+class UdpSink(OutputSink):
+    """
+    Sends each frame as one fixed-size datagram (UDP_FRAME_FORMAT)
+    
+    The socket is non-blocking and unconnected, so a missing or slow
+    listener never stalls the tracking loop; undeliverable frames are
+    counted as failures and dropped.
+    """
+    
+    name = 'udp'
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 47800,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            host: Destination address (localhost by default)
+            port: Destination UDP port
+            logger: Optional logger instance
+        """
+        super().__init__()
+        self.address = (host, port)
+        self.logger = logger or logging.getLogger(__name__)
+        self.frame_id = 0
+        self.buffer = bytearray(UDP_FRAME_SIZE)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self._last_error = None
+        
+    def _write(self, values: Tuple[float, ...], timestamp: float) -> bool:
+        self.frame_id += 1
+        struct.pack_into(UDP_FRAME_FORMAT, self.buffer, 0, MMAP_MAGIC, UDP_FRAME_VERSION,
+                         UDP_PAYLOAD_SIZE, self.frame_id, timestamp, *values)
+        try:
+            self.socket.sendto(self.buffer, self.address)
+        except OSError as e:
+            # No listener (ICMP port unreachable) or a full send buffer
+            if type(e) is not type(self._last_error):
+                self.logger.warning(f"UDP send to {self.address[0]}:{self.address[1]} failed: {e}")
+            self._last_error = e
+            return False
+        self._last_error = None
+        return True
+        
+    def close(self):
+        self.socket.close()
+        
+
+class FanOutSink(OutputSink):
+    """
+    Writes every frame to several sinks
+    
+    The first sink is the primary (the game); write() reports its result.
+    Secondary sinks are written after it, and each keeps its own counters.
+    """
+    
+    name = 'fanout'
+    
+    def __init__(self, sinks: List[OutputSink]):
+        """
+        Args:
+            sinks: Sinks to write to, primary first
+        """
+        super().__init__()
+        self.sinks = list(sinks)
+        
+    def _write(self, values: Tuple[float, ...], timestamp: float) -> bool:
+        sinks = self.sinks
+        ok = sinks[0].write(values, timestamp)
+        for sink in sinks[1:]:
+            sink.write(values, timestamp)
+        return ok
+        
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+            
+    def reset_stats(self):
+        super().reset_stats()
+        for sink in self.sinks:
+            sink.reset_stats()
+            
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats['sinks'] = [sink.get_stats() for sink in self.sinks]
+        return stats
+        
+
+class FallbackSink(OutputSink):
+    """Writes to a primary sink and to a fallback sink only when the primary fails"""
+    
+    name = 'fallback'
+    
+    def __init__(self, primary: OutputSink, fallback: OutputSink):
+        """
+        Args:
+            primary: Preferred sink (e.g. MMAP)
+            fallback: Sink used for frames the primary could not write (e.g. INI)
+        """
+        super().__init__()
+        self.primary = primary
+        self.fallback = fallback
+        
+    def _write(self, values: Tuple[float, ...], timestamp: float) -> bool:
+        if self.primary.write(values, timestamp):
+            return True
+        return self.fallback.write(values, timestamp)
+        
+    def close(self):
+        self.primary.close()
+        self.fallback.close()
+        
+    def reset_stats(self):
+        super().reset_stats()
+        self.primary.reset_stats()
+        self.fallback.reset_stats()
+        
+    def get_stats(self) -> Dict:
+        stats = super().get_stats()
+        stats['sinks'] = [self.primary.get_stats(), self.fallback.get_stats()]
+        return stats
+        
+
+class UdpListener:
+    """Receiver for UdpSink frames, e.g. for a telemetry viewer or tests"""
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 47800, timeout: Optional[float] = 1.0):
+        """
+        Args:
+            host: Address to bind
+            port: UDP port to bind (0 picks a free port, see .port)
+            timeout: Seconds receive() waits for a frame (None = forever)
+        """
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((host, port))
+        self.socket.settimeout(timeout)
+        self.port = self.socket.getsockname()[1]
+        
+    def receive(self) -> Optional[Tuple[int, float, Tuple[float, ...]]]:
+        """
+        Wait for the next frame
+        
+        Returns:
+            (frame_id, timestamp, values) or None on timeout or a malformed datagram
+        """
+        try:
+            data = self.socket.recv(UDP_FRAME_SIZE + 1)
+        except socket.timeout:
+            return None
+        if len(data) != UDP_FRAME_SIZE:
+            return None
+        frame = struct.unpack(UDP_FRAME_FORMAT, data)
+        if frame[0] != MMAP_MAGIC or frame[1] != UDP_FRAME_VERSION:
+            return None
+        return frame[3], frame[4], frame[5:]
+        
+    def close(self):
+        self.socket.close()
+        
+
+class SinkBenchmark:
+    """Compares per-frame cost of the output sinks"""
+    
+    @staticmethod
+    def benchmark_sinks(sinks: List[OutputSink], iterations: int = 2000) -> Dict:
+        """
+        Write the same frames through each sink
+        
+        Args:
+            sinks: Sinks to measure (their counters are reset first)
+            iterations: Frames per sink
+            
+        Returns:
+            Dictionary of per-sink stats keyed by sink name
+        """
+        frames = [(1.0, 0.1 * i, -0.2 * i, 3.0, -40.5, 75.25, -7.5) for i in range(100)]
+        results = {}
+        for sink in sinks:
+            sink.reset_stats()
+            for i in range(iterations):
+                sink.write(frames[i % 100], time.time())
+            results[sink.name] = sink.get_stats()
+        return results
@@ -0,0 +1,112 @@
+"""
+Compiled scale/offset transform from tracking values to game output values
+Shared by the MMAP and INI writers
+"""
+
+import numpy as np
+from typing import Dict, Tuple
+
+
+# Inputs in update_tracking_data order
+INPUT_NAMES = ('iX', 'iY', 'iZ', 'iXr', 'iYr', 'iZr', 'pXr', 'pYr', 'pZr')
+
+# Game fields after fCanIOpenThis: (name, input index, scale key, default scale, offset key, default offset)
+OUTPUT_FIELDS = (
+    ('fiX', 0, 'x_scale', 50, 'x_offset', 15),
+    ('fiY', 1, 'y_scale', -50, 'y_offset', -10),
+    ('fiZ', 2, 'z_scale', -50, 'z_offset', 0),
+    ('fiXr', 3, 'xr_scale', -120, 'xr_offset', 10),
+    ('fiZr', 5, 'zr_scale', 120, 'zr_offset', -75),
+    ('fpZr', 8, 'pzr_scale', -150, 'pzr_offset', -7.5)
+)
+
+OUTPUT_NAMES = ('fCanIOpenThis',) + tuple(field[0] for field in OUTPUT_FIELDS)
+
+
+class OutputTransform:
+    """
+    Maps the nine tracking values to the seven game output values
+    
+    Built once from the configuration: scale and offset are held as NumPy
+    vectors and applied as one multiply-add over whole arrays of frames.
+    For the per-frame path the same coefficients are unpacked into plain
+    floats, since NumPy call overhead dominates at six values.
+    """
+    
+    def __init__(self, config: Dict):
+        """
+        Args:
+            config: Configuration dictionary with scaling values
+        """
+        self.indices = np.array([field[1] for field in OUTPUT_FIELDS])
+        self.scale = np.zeros(len(OUTPUT_FIELDS))
+        self.offset = np.zeros(len(OUTPUT_FIELDS))
+        self.key = None
+        self._coefficients = ()
+        self.update(config)
+        
+    @staticmethod
+    def config_key(config: Dict) -> tuple:
+        """Scale and offset values the transform depends on"""
+        return tuple(
+            (config.get(scale_key, scale), config.get(offset_key, offset))
+            for _, _, scale_key, scale, offset_key, offset in OUTPUT_FIELDS
+        )
+        
+    def update(self, config: Dict) -> bool:
+        """
+        Rebuild the coefficients if the scaling configuration changed
+        
+        Returns:
+            True if the transform was rebuilt
+        """
+        key = self.config_key(config)
+        if key == self.key:
+            return False
+            
+        for i, (scale, offset) in enumerate(key):
+            self.scale[i] = scale
+            self.offset[i] = offset
+        self._coefficients = tuple(float(c) for pair in zip(self.scale, self.offset) for c in pair)
+        self.key = key
+        return True
+        
+    def apply(self, iX: float, iY: float, iZ: float,
+              iXr: float, iYr: float, iZr: float,
+              pXr: float, pYr: float, pZr: float) -> Tuple[float, ...]:
+        """
+        Compute the output values for one frame
+        
+        Args:
+            iX..pZr: Tracking values as passed to update_tracking_data
+            
+        Returns:
+            Output values in OUTPUT_NAMES order
+        """
+        sx, ox, sy, oy, sz, oz, sxr, oxr, szr, ozr, spzr, opzr = self._coefficients
+        return (
+            1.0,
+            iX * sx + ox,
+            iY * sy + oy,
+            iZ * sz + oz,
+            iXr * sxr + oxr,
+            iZr * szr + ozr,
+            pZr * spzr + opzr
+        )
+        
+    def apply_array(self, inputs: np.ndarray) -> np.ndarray:
+        """
+        Compute output values for many frames at once
+        
+        Args:
+            inputs: Tracking values, shape (..., 9)
+            
+        Returns:
+            Output values, shape (..., 7)
+        """
+        inputs = np.asarray(inputs, dtype=np.float64)
+        values = np.empty(inputs.shape[:-1] + (len(OUTPUT_NAMES),))
+        values[..., 0] = 1.0
+        np.multiply(inputs[..., self.indices], self.scale, out=values[..., 1:])
+        np.add(values[..., 1:], self.offset, out=values[..., 1:])
+        return values
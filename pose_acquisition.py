@@ -0,0 +1,156 @@
+"""
+Zero-allocation pose acquisition from OpenVR
+Reuses a single TrackedDevicePose_t array and reads it through NumPy views
+"""
+
+import ctypes
+import itertools
+import numpy as np
+import openvr
+from typing import Dict
+
+
+def pose_dtype(pose_type=openvr.TrackedDevicePose_t) -> np.dtype:
+    """Build a NumPy structured dtype matching the TrackedDevicePose_t layout"""
+    return np.dtype({
+        'names': ['matrix', 'velocity', 'angular_velocity', 'tracking_result', 'valid', 'connected'],
+        'formats': [('<f4', (3, 4)), ('<f4', 3), ('<f4', 3), '<i4', '?', '?'],
+        'offsets': [
+            pose_type.mDeviceToAbsoluteTracking.offset,
+            pose_type.vVelocity.offset,
+            pose_type.vAngularVelocity.offset,
+            pose_type.eTrackingResult.offset,
+            pose_type.bPoseIsValid.offset,
+            pose_type.bDeviceIsConnected.offset
+        ],
+        'itemsize': ctypes.sizeof(pose_type)
+    })
+    
+
+class PoseBuffer:
+    """Pose array allocated once, exposed as zero-copy NumPy views"""
+    
+    def __init__(self, max_devices: int = openvr.k_unMaxTrackedDeviceCount):
+        """
+        Args:
+            max_devices: Number of pose slots to request from OpenVR
+        """
+        self.max_devices = max_devices
+        self.poses = (openvr.TrackedDevicePose_t * max_devices)()
+        
+        # Views share memory with self.poses, so they always show the
+        # values written by the last getDeviceToAbsoluteTrackingPose call
+        self.records = np.frombuffer(self.poses, dtype=pose_dtype())
+        self.matrices = self.records['matrix']
+        self.velocities = self.records['velocity']
+        self.angular_velocities = self.records['angular_velocity']
+        self.valid = self.records['valid']
+        self.connected = self.records['connected']
+        
+    def fetch(self, vr_system, origin: int, predicted_seconds: float = 0.0):
+        """
+        Fill the pose array in place
+        
+        Args:
+            vr_system: IVRSystem (or compatible) instance
+            origin: Tracking universe origin
+            predicted_seconds: Seconds from now to predict poses for
+            
+        Returns:
+            The reused TrackedDevicePose_t array
+        """
+        return vr_system.getDeviceToAbsoluteTrackingPose(origin, predicted_seconds, self.poses)
+        
+    def __len__(self):
+        return self.max_devices
+        
+
+class _RecordedPoseSource:
+    """Stand-in for IVRSystem that writes a recorded matrix stream into pose arrays"""
+    
+    def __init__(self, matrices: np.ndarray, valid: np.ndarray):
+        # Frames are cycled as prebuilt (matrices, valid) pairs so the
+        # stand-in itself allocates nothing per frame
+        self._frames = itertools.cycle(list(zip(matrices.astype(np.float32), valid.astype(bool))))
+        self._poses = None
+        self._views = None
+        
+    def getDeviceToAbsoluteTrackingPose(self, origin, predicted_seconds, poses):
+        if poses is not self._poses:
+            records = np.frombuffer(poses, dtype=pose_dtype())
+            self._poses = poses
+            self._views = (records['matrix'], records['valid'])
+            
+        views = self._views
+        frame_matrices, frame_valid = next(self._frames)
+        np.copyto(views[0], frame_matrices)
+        np.copyto(views[1], frame_valid)
+        return poses
+        
+
+class PoseAcquisitionBenchmark:
+    """Benchmark utility to compare per-frame pose acquisition allocations"""
+    
+    @staticmethod
+    def benchmark_allocations(matrices: np.ndarray, valid: np.ndarray,
+                              hmd_index: int = 0, controller_index: int = 1,
+                              iterations: int = 1000) -> Dict:
+        """
+        Replay a recorded pose stream through the legacy and buffered acquisition paths
+        
+        Args:
+            matrices: Recorded matrices, shape (frames, devices, 3, 4)
+            valid: Recorded validity flags, shape (frames, devices)
+            hmd_index: HMD device index in the stream
+            controller_index: Controller device index in the stream
+            iterations: Number of frames to measure
+            
+        Returns:
+            Dictionary with benchmark results (bytes allocated per frame measured with tracemalloc)
+        """
+        import time
+        import tracemalloc
+        from pose_math import PoseKernel
+        
+        max_devices = matrices.shape[1]
+        origin = openvr.TrackingUniverseStanding
+        TrackedDevicePose_t = openvr.TrackedDevicePose_t
+        
+        def legacy_frame(source):
+            poses = source.getDeviceToAbsoluteTrackingPose(origin, 0.0, (TrackedDevicePose_t * max_devices)())
+            m = poses[hmd_index].mDeviceToAbsoluteTracking
+            n = poses[controller_index].mDeviceToAbsoluteTracking
+            hmd_matrix = [[m[r][c] for c in range(4)] for r in range(3)]
+            con_matrix = [[n[r][c] for c in range(4)] for r in range(3)]
+            return hmd_matrix, con_matrix
+            
+        buffer = PoseBuffer(max_devices)
+        kernel = PoseKernel(max_devices)
+        
+        def buffered_frame(source):
+            buffer.fetch(source, origin, 0.0)
+            kernel.load_buffer(buffer)
+            
+        results = {'iterations': iterations}
+        for name, frame in (('legacy', legacy_frame), ('buffered', buffered_frame)):
+            source = _RecordedPoseSource(matrices, valid)
+            frame(source)  # warm up caches outside the measurement
+            
+            tracemalloc.start()
+            peak_bytes = 0
+            start_bytes = tracemalloc.get_traced_memory()[0]
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                frame(source)
+                peak_bytes += tracemalloc.get_traced_memory()[1] - before
+            elapsed = time.perf_counter() - start_time
+            end_bytes = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            
+            results[f'{name}_allocated_bytes_per_frame'] = peak_bytes / iterations
+            results[f'{name}_retained_bytes_per_frame'] = (end_bytes - start_bytes) / iterations
+            results[f'{name}_avg_time_ms'] = (elapsed / iterations) * 1000
+            
+        return results
@@ -0,0 +1,215 @@
+"""
+Vectorized pose math for VR tracking data
+Converts OpenVR device matrices to HMD-relative poses in preallocated buffers
+"""
+
+import math
+import numpy as np
+from typing import Tuple
+
+
+# Sign pattern used to build the four quaternion magnitudes from the
+# rotation matrix diagonal: w, x, y, z = sqrt(max(0, 1 + S @ diag)) / 2
+_DIAGONAL_SIGNS = np.array([
+    [1.0, 1.0, 1.0],
+    [1.0, -1.0, -1.0],
+    [-1.0, 1.0, -1.0],
+    [-1.0, -1.0, 1.0]
+])
+
+
+def quaternion_to_euler(w: float, x: float, y: float, z: float) -> Tuple[float, float, float]:
+    """Convert quaternion (w, x, y, z) to Euler angles (roll, pitch, yaw) in degrees."""
+    # roll (x-axis rotation)
+    sinr_cosp = 2 * (w * x + y * z)
+    cosr_cosp = 1 - 2 * (x * x + y * y)
+    roll = math.atan2(sinr_cosp, cosr_cosp)
+    
+    # pitch (y-axis rotation)
+    sinp = 2 * (w * y - z * x)
+    if abs(sinp) >= 1:
+        pitch = math.copysign(math.pi / 2, sinp)  # use 90 degrees if out of range
+    else:
+        pitch = math.asin(sinp)
+        
+    # yaw (z-axis rotation)
+    siny_cosp = 2 * (w * z + x * y)
+    cosy_cosp = 1 - 2 * (y * y + z * z)
+    yaw = math.atan2(siny_cosp, cosy_cosp)
+    
+    return math.degrees(roll), math.degrees(pitch), math.degrees(yaw)
+    
+
+class PoseKernel:
+    """
+    Batched pose solver for every tracked device
+    
+    All buffers are allocated once. A frame is processed by loading the
+    device matrices, then calling solve() with the HMD index; the results
+    are read in place from the public arrays.
+    """
+    
+    def __init__(self, max_devices: int = 64):
+        """
+        Args:
+            max_devices: Number of device slots (k_unMaxTrackedDeviceCount)
+        """
+        self.max_devices = max_devices
+        n = max_devices
+        
+        # Inputs
+        self.matrices = np.zeros((n, 3, 4))
+        self.valid = np.zeros(n, dtype=bool)
+        
+        # Outputs
+        self.quaternions = np.zeros((n, 4))          # world rotation (w, x, y, z)
+        self.relative_positions = np.zeros((n, 3))   # position in HMD space
+        self.relative_rotations = np.zeros((n, 4))   # rotation in HMD space (w, x, y, z)
+        self.relative_euler = np.zeros((n, 3))       # roll, pitch, yaw in degrees
+        self.hmd_euler = (0.0, 0.0, 0.0)
+        
+        # Scratch buffers
+        self._world_diff = np.zeros((n, 3))
+        self._sign_source = np.zeros((n, 3))
+        self._hmd_left = np.zeros((4, 4))
+        self._hmd_inverse_rotation = np.zeros((3, 3))
+        self._euler_a = np.zeros(n)
+        self._euler_b = np.zeros(n)
+        self._euler_c = np.zeros(n)
+        
+        # Views into the input matrices, created once so solve() only
+        # issues ufunc calls with out= targets
+        self._diagonal = np.diagonal(self.matrices[:, :, :3], axis1=1, axis2=2)
+        self._positions = self.matrices[:, :, 3]
+        self._m21, self._m12 = self.matrices[:, 2, 1], self.matrices[:, 1, 2]
+        self._m02, self._m20 = self.matrices[:, 0, 2], self.matrices[:, 2, 0]
+        self._m10, self._m01 = self.matrices[:, 1, 0], self.matrices[:, 0, 1]
+        self._vector_part = self.quaternions[:, 1:]
+        
+        rr = self.relative_rotations
+        self._rw, self._rx, self._ry, self._rz = rr[:, 0], rr[:, 1], rr[:, 2], rr[:, 3]
+        self._roll = self.relative_euler[:, 0]
+        self._pitch = self.relative_euler[:, 1]
+        self._yaw = self.relative_euler[:, 2]
+        
+    def load_poses(self, poses) -> int:
+        """
+        Copy matrices of valid poses from an OpenVR pose array
+        
+        Args:
+            poses: Sequence of TrackedDevicePose_t
+            
+        Returns:
+            Number of valid poses
+        """
+        count = min(len(poses), self.max_devices)
+        valid = self.valid
+        matrices = self.matrices
+        valid[:] = False
+        
+        for i in range(count):
+            pose = poses[i]
+            if pose.bPoseIsValid:
+                valid[i] = True
+                matrices[i] = pose.mDeviceToAbsoluteTracking.m
+                
+        return int(np.count_nonzero(valid))
+        
+    def load_buffer(self, buffer):
+        """
+        Copy matrices and validity flags from a PoseBuffer in place
+        
+        Args:
+            buffer: PoseBuffer with the same number of device slots
+        """
+        np.copyto(self.matrices, buffer.matrices)
+        np.copyto(self.valid, buffer.valid)
+        
+    def solve(self, hmd_index: int):
+        """
+        Compute world quaternions and HMD-relative poses for all devices
+        
+        Args:
+            hmd_index: Device index of the HMD
+        """
+        q = self.quaternions
+        
+        # Matrix to quaternion, all devices in one pass
+        np.matmul(self._diagonal, _DIAGONAL_SIGNS.T, out=q)
+        np.add(q, 1.0, out=q)
+        np.maximum(q, 0.0, out=q)
+        np.sqrt(q, out=q)
+        np.multiply(q, 0.5, out=q)
+        
+        signs = self._sign_source
+        np.subtract(self._m21, self._m12, out=signs[:, 0])
+        np.subtract(self._m02, self._m20, out=signs[:, 1])
+        np.subtract(self._m10, self._m01, out=signs[:, 2])
+        np.copysign(self._vector_part, signs, out=self._vector_part)
+        
+        # HMD inverse rotation (conjugate quaternion)
+        w, x, y, z = q[hmd_index].tolist()
+        x, y, z = -x, -y, -z
+        
+        # relative_rotation = conj(hmd) * device, as a left-multiplication matrix
+        left = self._hmd_left
+        left[0, 0], left[0, 1], left[0, 2], left[0, 3] = w, -x, -y, -z
+        left[1, 0], left[1, 1], left[1, 2], left[1, 3] = x, w, -z, y
+        left[2, 0], left[2, 1], left[2, 2], left[2, 3] = y, z, w, -x
+        left[3, 0], left[3, 1], left[3, 2], left[3, 3] = z, -y, x, w
+        np.matmul(q, left.T, out=self.relative_rotations)
+        
+        # relative_position = conj(hmd) * (device - hmd) * hmd
+        rot = self._hmd_inverse_rotation
+        rot[0, 0] = w * w + x * x - y * y - z * z
+        rot[0, 1] = 2 * (x * y - w * z)
+        rot[0, 2] = 2 * (x * z + w * y)
+        rot[1, 0] = 2 * (x * y + w * z)
+        rot[1, 1] = w * w - x * x + y * y - z * z
+        rot[1, 2] = 2 * (y * z - w * x)
+        rot[2, 0] = 2 * (x * z - w * y)
+        rot[2, 1] = 2 * (y * z + w * x)
+        rot[2, 2] = w * w - x * x - y * y + z * z
+        
+        diff = self._world_diff
+        np.subtract(self._positions, self._positions[hmd_index], out=diff)
+        np.matmul(diff, rot.T, out=self.relative_positions)
+        
+        self._relative_to_euler()
+        self.hmd_euler = quaternion_to_euler(w, -x, -y, -z)
+        
+    def _relative_to_euler(self):
+        """Batched quaternion_to_euler over relative_rotations"""
+        rw, rx, ry, rz = self._rw, self._rx, self._ry, self._rz
+        a, b, c = self._euler_a, self._euler_b, self._euler_c
+        
+        # roll = atan2(2(wx + yz), 1 - 2(x^2 + y^2))
+        np.multiply(rw, rx, out=a)
+        np.multiply(ry, rz, out=b)
+        np.add(a, b, out=a)
+        np.multiply(rx, rx, out=b)
+        np.multiply(ry, ry, out=c)
+        np.add(b, c, out=b)
+        np.subtract(0.5, b, out=b)
+        np.arctan2(a, b, out=self._roll)
+        
+        # pitch = asin(clip(2(wy - zx), -1, 1))
+        np.multiply(rw, ry, out=a)
+        np.multiply(rz, rx, out=b)
+        np.subtract(a, b, out=a)
+        np.multiply(a, 2.0, out=a)
+        np.minimum(a, 1.0, out=a)
+        np.maximum(a, -1.0, out=a)
+        np.arcsin(a, out=self._pitch)
+        
+        # yaw = atan2(2(wz + xy), 1 - 2(y^2 + z^2))
+        np.multiply(rw, rz, out=a)
+        np.multiply(rx, ry, out=b)
+        np.add(a, b, out=a)
+        np.multiply(ry, ry, out=b)
+        np.multiply(rz, rz, out=c)
+        np.add(b, c, out=b)
+        np.subtract(0.5, b, out=b)
+        np.arctan2(a, b, out=self._yaw)
+        
+        np.degrees(self.relative_euler, out=self.relative_euler)
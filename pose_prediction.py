@@ -0,0 +1,288 @@
+"""
+Motion-to-photon pose prediction for VR tracking data
+Extrapolates device poses forward to offset smoothing and pipeline latency
+"""
+
+import logging
+import numpy as np
+from typing import Dict, Optional
+
+
+PREDICTION_MODES = ('velocity', 'constant_velocity', 'constant_acceleration')
+
+
+class PosePredictor:
+    """
+    Extrapolates world-space device matrices by a fixed lookahead
+    
+    Modes:
+        velocity: Use the OpenVR reported vVelocity / vAngularVelocity
+        constant_velocity: Estimate velocities from consecutive frames
+        constant_acceleration: Like constant_velocity, plus linear acceleration
+        
+    Prediction runs on the PoseKernel inputs before solve(), for all devices
+    at once, so HMD-relative poses and everything downstream see the
+    predicted pose.
+    """
+    
+    def __init__(self, mode: str = 'velocity', lookahead: float = 0.02,
+                 max_devices: int = 64, logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            mode: One of PREDICTION_MODES
+            lookahead: Seconds to extrapolate forward
+            max_devices: Number of device slots
+            logger: Optional logger instance
+        """
+        if mode not in PREDICTION_MODES:
+            raise ValueError(f"Unknown prediction mode: {mode}")
+            
+        self.mode = mode
+        self.lookahead = lookahead
+        self.logger = logger or logging.getLogger(__name__)
+        n = max_devices
+        
+        # Estimated (or reported) velocities in tracking space
+        self.linear_velocity = np.zeros((n, 3))
+        self.angular_velocity = np.zeros((n, 3))
+        self.linear_acceleration = np.zeros((n, 3))
+        
+        # History for the finite-difference modes
+        self._prev_matrices = np.zeros((n, 3, 4))
+        self._prev_velocity = np.zeros((n, 3))
+        self._prev_time = None
+        
+        # Scratch buffers
+        self._step = np.zeros((n, 3))
+        self._step_sq = np.zeros((n, 3))
+        self._angle = np.zeros(n)
+        self._sin = np.zeros(n)
+        self._cos = np.zeros(n)
+        self._scale = np.zeros(n)
+        self._axis = np.zeros((n, 3))
+        self._skew = np.zeros((n, 3, 3))
+        self._skew_sq = np.zeros((n, 3, 3))
+        self._delta = np.zeros((n, 3, 3))
+        self._rotated = np.zeros((n, 3, 3))
+        self._identity = np.broadcast_to(np.eye(3), (n, 3, 3))
+        
+    def reset(self):
+        """Forget motion history"""
+        self._prev_time = None
+        self.linear_velocity.fill(0.0)
+        self.angular_velocity.fill(0.0)
+        self.linear_acceleration.fill(0.0)
+        
+    def predict(self, matrices: np.ndarray, timestamp: float,
+                velocities: Optional[np.ndarray] = None,
+                angular_velocities: Optional[np.ndarray] = None):
+        """
+        Extrapolate device matrices in place
+        
+        Args:
+            matrices: Device matrices, shape (devices, 3, 4), modified in place
+            timestamp: Frame timestamp in seconds
+            velocities: OpenVR linear velocities (velocity mode)
+            angular_velocities: OpenVR angular velocities (velocity mode)
+        """
+        if self.mode == 'velocity':
+            np.copyto(self.linear_velocity, velocities)
+            np.copyto(self.angular_velocity, angular_velocities)
+        elif not self._estimate(matrices, timestamp):
+            return
+            
+        lookahead = self.lookahead
+        positions = matrices[:, :, 3]
+        
+        # Position: p + v*L (+ a*L^2/2)
+        step = self._step
+        np.multiply(self.linear_velocity, lookahead, out=step)
+        np.add(positions, step, out=positions)
+        if self.mode == 'constant_acceleration':
+            np.multiply(self.linear_acceleration, 0.5 * lookahead * lookahead, out=step)
+            np.add(positions, step, out=positions)
+            
+        # Rotation: exp([w]x * L) @ R via Rodrigues' formula
+        rotation = matrices[:, :, :3]
+        self._rotation_step(self.angular_velocity, lookahead, out=self._delta)
+        np.matmul(self._delta, rotation, out=self._rotated)
+        np.copyto(rotation, self._rotated)
+        
+    def _estimate(self, matrices: np.ndarray, timestamp: float) -> bool:
+        """Update finite-difference velocities; returns False until two frames are seen"""
+        prev_time = self._prev_time
+        self._prev_time = timestamp
+        
+        if prev_time is None or timestamp <= prev_time:
+            np.copyto(self._prev_matrices, matrices)
+            return False
+            
+        inv_dt = 1.0 / (timestamp - prev_time)
+        prev = self._prev_matrices
+        
+        # Linear velocity and acceleration
+        np.copyto(self._prev_velocity, self.linear_velocity)
+        np.subtract(matrices[:, :, 3], prev[:, :, 3], out=self.linear_velocity)
+        np.multiply(self.linear_velocity, inv_dt, out=self.linear_velocity)
+        np.subtract(self.linear_velocity, self._prev_velocity, out=self.linear_acceleration)
+        np.multiply(self.linear_acceleration, inv_dt, out=self.linear_acceleration)
+        
+        # Angular velocity from the relative rotation R * R_prev^T
+        delta = self._delta
+        np.matmul(matrices[:, :, :3], prev[:, :, :3].transpose(0, 2, 1), out=delta)
+        
+        # angle = acos((trace - 1) / 2)
+        cos = self._cos
+        np.trace(delta, axis1=1, axis2=2, out=cos)
+        np.subtract(cos, 1.0, out=cos)
+        np.multiply(cos, 0.5, out=cos)
+        np.minimum(cos, 1.0, out=cos)
+        np.maximum(cos, -1.0, out=cos)
+        np.arccos(cos, out=self._angle)
+        np.sin(self._angle, out=self._sin)
+        
+        # axis * angle = vee(R - R^T) * angle / (2 sin(angle)); limit is 1/2 at zero angle
+        axis = self._axis
+        np.subtract(delta[:, 2, 1], delta[:, 1, 2], out=axis[:, 0])
+        np.subtract(delta[:, 0, 2], delta[:, 2, 0], out=axis[:, 1])
+        np.subtract(delta[:, 1, 0], delta[:, 0, 1], out=axis[:, 2])
+        scale = self._scale
+        scale.fill(0.5)
+        np.multiply(self._sin, 2.0, out=self._sin)
+        np.divide(self._angle, self._sin, out=scale, where=self._sin > 1e-9)
+        np.multiply(axis, scale[:, None], out=self.angular_velocity)
+        np.multiply(self.angular_velocity, inv_dt, out=self.angular_velocity)
+        
+        np.copyto(prev, matrices)
+        return True
+        
+    def _rotation_step(self, angular_velocity: np.ndarray, dt: float, out: np.ndarray):
+        """Rotation matrices exp([w]x * dt) for all devices"""
+        axis = self._axis
+        np.multiply(angular_velocity, dt, out=axis)
+        
+        angle = self._angle
+        np.multiply(axis, axis, out=self._step_sq)
+        np.sum(self._step_sq, axis=1, out=angle)
+        np.sqrt(angle, out=angle)
+        
+        # Unit axis; zero rotation keeps a zero axis
+        scale = self._scale
+        scale.fill(0.0)
+        np.divide(1.0, angle, out=scale, where=angle > 1e-12)
+        np.multiply(axis, scale[:, None], out=axis)
+        
+        skew = self._skew
+        skew.fill(0.0)
+        np.negative(axis[:, 2], out=skew[:, 0, 1])
+        np.copyto(skew[:, 0, 2], axis[:, 1])
+        np.copyto(skew[:, 1, 0], axis[:, 2])
+        np.negative(axis[:, 0], out=skew[:, 1, 2])
+        np.negative(axis[:, 1], out=skew[:, 2, 0])
+        np.copyto(skew[:, 2, 1], axis[:, 0])
+        np.matmul(skew, skew, out=self._skew_sq)
+        
+        # R = I + sin(a) K + (1 - cos(a)) K^2
+        np.sin(angle, out=self._sin)
+        np.cos(angle, out=self._cos)
+        np.subtract(1.0, self._cos, out=self._cos)
+        np.multiply(skew, self._sin[:, None, None], out=skew)
+        np.multiply(self._skew_sq, self._cos[:, None, None], out=self._skew_sq)
+        np.add(self._identity, skew, out=out)
+        np.add(out, self._skew_sq, out=out)
+        
+
+class PredictionBenchmark:
+    """Offline harness measuring how much prediction offsets smoothing latency"""
+    
+    @staticmethod
+    def estimate_lag(reference: np.ndarray, signal: np.ndarray, max_shift: int = 30) -> float:
+        """
+        Estimate how many frames signal lags behind reference (negative = leads)
+        
+        Args:
+            reference: Ground-truth samples, shape (frames, axes)
+            signal: Processed samples, same shape
+            max_shift: Largest shift to search, in frames
+            
+        Returns:
+            Lag in frames with sub-frame (parabolic) refinement
+        """
+        frames = len(reference)
+        errors = []
+        for shift in range(-max_shift, max_shift + 1):
+            if shift >= 0:
+                diff = signal[shift:] - reference[:frames - shift]
+            else:
+                diff = signal[:frames + shift] - reference[-shift:]
+            errors.append(np.mean(diff * diff))
+            
+        errors = np.array(errors)
+        best = int(np.argmin(errors))
+        offset = 0.0
+        if 0 < best < len(errors) - 1:
+            left, centre, right = errors[best - 1], errors[best], errors[best + 1]
+            denom = left - 2 * centre + right
+            if denom > 0:
+                offset = 0.5 * (left - right) / denom
+        return best - max_shift + offset
+        
+    @staticmethod
+    def evaluate(timestamps: np.ndarray, matrices: np.ndarray,
+                 config: Dict, mode: str = 'constant_velocity', lookahead: float = 0.02,
+                 velocities: Optional[np.ndarray] = None,
+                 angular_velocities: Optional[np.ndarray] = None) -> Dict:
+        """
+        Compare smoothed output lag with and without prediction on a recorded trace
+        
+        Args:
+            timestamps: Frame timestamps in seconds, shape (frames,)
+            matrices: One device's world matrices, shape (frames, 3, 4)
+            config: Configuration dictionary for the position smoother
+            mode: Prediction mode to evaluate
+            lookahead: Prediction lookahead in seconds
+            velocities: Recorded vVelocity, shape (frames, 3) (velocity mode)
+            angular_velocities: Recorded vAngularVelocity, shape (frames, 3) (velocity mode)
+            
+        Returns:
+            Dictionary with benchmark results
+        """
+        from data_smoothing import OneEuroFilter
+        
+        raw = matrices[:, :, 3].astype(np.float64)
+        frame_dt = float(np.median(np.diff(timestamps)))
+        
+        def smoothed_positions(predictor):
+            filters = [
+                OneEuroFilter(config.get('position_min_cutoff', 1.0), config.get('position_beta', 0.007))
+                for _ in range(3)
+            ]
+            frame = np.zeros((1, 3, 4))
+            output = np.zeros_like(raw)
+            for i, t in enumerate(timestamps):
+                frame[0] = matrices[i]
+                if predictor is not None:
+                    if predictor.mode == 'velocity':
+                        predictor.predict(frame, t, velocities[i:i + 1], angular_velocities[i:i + 1])
+                    else:
+                        predictor.predict(frame, t)
+                for axis in range(3):
+                    output[i, axis] = filters[axis].smooth_with_time(frame[0, axis, 3], t)
+            return output
+            
+        baseline = smoothed_positions(None)
+        predicted = smoothed_positions(PosePredictor(mode, lookahead, max_devices=1))
+        
+        baseline_lag = float(PredictionBenchmark.estimate_lag(raw, baseline)) * frame_dt
+        predicted_lag = float(PredictionBenchmark.estimate_lag(raw, predicted)) * frame_dt
+        
+        return {
+            'frames': len(timestamps),
+            'mode': mode,
+            'lookahead_ms': lookahead * 1000,
+            'baseline_lag_ms': baseline_lag * 1000,
+            'predicted_lag_ms': predicted_lag * 1000,
+            'latency_reduction_ms': (baseline_lag - predicted_lag) * 1000,
+            'baseline_rms_error': float(np.sqrt(np.mean((baseline - raw) ** 2))),
+            'predicted_rms_error': float(np.sqrt(np.mean((predicted - raw) ** 2)))
+        }
@@ -0,0 +1,317 @@
+"""
+Record and replay of raw tracking poses
+Captures HMD and controller poses to a memory-mapped .npy frame array and
+replays them through TrackerLogic without SteamVR
+"""
+
+import os
+import time
+import logging
+import numpy as np
+import openvr
+from typing import Dict, Optional, Union
+
+
+# Device slots stored per frame
+SLOT_HMD, SLOT_LEFT, SLOT_RIGHT = 0, 1, 2
+TRACE_SLOTS = 3
+
+TRACE_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('indices', 'i1', (TRACE_SLOTS,)),          # device index per slot, -1 if absent
+    ('roles', 'i1', (TRACE_SLOTS,)),            # ETrackedControllerRole per slot
+    ('valid', '?', (TRACE_SLOTS,)),
+    ('matrices', '<f4', (TRACE_SLOTS, 3, 4)),
+    ('velocities', '<f4', (TRACE_SLOTS, 3)),
+    ('angular_velocities', '<f4', (TRACE_SLOTS, 3))
+])
+
+_ROLE_VALUES = {
+    'left': openvr.TrackedControllerRole_LeftHand,
+    'right': openvr.TrackedControllerRole_RightHand,
+    'unknown': openvr.TrackedControllerRole_Invalid
+}
+
+
+def load_trace(path: str) -> np.ndarray:
+    """Open a recorded trace as a read-only memory-mapped frame array"""
+    trace = np.load(path, mmap_mode='r')
+    if trace.dtype != TRACE_DTYPE:
+        raise ValueError(f"Not a pose trace: {path}")
+    return trace
+    
+
+class PoseTraceRecorder:
+    """Writes raw poses from the tracking loop into a memory-mapped .npy file"""
+    
+    def __init__(self, path: str, capacity: int = 90 * 60 * 10,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            path: Output .npy path
+            capacity: Maximum number of frames (default: 10 minutes at 90 Hz)
+            logger: Optional logger instance
+        """
+        self.path = path
+        self.capacity = capacity
+        self.logger = logger or logging.getLogger(__name__)
+        self.count = 0
+        
+        self.frames = np.lib.format.open_memmap(path, mode='w+', dtype=TRACE_DTYPE, shape=(capacity,))
+        self.logger.info(f"Recording pose trace to: {path}")
+        
+    def record(self, timestamp: float, pose_buffer, registry) -> bool:
+        """
+        Append one frame
+        
+        Args:
+            timestamp: Frame timestamp in seconds
+            pose_buffer: PoseBuffer filled for this frame
+            registry: DeviceRegistry with the current controller topology
+            
+        Returns:
+            False once the trace is full
+        """
+        if self.count >= self.capacity:
+            return False
+            
+        left, right = registry.left_index, registry.right_index
+        if left is None and right is None and registry.controllers:
+            # Controller without a hand role; keep it in the right slot
+            right = registry.controllers[0]
+            
+        frame = self.frames[self.count]
+        frame['timestamp'] = timestamp
+        for slot, index in ((SLOT_HMD, registry.hmd_index), (SLOT_LEFT, left), (SLOT_RIGHT, right)):
+            if index is None:
+                frame['indices'][slot] = -1
+                frame['valid'][slot] = False
+                continue
+                
+            frame['indices'][slot] = index
+            frame['roles'][slot] = _ROLE_VALUES.get(registry.roles.get(index, 'unknown'), 0)
+            frame['valid'][slot] = pose_buffer.valid[index]
+            frame['matrices'][slot] = pose_buffer.matrices[index]
+            frame['velocities'][slot] = pose_buffer.velocities[index]
+            frame['angular_velocities'][slot] = pose_buffer.angular_velocities[index]
+            
+        self.count += 1
+        if self.count == self.capacity:
+            self.logger.warning(f"Pose trace full after {self.capacity} frames")
+        return True
+        
+    def close(self):
+        """Flush and trim the trace to the recorded frame count"""
+        if self.frames is None:
+            return
+            
+        frames = self.frames
+        self.frames = None
+        frames.flush()
+        
+        if self.count < self.capacity:
+            trimmed = np.array(frames[:self.count])
+            del frames
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                np.save(f, trimmed)
+            os.replace(temp_path, self.path)
+            
+        self.logger.info(f"Pose trace saved: {self.count} frames")
+        
+
+class TraceReplay:
+    """
+    Replays a recorded trace as a stand-in for IVRSystem
+    
+    The replay implements the IVRSystem calls used by the tracking loop and
+    drives TrackerLogic's clock from the recorded timestamps, so smoothing,
+    prediction and gestures behave the same at any replay speed.
+    
+    Frames only advance when the loop fetches poses. A loop iteration that
+    ends without a fetch (e.g. dual hand mode on a one-controller trace)
+    skips ahead to the next change of recorded devices; if there is none the
+    replay stops and reports the stall instead of waiting forever.
+    """
+    
+    def __init__(self, trace: Union[str, np.ndarray], realtime: bool = False):
+        """
+        Args:
+            trace: Trace path or frame array from load_trace()
+            realtime: Pace frames at the recorded rate instead of maximum speed
+        """
+        self.trace = load_trace(trace) if isinstance(trace, str) else trace
+        self.realtime = realtime
+        self.tracker = None
+        self.frame = -1
+        
+        # Mean spacing over the whole trace; per-frame steps can be 0 with a coarse clock
+        timestamps = self.trace['timestamp']
+        span = float(timestamps[-1] - timestamps[0]) if len(timestamps) > 1 else 0.0
+        self.frame_rate = (len(timestamps) - 1) / span if span > 0 else 90.0
+        
+        self._current = self.trace[0]
+        self._pending_topology_event = True
+        self._fetched = True
+        self.skipped = 0
+        self.stalled = None
+        self._poses = None
+        self._records = None
+        
+    # --- IVRSystem subset ---
+    
+    def getDeviceToAbsoluteTrackingPose(self, origin, predicted_seconds, poses):
+        """Write the next recorded frame into the pose array"""
+        if self.frame + 1 >= len(self.trace):
+            return poses
+            
+        self._fetched = True
+        previous = self._current
+        self.frame += 1
+        if self.frame + 1 == len(self.trace) and self.tracker is not None:
+            # Last frame: the loop finishes it and then exits
+            self.tracker.running = False
+        current = self._current = self.trace[self.frame]
+        if (current['indices'] != previous['indices']).any() or (current['roles'] != previous['roles']).any():
+            self._pending_topology_event = True
+            
+        if poses is not self._poses:
+            from pose_acquisition import pose_dtype
+            self._poses = poses
+            self._records = np.frombuffer(poses, dtype=pose_dtype())
+            
+        records = self._records
+        records['valid'] = False
+        for slot in range(TRACE_SLOTS):
+            index = current['indices'][slot]
+            if index < 0:
+                continue
+            records['matrix'][index] = current['matrices'][slot]
+            records['velocity'][index] = current['velocities'][slot]
+            records['angular_velocity'][index] = current['angular_velocities'][slot]
+            records['valid'][index] = current['valid'][slot]
+            records['connected'][index] = True
+        return poses
+        
+    def pollNextEvent(self, event) -> bool:
+        """Report a device update when the recorded topology changes"""
+        if self._pending_topology_event:
+            self._pending_topology_event = False
+            event.eventType = openvr.VREvent_TrackedDeviceUpdated
+            event.trackedDeviceIndex = openvr.k_unTrackedDeviceIndexInvalid
+            return True
+            
+        # The event queue is drained once per loop iteration
+        if not self._fetched and self.tracker is not None:
+            self._skip_idle_frames()
+            self._fetched = True  # The skip counts as this iteration's progress
+            if self._pending_topology_event:
+                return self.pollNextEvent(event)
+        self._fetched = False
+        return False
+        
+    def isTrackedDeviceConnected(self, index: int) -> bool:
+        return index in self._current['indices']
+        
+    def getTrackedDeviceClass(self, index: int) -> int:
+        indices = list(self._current['indices'])
+        if index not in indices:
+            return openvr.TrackedDeviceClass_Invalid
+        if indices.index(index) == SLOT_HMD:
+            return openvr.TrackedDeviceClass_HMD
+        return openvr.TrackedDeviceClass_Controller
+        
+    def getControllerRoleForTrackedDeviceIndex(self, index: int) -> int:
+        indices = list(self._current['indices'])
+        if index not in indices:
+            return openvr.TrackedControllerRole_Invalid
+        return int(self._current['roles'][indices.index(index)])
+        
+    def getFloatTrackedDeviceProperty(self, index: int, prop: int) -> float:
+        if prop == openvr.Prop_DisplayFrequency_Float:
+            return self.frame_rate
+        return 0.0
+        
+    def getTimeSinceLastVsync(self):
+        return False, 0.0, 0
+        
+    # --- Replay driver ---
+    
+    def _skip_idle_frames(self):
+        """Jump to the next recorded device change after an iteration without a pose fetch"""
+        current = self._current
+        start = self.frame + 1
+        changed = np.flatnonzero((self.trace['indices'][start:] != current['indices']).any(axis=1) |
+                                 (self.trace['roles'][start:] != current['roles']).any(axis=1))
+        if len(changed) == 0:
+            remaining = len(self.trace) - start
+            self.skipped += remaining
+            self.frame = len(self.trace) - 1
+            self.stalled = (f"Replay stopped: no poses requested for the last {remaining} frames; "
+                            f"the recorded devices do not meet the tracker settings")
+            self.tracker.running = False
+            return
+            
+        target = start + int(changed[0])
+        self.skipped += target - start
+        self.frame = target - 1
+        self._current = self.trace[target]
+        self._pending_topology_event = True
+        
+    def clock(self) -> float:
+        """Timestamp of the frame being replayed"""
+        return float(self._current['timestamp'])
+        
+    def run(self, tracker) -> Dict:
+        """
+        Run the tracker's full pipeline over the trace in the calling thread
+        
+        Args:
+            tracker: TrackerLogic instance (its configured outputs are written)
+            
+        Returns:
+            Dictionary with replay throughput
+        """
+        saved = (tracker.vr_system, tracker.clock,
+                 tracker.config_variables.get('pacing'), tracker.config_variables.get('target_hz'))
+                 
+        self.tracker = tracker
+        self.frame = -1
+        self._current = self.trace[0]
+        self._pending_topology_event = True
+        self._fetched = True
+        self.skipped = 0
+        self.stalled = None
+        
+        tracker.vr_system = self
+        tracker.clock = self.clock
+        if self.realtime:
+            tracker.config_variables['pacing'] = 'fixed'
+            tracker.config_variables['target_hz'] = self.frame_rate
+        else:
+            tracker.config_variables['pacing'] = 'none'
+            
+        start = time.perf_counter()
+        try:
+            tracker.running = True
+            tracker._tracking_loop()
+        finally:
+            elapsed = time.perf_counter() - start
+            tracker.running = False
+            tracker.vr_system, tracker.clock = saved[0], saved[1]
+            tracker.config_variables['pacing'] = saved[2]
+            tracker.config_variables['target_hz'] = saved[3]
+            self.tracker = None
+            
+        if self.stalled:
+            tracker.update_status(self.stalled, "error")
+        frames = self.frame + 1 - self.skipped
+        return {
+            'frames': frames,
+            'skipped_frames': self.skipped,
+            'stalled': self.stalled is not None,
+            'elapsed_s': elapsed,
+            'frames_per_second': frames / elapsed if elapsed > 0 else 0.0,
+            'avg_frame_time_ms': (elapsed / frames) * 1000 if frames else 0.0,
+            'recorded_rate_hz': self.frame_rate
+        }
@@ -0,0 +1,123 @@
+"""
+Per-stage timing for the tracking loop
+Records perf_counter_ns durations into preallocated ring buffers and
+summarizes them as percentiles and histograms
+"""
+
+import csv
+import json
+import threading
+from array import array
+import numpy as np
+from typing import Dict, Sequence, Tuple
+
+
+# Stages timed by the tracking loop
+STAGES = ('fetch', 'math', 'smoothing', 'gesture', 'output', 'frame')
+STAGE_FETCH, STAGE_MATH, STAGE_SMOOTHING, STAGE_GESTURE, STAGE_OUTPUT, STAGE_FRAME = range(len(STAGES))
+
+PERCENTILES = (50, 95, 99)
+
+
+class StageProfiler:
+    """
+    Ring buffers of stage durations
+    
+    add() is the only call on the hot path: one store into a preallocated
+    array.array (cheaper per item than a NumPy store) and a counter update,
+    no allocation. Summaries are computed from a copy of the
+    buffers, so they can be read from another thread while the loop runs;
+    a sample being overwritten during the copy only shifts the window.
+    """
+    
+    def __init__(self, capacity: int = 4096, stages: Sequence[str] = STAGES):
+        """
+        Args:
+            capacity: Samples kept per stage (the most recent ones)
+            stages: Stage names; add() takes the index into this sequence
+        """
+        self.stages = tuple(stages)
+        self.capacity = max(1, int(capacity))
+        self.buffers = [array('q', bytes(8 * self.capacity)) for _ in self.stages]
+        self._views = [np.frombuffer(buffer, dtype=np.int64) for buffer in self.buffers]
+        self.counts = [0] * len(self.stages)
+        self._lock = threading.Lock()  # Serializes readers only
+        
+    def add(self, stage: int, elapsed_ns: int):
+        """Record one duration in nanoseconds for a stage index"""
+        count = self.counts[stage]
+        self.buffers[stage][count % self.capacity] = elapsed_ns
+        self.counts[stage] = count + 1
+        
+    def reset(self):
+        """Discard all samples"""
+        self.counts = [0] * len(self.stages)
+        
+    def get_samples(self, stage: int) -> np.ndarray:
+        """Copy of the samples in the window for a stage index (nanoseconds, unordered)"""
+        count = min(self.counts[stage], self.capacity)
+        return self._views[stage][:count].copy()
+        
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Summarize each stage over its window
+        
+        Returns:
+            Dictionary keyed by stage name with count (total samples seen),
+            mean_us, p50_us, p95_us, p99_us and max_us over the window
+        """
+        stats = {}
+        with self._lock:
+            for stage, name in enumerate(self.stages):
+                samples = self.get_samples(stage)
+                entry = {'count': self.counts[stage]}
+                if len(samples):
+                    p50, p95, p99 = np.percentile(samples, PERCENTILES) / 1000
+                    entry.update(mean_us=float(samples.mean()) / 1000,
+                                 p50_us=float(p50), p95_us=float(p95), p99_us=float(p99),
+                                 max_us=float(samples.max()) / 1000)
+                else:
+                    entry.update(mean_us=0.0, p50_us=0.0, p95_us=0.0, p99_us=0.0, max_us=0.0)
+                stats[name] = entry
+        return stats
+        
+    def histogram(self, stage: int, bins: int = 20) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Histogram of a stage's window
+        
+        Returns:
+            (counts, bin_edges_us); bins are log-spaced since durations are long-tailed
+        """
+        samples = self.get_samples(stage) / 1000
+        if not len(samples):
+            return np.zeros(bins, dtype=np.int64), np.zeros(bins + 1)
+        low = max(float(samples.min()), 0.01)
+        high = max(float(samples.max()), low * 1.01)
+        edges = np.geomspace(low, high, bins + 1)
+        counts, _ = np.histogram(np.clip(samples, low, high), bins=edges)
+        return counts, edges
+        
+    def dump(self, path: str, bins: int = 20):
+        """
+        Write the summary to a file
+        
+        Args:
+            path: .csv for one row of percentiles per stage, anything else
+                  for JSON with percentiles and histograms
+            bins: Histogram bins per stage (JSON only)
+        """
+        stats = self.get_stats()
+        if path.lower().endswith('.csv'):
+            fields = ('count', 'mean_us', 'p50_us', 'p95_us', 'p99_us', 'max_us')
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(('stage',) + fields)
+                for name, entry in stats.items():
+                    writer.writerow([name] + [entry[field] for field in fields])
+            return
+            
+        for stage, name in enumerate(self.stages):
+            counts, edges = self.histogram(stage, bins)
+            stats[name]['histogram'] = {'counts': counts.tolist(), 'edges_us': edges.tolist()}
+        with open(path, 'w') as f:
+            json.dump({'capacity': self.capacity, 'stages': stats}, f, indent=2)
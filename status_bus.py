@@ -0,0 +1,218 @@
+"""
+Rate-limited status pipeline
+Collapses repeated status messages, throttles bursts per level and moves
+log file I/O off the calling thread
+"""
+
+import time
+import queue
+import atexit
+import threading
+import logging
+import logging.handlers
+from typing import Any, Callable, Dict, List, Optional
+from status_events import StatusEvent
+
+
+# Throttle bucket used for each status level
+LEVEL_BUCKETS = {'debug': 'info', 'info': 'info', 'success': 'info', 'warning': 'warning', 'error': 'error'}
+
+
+def attach_queue_logging(logger: logging.Logger, handlers: List[logging.Handler]) -> logging.handlers.QueueListener:
+    """
+    Route a logger through a queue to handlers running on a listener thread
+    
+    The logging call only enqueues the record; formatting and file writes
+    happen on the QueueListener thread. Queue handlers attached by an
+    earlier call are replaced rather than duplicated.
+    
+    Args:
+        logger: Logger to attach to
+        handlers: Handlers (file, console) served by the listener thread
+        
+    Returns:
+        Started QueueListener (stopped automatically at exit)
+    """
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+            
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+    
+
+class StatusBus:
+    """
+    Deduplicates and throttles status messages before they reach a sink
+    
+    A message repeated within repeat_interval is suppressed and counted;
+    the next time it is let through (or on flush) it carries the count,
+    e.g. "Invalid pose data (repeated 89x)". Distinct messages are limited
+    per level bucket with a token bucket; dropped ones are reported as a
+    count with the next message of that bucket.
+    
+    Messages with an event are state changes and are never rate limited.
+    They are only collapsed while they repeat the last event emitted, so
+    start/stop/start or a controller swap and swap back always get through.
+    """
+    
+    def __init__(self, emit: Callable[[str, str, Optional[StatusEvent], Optional[Dict[str, Any]]], None],
+                 repeat_interval: float = 5.0,
+                 rates: Optional[Dict[str, float]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            emit: Called with (message, level, event, payload) for messages let through
+            repeat_interval: Seconds an identical message stays collapsed
+            rates: Messages per second per bucket ('info', 'warning', 'error'; 0 = unlimited)
+            clock: Monotonic time source
+        """
+        self.emit = emit
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._recent = {}  # (message, level, event, payload) -> [last emitted, suppressed count, event, payload]
+        self._last_event = None  # Key of the last event message emitted
+        self._buckets = {}  # bucket -> [tokens, last refill, dropped count]
+        self._next_flush = 0.0
+        self.rates = {}
+        self.repeat_interval = repeat_interval
+        self.configure(repeat_interval, rates)
+        
+        # Statistics
+        self.published = 0
+        self.emitted = 0
+        self.suppressed = 0
+        self.dropped = 0
+        
+    def configure(self, repeat_interval: Optional[float] = None, rates: Optional[Dict[str, float]] = None):
+        """Change the repeat interval and per-bucket rates"""
+        with self._lock:
+            if repeat_interval is not None:
+                self.repeat_interval = max(0.0, repeat_interval)
+            if rates is not None:
+                self.rates = dict(rates)
+                self._buckets = {}
+                
+    def publish(self, message: str, level: str = "info",
+                event: Optional[StatusEvent] = None, payload: Optional[Dict[str, Any]] = None):
+        """
+        Offer a status message; it is emitted, collapsed or dropped
+        
+        Args:
+            message: Status text (repeats are detected on message, level, event and payload)
+            level: info, success, warning, error or debug
+            event: Optional typed event for the receiver's state
+            payload: Optional event details, e.g. a controller index
+        """
+        pending = []
+        with self._lock:
+            self.published += 1
+            now = self.clock()
+            key = self._key(message, level, event, payload)
+            if now >= self._next_flush:
+                # Report counts of messages that stopped repeating
+                self._collect_expired(now, pending, skip=key)
+                self._next_flush = now + self.repeat_interval
+                
+            entry = self._recent.get(key)
+            repeating = entry is not None and now - entry[0] < self.repeat_interval
+            if event is not None and key != self._last_event:
+                repeating = False  # State changed since this event was last sent
+            if repeating:
+                entry[1] += 1
+                self.suppressed += 1
+            else:
+                repeats = entry[1] if entry is not None else 0
+                bucket_name = LEVEL_BUCKETS.get(level, 'info')
+                if event is not None:
+                    allowed, dropped = True, 0
+                    self._close_last_event(pending)
+                    self._last_event = key
+                else:
+                    allowed, dropped = self._take_token(bucket_name, now)
+                if allowed:
+                    self._recent[key] = [now, 0, event, payload]
+                    if dropped:
+                        pending.append((f"{dropped} {bucket_name} messages dropped (rate limit)", "warning"))
+                    pending.append((self._with_count(message, repeats), level, event, payload))
+                else:
+                    self.dropped += 1
+                    
+        for item in pending:
+            self._emit(*item)
+            
+    def flush(self):
+        """Emit pending repeat counts, e.g. before shutdown"""
+        pending = []
+        with self._lock:
+            self._collect_expired(None, pending)
+            for bucket_name, bucket in self._buckets.items():
+                if bucket[2]:
+                    pending.append((f"{bucket[2]} {bucket_name} messages dropped (rate limit)", "warning"))
+                    bucket[2] = 0
+        for item in pending:
+            self._emit(*item)
+            
+    def get_stats(self) -> Dict:
+        """Get counts of published, emitted, collapsed and dropped messages"""
+        return {
+            'published': self.published,
+            'emitted': self.emitted,
+            'suppressed': self.suppressed,
+            'dropped': self.dropped
+        }
+        
+    def _emit(self, message: str, level: str, event: Optional[StatusEvent] = None,
+              payload: Optional[Dict[str, Any]] = None):
+        self.emitted += 1
+        self.emit(message, level, event, payload)
+        
+    @staticmethod
+    def _key(message: str, level: str, event: Optional[StatusEvent], payload: Optional[Dict[str, Any]]) -> tuple:
+        """Repeat key; the payload is frozen so it can be hashed"""
+        return message, level, event, tuple(sorted(payload.items())) if payload else None
+        
+    @staticmethod
+    def _with_count(message: str, repeats: int) -> str:
+        return f"{message} (repeated {repeats}x)" if repeats else message
+        
+    def _collect_expired(self, now: Optional[float], pending: list, skip: Optional[tuple] = None):
+        """Move repeat counts of expired entries to pending and forget them (all if now is None)"""
+        for key, (last, repeats, event, payload) in list(self._recent.items()):
+            if key == skip:
+                continue
+            if now is None or now - last >= self.repeat_interval:
+                if repeats:
+                    if key != self._last_event:
+                        event = payload = None  # State has moved on; report the count only
+                    pending.append((self._with_count(key[0], repeats), key[1], event, payload))
+                del self._recent[key]
+                
+    def _close_last_event(self, pending: list):
+        """Report the repeat count of the previous event before the state changes"""
+        entry = self._recent.get(self._last_event)
+        if entry is not None and entry[1]:
+            pending.append((self._with_count(self._last_event[0], entry[1]), self._last_event[1], entry[2], entry[3]))
+            entry[1] = 0
+            
+    def _take_token(self, bucket_name: str, now: float):
+        """Token bucket check; returns (allowed, messages dropped since the last allowed one)"""
+        rate = self.rates.get(bucket_name, 0)
+        if rate <= 0:
+            return True, 0
+        bucket = self._buckets.get(bucket_name)
+        if bucket is None:
+            bucket = self._buckets[bucket_name] = [rate, now, 0]
+        else:
+            bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] < 1.0:
+            bucket[2] += 1
+            return False, 0
+        bucket[0] -= 1.0
+        dropped, bucket[2] = bucket[2], 0
+        return True, dropped
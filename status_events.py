@@ -0,0 +1,26 @@
+"""
+Typed status events sent with tracker status messages
+Lets the GUI update its state from the event instead of parsing message text
+"""
+
+from enum import Enum, auto
+
+
+class StatusEvent(Enum):
+    """State changes reported through the status callback (payload keys in comments)"""
+    CONFIG_LOADED = auto()
+    CONFIG_DEFAULTS = auto()
+    VR_INITIALIZED = auto()          # backend
+    VR_INIT_FAILED = auto()
+    VR_SHUTDOWN = auto()
+    TRACKING_STARTED = auto()
+    TRACKING_ACTIVE = auto()
+    TRACKING_STOPPED = auto()
+    HMD_NOT_CONNECTED = auto()
+    CONTROLLER_FOUND = auto()        # index, hand
+    CONTROLLERS_CONNECTED = auto()   # left, right
+    CONTROLLER_NOT_FOUND = auto()    # hand (None if no controller at all)
+    MMAP_ACTIVE = auto()
+    MMAP_FALLBACK = auto()
+    MMAP_FAILED = auto()
+    INI_MODE = auto()
@@ -0,0 +1,84 @@
+"""
+Live telemetry snapshots for the GUI
+The tracking thread publishes an immutable snapshot a few times per second;
+readers pick up the latest one without locks or per-frame messages
+"""
+
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+# Inertia values carried in a snapshot, in order
+TELEMETRY_VALUES = ('x', 'y', 'z', 'xr', 'yr', 'zr')
+
+
+class TelemetrySnapshot:
+    """One published view of the tracking state; never modified after creation"""
+    
+    __slots__ = ('timestamp', 'frames', 'frame_rate', 'raw', 'smoothed', 'gestures')
+    
+    def __init__(self, timestamp: float, frames: int, frame_rate: float,
+                 raw: Tuple[float, ...], smoothed: Tuple[float, ...],
+                 gestures: Dict[str, Dict]):
+        """
+        Args:
+            timestamp: Frame timestamp of the snapshot
+            frames: Frames processed since tracking started
+            frame_rate: Processed frames per second since the previous snapshot
+            raw: Inertia values before smoothing (TELEMETRY_VALUES order)
+            smoothed: Inertia values sent to the game (TELEMETRY_VALUES order)
+            gestures: GestureRecognizer.get_zone_status() per zone id
+        """
+        self.timestamp = timestamp
+        self.frames = frames
+        self.frame_rate = frame_rate
+        self.raw = raw
+        self.smoothed = smoothed
+        self.gestures = gestures
+        
+
+class TelemetryPublisher:
+    """
+    Rate-limited publisher of TelemetrySnapshot objects
+    
+    The tracking thread calls frame() once per processed frame (a counter
+    and a clock read) and publish() only when it returns True. Publishing
+    replaces the latest reference in one assignment, which is atomic in
+    CPython, so readers on other threads need no lock.
+    """
+    
+    def __init__(self, rate: float = 20.0, clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            rate: Snapshots per second
+            clock: Monotonic time source for pacing and the frame rate
+        """
+        self.clock = clock
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.latest: Optional[TelemetrySnapshot] = None
+        self.reset()
+        
+    def reset(self):
+        """Start counting from zero and drop the last snapshot"""
+        self.frames = 0
+        self.latest = None
+        self._window_start = self.clock()
+        self._next_publish = self._window_start + self.interval
+        self._window_frames = 0
+        
+    def frame(self) -> bool:
+        """Count a processed frame; returns True when a snapshot is due"""
+        self.frames += 1
+        return self.clock() >= self._next_publish
+        
+    def publish(self, timestamp: float, raw: Tuple[float, ...], smoothed: Tuple[float, ...],
+                gestures: Optional[Dict[str, Dict]] = None):
+        """Build and publish a snapshot (see TelemetrySnapshot for the arguments)"""
+        now = self.clock()
+        elapsed = now - self._window_start
+        frame_rate = (self.frames - self._window_frames) / elapsed if elapsed > 0 else 0.0
+        self._window_start = now
+        self._window_frames = self.frames
+        self._next_publish = now + self.interval
+        
+        self.latest = TelemetrySnapshot(timestamp, self.frames, frame_rate, raw, smoothed, gestures or {})
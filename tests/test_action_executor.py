@@ -0,0 +1,75 @@
+"""ActionExecutor timing checked through a RecordingKeyboard instead of real key presses"""
+
+import time
+from action_executor import ActionExecutor, RecordingKeyboard
+
+# Allowed lateness of a release; the wheel ticks every 5 ms, the rest is scheduler slack
+SLACK = 0.05
+
+
+def wait_for(condition, timeout: float = 2.0):
+    """Poll until condition() is true or the timeout expires"""
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.001)
+    return True
+    
+
+def test_press_key_returns_immediately():
+    keyboard = RecordingKeyboard()
+    executor = ActionExecutor(keyboard)
+    try:
+        start = time.perf_counter()
+        executor.press_key('g', 0.2)
+        assert time.perf_counter() - start < 0.01
+        assert wait_for(lambda: len(keyboard.events) == 2)
+    finally:
+        executor.close()
+        
+
+def test_release_arrives_after_the_hold_time():
+    keyboard = RecordingKeyboard()
+    executor = ActionExecutor(keyboard)
+    try:
+        executor.press_key('g', 0.1)
+        assert wait_for(lambda: len(keyboard.events) == 2)
+        assert [(action, key) for _, action, key in keyboard.events] == [('press', 'g'), ('release', 'g')]
+        (hold,) = keyboard.hold_durations('g')
+        assert 0.1 - executor.tick <= hold <= 0.1 + SLACK
+        assert executor.held_keys == {}
+    finally:
+        executor.close()
+        
+
+def test_overlapping_holds_release_once():
+    keyboard = RecordingKeyboard()
+    executor = ActionExecutor(keyboard)
+    try:
+        start = time.monotonic()
+        executor.press_key('a', 0.1)
+        time.sleep(0.03)
+        executor.press_key('a', 0.1)
+        assert wait_for(lambda: not executor.held_keys and executor.get_stats()['pending'] == 0)
+        
+        actions = [action for _, action, key in keyboard.events if key == 'a']
+        assert actions == ['press', 'release']
+        # The key stays down until the second hold ends
+        release_time = keyboard.events[-1][0] - start
+        assert 0.13 - executor.tick <= release_time <= 0.13 + SLACK
+    finally:
+        executor.close()
+        
+
+def test_close_releases_held_keys():
+    keyboard = RecordingKeyboard()
+    executor = ActionExecutor(keyboard)
+    executor.press_key('k', 5.0)
+    assert wait_for(lambda: executor.held_keys == {'k': 1})
+    
+    executor.close()
+    assert keyboard.events[-1][1:] == ('release', 'k')
+    assert executor.held_keys == {}
+    assert executor.get_stats()['pending'] == 0
+    
\ No newline at end of file
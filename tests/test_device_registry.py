@@ -0,0 +1,149 @@
+"""DeviceRegistry against a scripted IVRSystem that emits device events"""
+
+import openvr
+from device_registry import DeviceRegistry
+
+LEFT = openvr.TrackedControllerRole_LeftHand
+RIGHT = openvr.TrackedControllerRole_RightHand
+
+
+class ScriptedVRSystem:
+    """
+    Fake IVRSystem with a scripted device table and event queue
+    
+    connect/disconnect/set_role change the table and queue the matching
+    OpenVR event; the *_silently variants change it without an event.
+    Driver queries are counted so tests can tell whether a scan ran.
+    """
+    
+    def __init__(self):
+        self.devices = {openvr.k_unTrackedDeviceIndex_Hmd: (openvr.TrackedDeviceClass_HMD, None)}
+        self.events = []
+        self.queries = 0
+        
+    def connect(self, index: int, role: int):
+        self.devices[index] = (openvr.TrackedDeviceClass_Controller, role)
+        self.events.append((openvr.VREvent_TrackedDeviceActivated, index))
+        
+    def disconnect(self, index: int):
+        del self.devices[index]
+        self.events.append((openvr.VREvent_TrackedDeviceDeactivated, index))
+        
+    def set_role(self, index: int, role: int):
+        self.devices[index] = (openvr.TrackedDeviceClass_Controller, role)
+        self.events.append((openvr.VREvent_TrackedDeviceRoleChanged, index))
+        
+    def connect_silently(self, index: int, role: int):
+        self.devices[index] = (openvr.TrackedDeviceClass_Controller, role)
+        
+    # --- IVRSystem subset used by DeviceRegistry ---
+    
+    def pollNextEvent(self, event) -> bool:
+        if not self.events:
+            return False
+        event.eventType, event.trackedDeviceIndex = self.events.pop(0)
+        return True
+        
+    def getTrackedDeviceClass(self, index: int) -> int:
+        self.queries += 1
+        return self.devices.get(index, (openvr.TrackedDeviceClass_Invalid, None))[0]
+        
+    def isTrackedDeviceConnected(self, index: int) -> bool:
+        self.queries += 1
+        return index in self.devices
+        
+    def getControllerRoleForTrackedDeviceIndex(self, index: int) -> int:
+        self.queries += 1
+        return self.devices[index][1]
+        
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        
+    def __call__(self) -> float:
+        return self.now
+        
+
+def make_registry(refresh_interval: float = 2.0):
+    system = ScriptedVRSystem()
+    system.connect(1, LEFT)
+    system.connect(2, RIGHT)
+    clock = FakeClock()
+    registry = DeviceRegistry(system, refresh_interval=refresh_interval, clock=clock)
+    assert registry.poll()  # First poll always scans
+    return system, clock, registry
+    
+
+def test_initial_scan():
+    _, _, registry = make_registry()
+    assert registry.hmd_connected
+    assert registry.controllers == [1, 2]
+    assert (registry.left_index, registry.right_index) == (1, 2)
+    assert registry.roles == {1: 'left', 2: 'right'}
+    assert registry.scan_count == 1
+    
+
+def test_no_rescan_without_events_until_the_timer_expires():
+    system, clock, registry = make_registry(refresh_interval=2.0)
+    system.connect_silently(3, RIGHT)
+    queries = system.queries
+    
+    for _ in range(19):
+        clock.now += 0.1
+        assert not registry.poll()
+    assert system.queries == queries  # Cached: no driver calls between scans
+    assert registry.scan_count == 1
+    assert registry.controllers == [1, 2]
+    
+    # The safety-net timer picks up the change made without an event
+    clock.now += 0.1
+    assert registry.poll()
+    assert registry.scan_count == 2
+    assert registry.controllers == [1, 2, 3]
+    
+
+def test_non_topology_events_do_not_rescan():
+    system, clock, registry = make_registry()
+    system.events.append((openvr.VREvent_ButtonPress, 1))
+    assert not registry.poll()
+    assert registry.scan_count == 1
+    
+
+def test_activate_event_adds_controller():
+    system, clock, registry = make_registry()
+    system.disconnect(1)
+    registry.poll()
+    assert registry.left_index is None
+    
+    system.connect(4, LEFT)
+    assert registry.poll()
+    assert registry.controllers == [2, 4]
+    assert (registry.left_index, registry.right_index) == (4, 2)
+    
+
+def test_deactivate_event_removes_controller():
+    system, clock, registry = make_registry()
+    system.disconnect(2)
+    assert registry.poll()
+    assert registry.controllers == [1]
+    assert registry.right_index is None
+    assert registry.left_index == 1
+    
+
+def test_role_change_event_swaps_hands():
+    system, clock, registry = make_registry()
+    system.set_role(1, RIGHT)
+    system.set_role(2, LEFT)
+    assert registry.poll()
+    assert registry.scan_count == 2  # Both events drained into one rescan
+    assert (registry.left_index, registry.right_index) == (2, 1)
+    assert registry.roles == {1: 'right', 2: 'left'}
+    
+
+def test_invalidate_forces_a_rescan():
+    system, clock, registry = make_registry()
+    registry.invalidate()
+    assert registry.poll()
+    assert registry.scan_count == 2
+    
\ No newline at end of file
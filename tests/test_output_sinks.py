@@ -0,0 +1,43 @@
+"""UdpSink frames decoded by a local UdpListener standing in for the consumer"""
+
+import struct
+from output_sinks import UdpSink, UdpListener
+
+
+def test_udp_round_trip():
+    """Every written frame arrives in order with its frame id, timestamp and 7 floats"""
+    listener = UdpListener(port=0, timeout=1.0)
+    sink = UdpSink(port=listener.port)
+    frames = [(1.0, 0.1 * i, -0.2 * i, 3.0, -40.5, 75.25 + i, -7.5) for i in range(50)]
+    try:
+        for i, values in enumerate(frames):
+            assert sink.write(values, 100.0 + i)
+            
+        for i, values in enumerate(frames):
+            frame = listener.receive()
+            assert frame is not None, f"frame {i + 1} not received"
+            frame_id, timestamp, received = frame
+            assert frame_id == i + 1
+            assert timestamp == 100.0 + i
+            # Values travel as float32
+            assert received == struct.unpack('<7f', struct.pack('<7f', *values))
+    finally:
+        sink.close()
+        listener.close()
+        
+    assert sink.get_stats()['failures'] == 0
+    
+
+def test_listener_ignores_foreign_datagrams():
+    """Datagrams of the wrong size or magic are not decoded as frames"""
+    listener = UdpListener(port=0, timeout=1.0)
+    sink = UdpSink(port=listener.port)
+    try:
+        sink.socket.sendto(b'not a frame', ('127.0.0.1', listener.port))
+        assert listener.receive() is None
+        sink.socket.sendto(bytes(len(sink.buffer)), ('127.0.0.1', listener.port))
+        assert listener.receive() is None
+    finally:
+        sink.close()
+        listener.close()
+        
\ No newline at end of file
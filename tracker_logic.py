@@ -2,8 +2,6 @@ import math
 import keyboard
 import openvr
 import time
-import ctypes
-import numpy as np
 import configparser
 import os
 import threading
@@ -11,23 +9,56 @@ import logging
 from datetime import datetime
 from mmap_communication import MMAPCommunicator
 from data_smoothing import TrackingSmoother
-from gesture_recognition import GestureRecognizer
+from gesture_recognition import GestureRecognizer, load_gesture_definitions
+from motion_gestures import MotionGestureRecognizer, load_motion_gestures
+from pose_math import PoseKernel, quaternion_to_euler
+from pose_acquisition import PoseBuffer
+from device_registry import DeviceRegistry
+from frame_scheduler import FrameScheduler
+from pose_prediction import PosePredictor
+from pose_trace import PoseTraceRecorder
+from vr_backend import create_backend
+from output_transform import OutputTransform
+from ini_writer import IniTemplate
+from output_sinks import MMAPSink, IniSink, UdpSink, FanOutSink, FallbackSink
+from stage_profiler import (StageProfiler, STAGE_FETCH, STAGE_MATH, STAGE_SMOOTHING,
+                            STAGE_GESTURE, STAGE_OUTPUT, STAGE_FRAME)
+from status_bus import StatusBus, attach_queue_logging
+from status_events import StatusEvent
+from telemetry import TelemetryPublisher
+from action_executor import ActionExecutor
 
 
 class TrackerLogic:
     """VR tracking logic separated from GUI"""
     
-    def __init__(self, status_callback=None):
+    def __init__(self, status_callback=None, backend=None):
+        self.backend = backend  # VRBackend; created from config in init_vr() when None
         self.vr_system = None
         self.config_variables = {}
         self.status_callback = status_callback
         self.running = False
         self.tracking_thread = None
         self.mmap_comm = None
-        self.use_mmap = False
+        self.ini_template = IniTemplate()
+        self.ini_sink = None
+        self.output_sink = None  # OutputSink built by setup_communication()
         self.smoother = None
+        self.pose_predictor = None
         self.gesture_recognizer = None
+        self.motion_recognizer = None
+        self.pose_buffer = PoseBuffer(openvr.k_unMaxTrackedDeviceCount)
+        self.pose_kernel = PoseKernel(openvr.k_unMaxTrackedDeviceCount)
+        self.device_registry = None
+        self.frame_scheduler = None
+        self.trace_recorder = None
+        # Frame timestamp source (replaced during trace replay); time.time can tick
+        # only every 15.6 ms on Windows, which would give filters dt == 0 frames
+        self.clock = time.perf_counter
+        self.frame_time = 0.0
         self.last_player_rotation = (0, 0, 0)  # Store for gesture callbacks
+        self.action_executor = None  # Runs gesture key presses off the tracking thread
+        self.output_hold = None  # (until frame_time, output args) written instead of live poses
         
         # Dual controller support
         self.left_controller_index = None
@@ -40,15 +71,31 @@ class TrackerLogic:
         
         # Load configuration
         self.load_config()
+        self.setup_status_bus()
+        
+        # Compile output scaling
+        self.output_transform = None
+        self.setup_output_transform()
         
         # Setup communication method
         self.setup_communication()
         
+        # Per-stage timing of the tracking loop
+        self.stage_profiler = StageProfiler(self.config_variables.get('profiler_capacity', 4096))
+        
+        # Live snapshots for the GUI telemetry panel
+        self.telemetry = TelemetryPublisher(self.config_variables.get('telemetry_rate', 20.0))
+        
+        # Setup pose prediction
+        self.setup_prediction()
+        
         # Setup data smoothing
         self.setup_smoothing()
         
         # Setup gesture recognition
+        self.action_executor = ActionExecutor(keyboard, logger=self.logger)
         self.setup_gesture_recognition()
+        self.setup_motion_gestures()
         
         # Apply dual hand settings
         self.dual_hand_mode = self.config_variables.get('dual_hand_enabled', False)
@@ -72,15 +119,21 @@ class TrackerLogic:
         file_handler = logging.FileHandler(log_path, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(logging.Formatter(log_format, date_format))
-        self.logger.addHandler(file_handler)
+        handlers = [file_handler]
         
         # Console handler - only if no GUI callback
         if not self.status_callback:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.INFO)
             console_handler.setFormatter(logging.Formatter(log_format, date_format))
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
             
+        # Handlers run on a listener thread; logging calls only enqueue records
+        self.log_listener = attach_queue_logging(self.logger, handlers)
+        
+        # Repeated and bursty status messages are collapsed before logging
+        self.status_bus = StatusBus(self._emit_status)
+        
         self.logger.info("FNVR Tracker started")
         
     def load_config(self):
@@ -91,7 +144,7 @@ class TrackerLogic:
             config_path = os.path.join(script_dir, 'config.ini')
             
             if not os.path.exists(config_path):
-                self.update_status("Config file not found, using defaults", "warning")
+                self.update_status("Config file not found, using defaults", "warning", StatusEvent.CONFIG_DEFAULTS)
                 # Set default values
                 self.set_default_config()
                 return False
@@ -135,12 +188,49 @@ class TrackerLogic:
                 'pause_z': config.getfloat('pause_menu_gesture', 'pause_z'),
                 'pause_threshold': config.getfloat('pause_menu_gesture', 'pause_threshold'),
                 'loop_delay': config.getfloat('timing', 'loop_delay'),
+                'target_hz': config.getfloat('timing', 'target_hz', fallback=0),
+                'pacing': config.get('timing', 'pacing', fallback='fixed').lower(),
+                'spin_threshold': config.getfloat('timing', 'spin_threshold', fallback=0.001),
                 'tab_press_duration': config.getfloat('timing', 'tab_press_duration'),
                 'escape_press_duration': config.getfloat('timing', 'escape_press_duration'),
+                'device_refresh_interval': config.getfloat('timing', 'device_refresh_interval', fallback=2.0),
+                # VR backend
+                'vr_backend': config.get('vr_backend', 'backend', fallback='openvr').lower(),
+                'synthetic_controllers': config.getint('vr_backend', 'synthetic_controllers', fallback=2),
+                'synthetic_trackers': config.getint('vr_backend', 'synthetic_trackers', fallback=0),
+                'synthetic_frame_rate': config.getfloat('vr_backend', 'synthetic_frame_rate', fallback=90.0),
+                'synthetic_dropout_rate': config.getfloat('vr_backend', 'synthetic_dropout_rate', fallback=0.0),
+                'synthetic_dropout_frames': config.getint('vr_backend', 'synthetic_dropout_frames', fallback=10),
+                'synthetic_role_swap_interval': config.getfloat('vr_backend', 'synthetic_role_swap_interval', fallback=0.0),
+                'synthetic_seed': config.getint('vr_backend', 'synthetic_seed', fallback=0),
+                # Pose trace recording
+                'record_trace': config.getboolean('recording', 'enabled', fallback=False),
+                'trace_path': config.get('recording', 'trace_path', fallback='pose_trace.npy'),
+                'trace_max_frames': config.getint('recording', 'max_frames', fallback=54000),
                 # Communication settings
                 'comm_method': config.get('communication', 'method', fallback='ini'),
                 'mmap_file_path': config.get('communication', 'mmap_file_path', fallback=''),
                 'fallback_to_ini': config.getboolean('communication', 'fallback_to_ini', fallback=True),
+                'mmap_layout_version': config.getint('communication', 'mmap_layout_version', fallback=1),
+                'ini_async': config.getboolean('communication', 'ini_async', fallback=True),
+                'ini_max_rate': config.getfloat('communication', 'ini_max_rate', fallback=90.0),
+                'ini_write_mode': config.get('communication', 'ini_write_mode', fallback='replace').lower(),
+                'mmap_backend': config.get('communication', 'mmap_backend', fallback='file').lower(),
+                'shared_memory_name': config.get('communication', 'shared_memory_name', fallback='fnvr_tracking'),
+                'mmap_sync': config.get('communication', 'mmap_sync', fallback='shutdown').lower(),
+                'mmap_sync_interval': config.getfloat('communication', 'mmap_sync_interval', fallback=1.0),
+                'udp_enabled': config.getboolean('communication', 'udp_enabled', fallback=False),
+                'udp_host': config.get('communication', 'udp_host', fallback='127.0.0.1'),
+                'udp_port': config.getint('communication', 'udp_port', fallback=47800),
+                # Status messages
+                'status_repeat_interval': config.getfloat('status', 'repeat_interval', fallback=5.0),
+                'status_info_rate': config.getfloat('status', 'info_rate', fallback=10.0),
+                'status_warning_rate': config.getfloat('status', 'warning_rate', fallback=5.0),
+                'status_error_rate': config.getfloat('status', 'error_rate', fallback=5.0),
+                # Stage timing
+                'profiler_capacity': config.getint('instrumentation', 'buffer_size', fallback=4096),
+                'profiler_dump_path': config.get('instrumentation', 'dump_path', fallback=''),
+                'telemetry_rate': config.getfloat('instrumentation', 'telemetry_rate', fallback=20.0),
                 # Smoothing settings
                 'smoothing_enabled': config.getboolean('smoothing', 'enabled', fallback=True),
                 'smoothing_filter': config.get('smoothing', 'filter', fallback='one_euro'),
@@ -148,12 +238,34 @@ class TrackerLogic:
                 'position_beta': config.getfloat('smoothing', 'position_beta', fallback=0.007),
                 'position_alpha': config.getfloat('smoothing', 'position_alpha', fallback=0.3),
                 'position_window_size': config.getint('smoothing', 'position_window_size', fallback=5),
+                'rotation_filter': config.get('smoothing', 'rotation_filter', fallback='time_constant'),
+                'rotation_time_constant': config.getfloat('smoothing', 'rotation_time_constant', fallback=0.016),
+                'rotation_min_cutoff': config.getfloat('smoothing', 'rotation_min_cutoff', fallback=1.0),
+                'rotation_beta': config.getfloat('smoothing', 'rotation_beta', fallback=10.0),
+                'rotation_d_cutoff': config.getfloat('smoothing', 'rotation_d_cutoff', fallback=1.0),
                 'rotation_alpha': config.getfloat('smoothing', 'rotation_alpha', fallback=0.5),
+                # Prediction settings
+                'prediction_enabled': config.getboolean('prediction', 'enabled', fallback=False),
+                'prediction_mode': config.get('prediction', 'mode', fallback='velocity').lower(),
+                'prediction_lookahead': config.getfloat('prediction', 'lookahead', fallback=0.02),
                 # Gesture recognition settings
                 'gesture_recognition_enabled': config.getboolean('gesture_recognition', 'enabled', fallback=True),
                 'gesture_dwell_time': config.getfloat('gesture_recognition', 'dwell_time', fallback=0.5),
                 'gesture_cooldown': config.getfloat('gesture_recognition', 'cooldown', fallback=1.0),
                 'gesture_max_velocity': config.getfloat('gesture_recognition', 'max_velocity', fallback=0.5),
+                'gesture_velocity_window': config.getint('gesture_recognition', 'velocity_window', fallback=10),
+                'gesture_velocity_method': config.get('gesture_recognition', 'velocity_method', fallback='mean'),
+                'gesture_definitions': load_gesture_definitions(config, self.logger),
+                # Motion gesture settings
+                'motion_gestures_enabled': config.getboolean('motion_gestures', 'enabled', fallback=False),
+                'motion_step': config.getfloat('motion_gestures', 'step', fallback=0.02),
+                'motion_threshold': config.getfloat('motion_gestures', 'threshold', fallback=0.06),
+                'motion_min_scale': config.getfloat('motion_gestures', 'min_scale', fallback=0.75),
+                'motion_max_scale': config.getfloat('motion_gestures', 'max_scale', fallback=1.35),
+                'motion_max_duration': config.getfloat('motion_gestures', 'max_duration', fallback=1.0),
+                'motion_settle_time': config.getfloat('motion_gestures', 'settle_time', fallback=0.08),
+                'motion_cooldown': config.getfloat('motion_gestures', 'cooldown', fallback=0.5),
+                'motion_gestures': load_motion_gestures(config, self.logger, script_dir),
                 # Dual hand settings
                 'dual_hand_enabled': config.getboolean('dual_hand', 'enabled', fallback=False),
                 'default_hand': config.get('dual_hand', 'default_hand', fallback='right'),
@@ -168,7 +280,7 @@ class TrackerLogic:
                 'two_handed_max_distance': config.getfloat('dual_hand', 'two_handed_max_distance', fallback=0.8)
             }
             
-            self.update_status("Configuration loaded", "info")
+            self.update_status("Configuration loaded", "info", StatusEvent.CONFIG_LOADED)
             return True
             
         except Exception as e:
@@ -198,39 +310,105 @@ class TrackerLogic:
             'pause_x': -0.3158, 'pause_y': -0.1897, 'pause_z': -0.1316,
             'pause_threshold': 0.1,
             'loop_delay': 0.025,
+            'target_hz': 90,
+            'pacing': 'fixed',
+            'spin_threshold': 0.001,
             'tab_press_duration': 0.05,
-            'escape_press_duration': 0.75
+            'escape_press_duration': 0.75,
+            'device_refresh_interval': 2.0
         }
         self.logger.info("Using default configuration values")
             
+    def setup_output_transform(self):
+        """Compile scale/offset values; call again after changing them in config_variables"""
+        if self.output_transform is None:
+            self.output_transform = OutputTransform(self.config_variables)
+        elif self.output_transform.update(self.config_variables):
+            self.logger.info("Output scaling updated")
+            
     def setup_communication(self):
-        """Setup communication method (MMAP or INI)"""
-        comm_method = self.config_variables.get('comm_method', 'ini').lower()
+        """Build the output sinks: MMAP or INI for the game, plus optional UDP"""
+        self.close_outputs()
+        cfg = self.config_variables
+        comm_method = cfg.get('comm_method', 'ini').lower()
+        
+        self.ini_sink = IniSink(cfg, self.update_status, self.logger, self.ini_template)
+        game_sink = self.ini_sink
         
         if comm_method == 'mmap':
-            mmap_path = self.config_variables.get('mmap_file_path', '')
+            mmap_backend = cfg.get('mmap_backend', 'file')
+            if mmap_backend == 'shared_memory':
+                mmap_path = cfg.get('shared_memory_name', 'fnvr_tracking')
+            else:
+                mmap_path = cfg.get('mmap_file_path', '')
+                
             if not mmap_path:
                 self.update_status("MMAP path not configured, using INI", "warning")
-                self.use_mmap = False
-                return
-                
-            # Create MMAP communicator
-            self.mmap_comm = MMAPCommunicator(mmap_path, self.logger)
-            if self.mmap_comm.initialize():
-                self.use_mmap = True
-                self.update_status("MMAP communication initialized", "success")
-                
-                # Run benchmark
-                self.run_performance_benchmark()
             else:
-                self.use_mmap = False
-                if self.config_variables.get('fallback_to_ini', True):
-                    self.update_status("MMAP failed, falling back to INI", "warning")
+                # Create MMAP communicator
+                self.mmap_comm = MMAPCommunicator(
+                    mmap_path, self.logger,
+                    layout_version=cfg.get('mmap_layout_version', 1),
+                    backend=mmap_backend,
+                    sync_mode=cfg.get('mmap_sync', 'shutdown'),
+                    sync_interval=cfg.get('mmap_sync_interval', 1.0)
+                )
+                if self.mmap_comm.initialize():
+                    game_sink = MMAPSink(self.mmap_comm)
+                    if cfg.get('fallback_to_ini', True):
+                        game_sink = FallbackSink(game_sink, self.ini_sink)
+                    self.update_status("MMAP communication initialized", "success", StatusEvent.MMAP_ACTIVE)
+                    
+                    # Run benchmark
+                    self.run_performance_benchmark()
                 else:
-                    self.update_status("MMAP failed, no fallback", "error")
+                    self.mmap_comm = None
+                    if cfg.get('fallback_to_ini', True):
+                        self.update_status("MMAP failed, falling back to INI", "warning", StatusEvent.MMAP_FALLBACK)
+                    else:
+                        self.update_status("MMAP failed, no fallback", "error", StatusEvent.MMAP_FAILED)
         else:
-            self.use_mmap = False
-            self.update_status("Using INI file communication", "info")
+            self.update_status("Using INI file communication", "info", StatusEvent.INI_MODE)
+            
+        sinks = [game_sink]
+        if cfg.get('udp_enabled', False):
+            host, port = cfg.get('udp_host', '127.0.0.1'), cfg.get('udp_port', 47800)
+            try:
+                sinks.append(UdpSink(host, port, self.logger))
+                self.update_status(f"UDP output to {host}:{port}", "info")
+            except OSError as e:
+                self.update_status(f"UDP output failed: {e}", "error")
+                
+        self.output_sink = sinks[0] if len(sinks) == 1 else FanOutSink(sinks)
+        
+    def close_outputs(self):
+        """Close all output sinks (syncs MMAP, finishes pending INI writes)"""
+        if self.output_sink is not None:
+            self.output_sink.close()
+        self.mmap_comm = None
+        # Later frames go to the INI, which reopens its writer on demand
+        self.output_sink = self.ini_sink
+        
+    def get_output_stats(self) -> dict:
+        """Per-sink write counts and latency counters"""
+        return self.output_sink.get_stats() if self.output_sink else {}
+        
+    def get_stage_stats(self) -> dict:
+        """Per-stage p50/p95/p99/max timings of the tracking loop in microseconds"""
+        return self.stage_profiler.get_stats()
+        
+    def dump_stage_stats(self, path=None):
+        """Write stage timings to a .csv or .json file (default: configured dump_path)"""
+        path = path or self.config_variables.get('profiler_dump_path', '')
+        if not path or not any(self.stage_profiler.counts):
+            return
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        try:
+            self.stage_profiler.dump(path)
+            self.logger.info(f"Stage timings written to: {path}")
+        except OSError as e:
+            self.logger.error(f"Could not write stage timings to {path}: {e}")
             
     def run_performance_benchmark(self):
         """Run a quick performance benchmark"""
@@ -253,35 +431,76 @@ class TrackerLogic:
         except Exception as e:
             self.logger.debug(f"Benchmark error: {e}")
             
-    def setup_smoothing(self):
-        """Setup data smoothing based on configuration"""
-        if self.config_variables.get('smoothing_enabled', True):
+    def setup_prediction(self):
+        """Setup motion-to-photon pose prediction based on configuration"""
+        if self.config_variables.get('prediction_enabled', False):
             try:
-                self.smoother = TrackingSmoother(self.config_variables, self.logger)
+                self.pose_predictor = PosePredictor(
+                    mode=self.config_variables.get('prediction_mode', 'velocity'),
+                    lookahead=self.config_variables.get('prediction_lookahead', 0.02),
+                    max_devices=openvr.k_unMaxTrackedDeviceCount,
+                    logger=self.logger
+                )
+                self.update_status(
+                    f"Pose prediction enabled ({self.pose_predictor.mode}, "
+                    f"{self.pose_predictor.lookahead * 1000:.0f}ms)",
+                    "info"
+                )
+            except Exception as e:
+                self.update_status(f"Prediction setup failed: {e}", "error")
+                self.logger.exception("Error setting up prediction")
+                self.pose_predictor = None
+        else:
+            self.pose_predictor = None
+            
+    def setup_smoothing(self):
+        """
+        Setup data smoothing based on configuration
+        
+        Once a smoother exists, later calls (e.g. from a GUI slider) only queue
+        the new parameters; the tracking loop applies them at its next frame
+        and filter state is kept, so the output does not jump.
+        """
+        enabled = self.config_variables.get('smoothing_enabled', True)
+        if self.smoother is not None:
+            was_enabled = self.smoother.enabled
+            self.smoother.update_params(self.config_variables)
+            if enabled != was_enabled:
+                self.update_status(f"Data smoothing {'enabled' if enabled else 'disabled'}", "info")
+            return
+            
+        try:
+            self.smoother = TrackingSmoother(self.config_variables, self.logger)
+            if enabled:
                 self.update_status("Data smoothing enabled", "info")
                 
                 # Log smoothing configuration
                 filter_type = self.config_variables.get('smoothing_filter', 'one_euro')
                 self.logger.info(f"Using {filter_type} smoothing filter")
-            except Exception as e:
-                self.update_status(f"Smoothing setup failed: {e}", "error")
-                self.logger.exception("Error setting up smoothing")
-                self.smoother = None
-        else:
+            else:
+                self.update_status("Data smoothing disabled", "info")
+        except Exception as e:
+            self.update_status(f"Smoothing setup failed: {e}", "error")
+            self.logger.exception("Error setting up smoothing")
             self.smoother = None
-            self.update_status("Data smoothing disabled", "info")
             
+    def gesture_action_handlers(self):
+        """Actions that gesture definitions can bind to"""
+        return {
+            'pipboy': self.on_pipboy_gesture,
+            'pause': self.on_pause_gesture,
+            'key': self.action_executor.press_key
+        }
+        
     def setup_gesture_recognition(self):
         """Setup advanced gesture recognition"""
         if self.config_variables.get('gesture_recognition_enabled', True):
             try:
-                self.gesture_recognizer = GestureRecognizer(self.config_variables, self.logger)
+                self.gesture_recognizer = GestureRecognizer(self.config_variables, self.logger,
+                                                            self.gesture_action_handlers())
                 
-                # Register gesture callbacks
-                self.gesture_recognizer.register_gesture_callback('pipboy', self.on_pipboy_gesture)
-                self.gesture_recognizer.register_gesture_callback('pause', self.on_pause_gesture)
-                
-                self.update_status("Advanced gesture recognition enabled", "info")
+                gesture_count = len(self.gesture_recognizer.definitions)
+                self.update_status(f"Advanced gesture recognition enabled ({gesture_count} gestures)", "info")
             except Exception as e:
                 self.update_status(f"Gesture recognition setup failed: {e}", "error")
                 self.logger.exception("Error setting up gesture recognition")
@@ -290,6 +509,22 @@ class TrackerLogic:
             self.gesture_recognizer = None
             self.update_status("Gesture recognition disabled", "info")
             
+    def setup_motion_gestures(self):
+        """Setup swipe and drawn-shape gestures matched against recorded templates"""
+        cfg = self.config_variables
+        self.motion_recognizer = None
+        if not cfg.get('motion_gestures_enabled', False):
+            return
+        if not cfg.get('motion_gestures'):
+            self.update_status("Motion gestures enabled but no [motion:<name>] sections found", "warning")
+            return
+        try:
+            self.motion_recognizer = MotionGestureRecognizer(cfg, self.logger, self.gesture_action_handlers())
+            self.update_status(f"Motion gestures enabled ({len(self.motion_recognizer.gestures)} gestures)", "info")
+        except Exception as e:
+            self.update_status(f"Motion gesture setup failed: {e}", "error")
+            self.logger.exception("Error setting up motion gestures")
+            
     def on_pipboy_gesture(self):
         """Callback for pipboy gesture"""
         cfg = self.config_variables
@@ -302,29 +537,48 @@ class TrackerLogic:
             playerZr, playerYr, -playerXr
         )
         
-        # Press Tab
-        keyboard.press('Tab')
-        time.sleep(cfg.get('tab_press_duration', 0.05))
-        keyboard.release('Tab')
-        
-        # Update again to ensure position is held
-        self.update_tracking_data(
+        # Press Tab without blocking the loop; hold the pipboy position until it is released
+        tab_duration = cfg.get('tab_press_duration', 0.05)
+        self.action_executor.press_key('Tab', tab_duration)
+        self.hold_output(tab_duration + self.action_executor.tick, (
             cfg.get('pipboy_x', -0.1615), cfg.get('pipboy_y', -0.5), cfg.get('pipboy_z', 0.1281),
             cfg.get('pipboy_xr', 0.0655), cfg.get('pipboy_yr', 0.041), cfg.get('pipboy_zr', 0.6291),
             playerZr, playerYr, -playerXr
-        )
+        ))
         
         self.update_status("Pipboy gesture triggered", "info")
         
     def on_pause_gesture(self):
         """Callback for pause menu gesture"""
-        keyboard.press('Escape')
-        time.sleep(self.config_variables.get('escape_press_duration', 0.75))
-        keyboard.release('Escape')
+        self.action_executor.press_key('Escape', self.config_variables.get('escape_press_duration', 0.75))
         
         self.update_status("Pause menu gesture triggered", "info")
             
-    def update_status(self, message, level="info"):
+    def setup_status_bus(self):
+        """Apply status deduplication and throttling settings"""
+        cfg = self.config_variables
+        self.status_bus.configure(
+            repeat_interval=cfg.get('status_repeat_interval', 5.0),
+            rates={
+                'info': cfg.get('status_info_rate', 10.0),
+                'warning': cfg.get('status_warning_rate', 5.0),
+                'error': cfg.get('status_error_rate', 5.0)
+            }
+        )
+        
+    def update_status(self, message, level="info", event=None, payload=None):
+        """
+        Publish a status update; repeats are collapsed and bursts throttled
+        
+        Args:
+            message: Status text
+            level: info, success, warning, error or debug
+            event: Optional StatusEvent for receivers that track state
+            payload: Optional event details, e.g. {'index': 3}
+        """
+        self.status_bus.publish(message, level, event, payload)
+        
+    def _emit_status(self, message, level, event=None, payload=None):
         """Send status update to callback if available and log it"""
         # Log the message
         if level == "info":
@@ -340,38 +594,47 @@ class TrackerLogic:
             
         # Send to callback if available
         if self.status_callback:
-            self.status_callback(message, level)
+            self.status_callback(message, level, event, payload)
         else:
             print(f"[{level.upper()}] {message}")
             
     def init_vr(self):
-        """Initialize OpenVR connection"""
+        """Initialize the VR backend (OpenVR unless configured otherwise)"""
         try:
-            self.vr_system = openvr.init(openvr.VRApplication_Background)
-            self.update_status("OpenVR initialized", "success")
+            if self.backend is None:
+                self.backend = create_backend(self.config_variables)
+            self.vr_system = self.backend.init()
+            if self.backend.clock is not None:
+                self.clock = self.backend.clock
+            self.update_status(f"{self.backend.name} initialized", "success",
+                               StatusEvent.VR_INITIALIZED, {'backend': self.backend.name})
             return True
         except openvr.OpenVRError as e:
             error_msg = f"OpenVR init failed: {e}"
-            self.update_status(error_msg, "error")
+            self.update_status(error_msg, "error", StatusEvent.VR_INIT_FAILED)
             self.logger.exception("OpenVR initialization error")
             return False
         except Exception as e:
             error_msg = f"Unexpected error initializing VR: {e}"
-            self.update_status(error_msg, "error")
+            self.update_status(error_msg, "error", StatusEvent.VR_INIT_FAILED)
             self.logger.exception("Unexpected VR initialization error")
             return False
             
     def shutdown_vr(self):
-        """Shutdown OpenVR connection"""
+        """Shutdown the VR backend"""
         if self.vr_system is not None:
-            openvr.shutdown()
+            self.backend.shutdown()
             self.vr_system = None
-            self.update_status("OpenVR shutdown", "info")
+            self.clock = time.perf_counter
+            self.update_status(f"{self.backend.name} shutdown", "info", StatusEvent.VR_SHUTDOWN)
             
-        # Clean up MMAP if used
-        if self.mmap_comm:
-            self.mmap_comm.cleanup()
-            self.mmap_comm = None
+        # Release held keys, clean up MMAP and finish pending INI writes
+        self.action_executor.close()
+        self.output_hold = None
+        self.close_outputs()
+        
+        self.dump_stage_stats()
+        self.status_bus.flush()
             
     def start_tracking(self):
         """Start tracking in a separate thread"""
@@ -380,140 +643,83 @@ class TrackerLogic:
             self.tracking_thread = threading.Thread(target=self._tracking_loop)
             self.tracking_thread.daemon = True
             self.tracking_thread.start()
-            self.update_status("Tracking started", "success")
+            self.update_status("Tracking started", "success", StatusEvent.TRACKING_STARTED)
             
     def stop_tracking(self):
         """Stop tracking"""
         self.running = False
         if self.tracking_thread:
             self.tracking_thread.join(timeout=2.0)
-        self.update_status("Tracking stopped", "info")
+        self.update_status("Tracking stopped", "info", StatusEvent.TRACKING_STOPPED)
+        
+    def hold_output(self, duration, args):
+        """Write the given update_tracking_data() arguments instead of live poses for duration seconds"""
+        self.output_hold = (self.frame_time + duration, args)
         
     def update_tracking_data(self, iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr):
-        """Update tracking data using configured communication method"""
-        if self.use_mmap and self.mmap_comm:
-            # Try MMAP first
-            success = self.mmap_comm.write_tracking_data(
-                iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr,
-                self.config_variables
-            )
-            
-            if not success and self.config_variables.get('fallback_to_ini', True):
-                # Fallback to INI
-                self.update_ini(iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr)
-        else:
-            # Use INI
-            self.update_ini(iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr)
-            
+        """Update tracking data through the configured output sinks"""
+        start = time.perf_counter_ns()
+        hold = self.output_hold
+        if hold is not None:
+            if self.frame_time < hold[0]:
+                iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr = hold[1]
+            else:
+                self.output_hold = None
+        values = self.output_transform.apply(iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr)
+        self.output_sink.write(values, self.frame_time)
+        self.stage_profiler.add(STAGE_OUTPUT, time.perf_counter_ns() - start)
+        
     def update_ini(self, iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr):
         """Update the game INI file with tracking data"""
-        try:
-            cfg = self.config_variables
-            file_path = cfg.get('file_path', 'E:/SteamLibrary/steamapps/common/Fallout New Vegas/Data/Config/Meh.ini')
-            
-            with open(file_path, "w") as f:
-                f.write("[Standard]\n")
-                f.write(f'fCanIOpenThis = {1}\n')
-                f.write(f"fiX = {(iX * cfg.get('x_scale', 50)) + cfg.get('x_offset', 15):.4f}\n")
-                f.write(f"fiY = {(iY * cfg.get('y_scale', -50)) + cfg.get('y_offset', -10):.4f}\n")
-                f.write(f"fiZ = {(iZ * cfg.get('z_scale', -50)) + cfg.get('z_offset', 0):.4f}\n")
-                f.write(f"fiXr = {(iXr * cfg.get('xr_scale', -120)) + cfg.get('xr_offset', 10):.4f}\n")
-                f.write(f"fiZr = {(iZr * cfg.get('zr_scale', 120)) + cfg.get('zr_offset', -75):.4f}\n")
-                f.write(f"fpZr = {(pZr * cfg.get('pzr_scale', -150)) + cfg.get('pzr_offset', -7.5):.4f}\n")
-        except FileNotFoundError:
-            self.update_status(f"INI file not found: {file_path}", "error")
-            self.logger.error(f"INI file not found at: {file_path}")
-        except PermissionError:
-            self.update_status(f"Permission denied writing to INI: {file_path}", "error")
-            self.logger.error(f"Permission denied for INI file: {file_path}")
-        except Exception as e:
-            self.update_status(f"INI update error: {e}", "error")
-            self.logger.exception("Unexpected error updating INI file")
-            
+        self.write_ini_values(self.output_transform.apply(iX, iY, iZ, iXr, iYr, iZr, pXr, pYr, pZr))
+        
+    def write_ini_values(self, values):
+        """Write already scaled output values (see OutputTransform) to the game INI file"""
+        self.ini_sink.write(values, self.frame_time)
+        
     def calculate_distance_xyz(self, x1, y1, z1, x2, y2, z2):
         """Calculate 3D distance between two points"""
         distance = math.sqrt((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2)
         return distance
         
-    def get_rotation(self, matrix):
-        """Extract rotation quaternion from transformation matrix"""
-        q = openvr.HmdQuaternion_t()
-        q.w = np.sqrt(max(0, 1 + matrix[0][0] + matrix[1][1] + matrix[2][2])) / 2
-        q.x = np.sqrt(max(0, 1 + matrix[0][0] - matrix[1][1] - matrix[2][2])) / 2
-        q.y = np.sqrt(max(0, 1 - matrix[0][0] + matrix[1][1] - matrix[2][2])) / 2
-        q.z = np.sqrt(max(0, 1 - matrix[0][0] - matrix[1][1] + matrix[2][2])) / 2
-        q.x = np.copysign(q.x, matrix[2][1] - matrix[1][2])
-        q.y = np.copysign(q.y, matrix[0][2] - matrix[2][0])
-        q.z = np.copysign(q.z, matrix[1][0] - matrix[0][1])
-        return q
-        
-    def quaternion_to_euler(self, q):
-        """Convert quaternion (w, x, y, z) to Euler angles (roll, pitch, yaw) in degrees."""
-        # roll (x-axis rotation)
-        sinr_cosp = 2 * (q.w * q.x + q.y * q.z)
-        cosr_cosp = 1 - 2 * (q.x * q.x + q.y * q.y)
-        roll = math.atan2(sinr_cosp, cosr_cosp)
-        
-        # pitch (y-axis rotation)
-        sinp = 2 * (q.w * q.y - q.z * q.x)
-        if abs(sinp) >= 1:
-            pitch = math.copysign(math.pi / 2, sinp)  # use 90 degrees if out of range
-        else:
-            pitch = math.asin(sinp)
-            
-        # yaw (z-axis rotation)
-        siny_cosp = 2 * (q.w * q.z + q.x * q.y)
-        cosy_cosp = 1 - 2 * (q.y * q.y + q.z * q.z)
-        yaw = math.atan2(siny_cosp, cosy_cosp)
-        
-        return math.degrees(roll), math.degrees(pitch), math.degrees(yaw)
-        
-    def get_position(self, matrix):
-        """Extract position vector from transformation matrix"""
-        v = openvr.HmdVector3_t()
-        v.v = (ctypes.c_float * 3)(matrix[0][3], matrix[1][3], matrix[2][3])
-        return v
-        
-    def quaternion_conjugate(self, q):
-        """Calculate quaternion conjugate"""
-        return openvr.HmdQuaternion_t(q.w, -q.x, -q.y, -q.z)
-        
-    def quaternion_multiply(self, q1, q2):
-        """Multiply two quaternions"""
-        w = q1.w * q2.w - q1.x * q2.x - q1.y * q2.y - q1.z * q2.z
-        x = q1.w * q2.x + q1.x * q2.w + q1.y * q2.z - q1.z * q2.y
-        y = q1.w * q2.y - q1.x * q2.z + q1.y * q2.w + q1.z * q2.x
-        z = q1.w * q2.z + q1.x * q2.y - q1.y * q2.x + q1.z * q2.w
-        return openvr.HmdQuaternion_t(w, x, y, z)
-        
-    def rotate_vector_by_quaternion(self, vector, quaternion):
-        """Rotate a vector by a quaternion"""
-        pure_q_vector = openvr.HmdQuaternion_t(0, vector.v[0], vector.v[1], vector.v[2])
-        quaternion_inverse = self.quaternion_conjugate(quaternion)
-        rotated_q = self.quaternion_multiply(quaternion, self.quaternion_multiply(pure_q_vector, quaternion_inverse))
-        rotated_vector = openvr.HmdVector3_t()
-        rotated_vector.v = (ctypes.c_float * 3)(rotated_q.x, rotated_q.y, rotated_q.z)
-        return rotated_vector
-        
-    def find_controller_indices(self):
-        """Find indices of all active controllers"""
-        controllers = []
-        for i in range(openvr.k_unMaxTrackedDeviceCount):
-            device_class = self.vr_system.getTrackedDeviceClass(i)
-            if device_class == openvr.TrackedDeviceClass_Controller:
-                if self.vr_system.isTrackedDeviceConnected(i):
-                    controllers.append(i)
-        return controllers
-        
-    def get_controller_role(self, device_index):
-        """Get the role (left/right) of a controller"""
-        role = self.vr_system.getControllerRoleForTrackedDeviceIndex(device_index)
-        if role == openvr.TrackedControllerRole_LeftHand:
-            return "left"
-        elif role == openvr.TrackedControllerRole_RightHand:
-            return "right"
-        else:
-            return "unknown"
+    def start_recording(self, path=None, max_frames=None):
+        """Record raw poses from the tracking loop to a trace file"""
+        self.stop_recording()
+        path = path or self.config_variables.get('trace_path', 'pose_trace.npy')
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        try:
+            self.trace_recorder = PoseTraceRecorder(
+                path,
+                capacity=max_frames or self.config_variables.get('trace_max_frames', 54000),
+                logger=self.logger
+            )
+            self.update_status(f"Recording pose trace: {path}", "info")
+        except Exception as e:
+            self.trace_recorder = None
+            self.update_status(f"Could not start trace recording: {e}", "error")
+            
+    def stop_recording(self):
+        """Finish the current trace recording, if any"""
+        recorder = self.trace_recorder
+        if recorder is None:
+            return
+        self.trace_recorder = None
+        try:
+            recorder.close()
+            self.update_status(f"Pose trace saved ({recorder.count} frames)", "info")
+        except Exception as e:
+            self.update_status(f"Error saving pose trace: {e}", "error")
+            
+    def get_target_hz(self):
+        """Loop rate from config, derived from loop_delay when target_hz is not set"""
+        if self.config_variables.get('pacing', 'fixed') == 'none':
+            return 0
+        target_hz = self.config_variables.get('target_hz', 0)
+        if target_hz > 0:
+            return target_hz
+        loop_delay = self.config_variables.get('loop_delay', 0.025)
+        return 1.0 / loop_delay if loop_delay > 0 else 0
         
     def _tracking_loop(self):
         """Main tracking loop"""
@@ -522,46 +728,76 @@ class TrackerLogic:
             return
             
         hmd_index = openvr.k_unTrackedDeviceIndex_Hmd
-        max_devices = openvr.k_unMaxTrackedDeviceCount
-        TrackedDevicePose_t = openvr.TrackedDevicePose_t
+        origin = openvr.TrackingUniverseStanding
+        
+        # Controller topology is cached and only rescanned on device events
+        self.device_registry = DeviceRegistry(
+            self.vr_system,
+            refresh_interval=self.config_variables.get('device_refresh_interval', 2.0),
+            logger=self.logger
+        )
+        registry = self.device_registry
+        
+        # Frame pacing against absolute deadlines
+        scheduler = self.frame_scheduler = FrameScheduler(
+            target_hz=self.get_target_hz(),
+            spin_threshold=self.config_variables.get('spin_threshold', 0.001),
+            logger=self.logger
+        )
+        if self.config_variables.get('pacing', 'fixed') == 'display':
+            scheduler.sync_to_display(self.vr_system)
+            
+        if self.config_variables.get('record_trace', False) and self.trace_recorder is None:
+            self.start_recording()
+            
+        profiler = self.stage_profiler
+        profiler.reset()
+        telemetry = self.telemetry
+        telemetry.reset()
+        if self.motion_recognizer:
+            self.motion_recognizer.reset()  # Drop strokes left over from a previous run
+        now_ns = time.perf_counter_ns
+        reported_controller = None
         
-        self.update_status("Tracking active", "success")
+        self.update_status("Tracking active", "success", StatusEvent.TRACKING_ACTIVE)
         
         while self.running:
             try:
+                frame_start = now_ns()
+                registry.poll()
+                
                 # Check if HMD is connected
-                if not self.vr_system.isTrackedDeviceConnected(hmd_index):
-                    self.update_status("HMD not connected", "warning")
-                    time.sleep(1)
+                if not registry.hmd_connected:
+                    self.update_status("HMD not connected", "warning", StatusEvent.HMD_NOT_CONNECTED)
+                    reported_controller = None
+                    registry.invalidate()
+                    scheduler.pause(1)
                     continue
                     
                 # Find controllers
-                controller_indices = self.find_controller_indices()
+                controller_indices = registry.controllers
                 if not controller_indices:
-                    self.update_status("No controllers found", "warning")
-                    time.sleep(1)
+                    self.update_status("No controllers found", "warning", StatusEvent.CONTROLLER_NOT_FOUND, {'hand': None})
+                    reported_controller = None
+                    registry.invalidate()
+                    scheduler.pause(1)
                     continue
                     
                 # Identify left and right controllers
-                self.left_controller_index = None
-                self.right_controller_index = None
+                self.left_controller_index = registry.left_index
+                self.right_controller_index = registry.right_index
                 
-                for idx in controller_indices:
-                    role = self.get_controller_role(idx)
-                    if role == "left":
-                        self.left_controller_index = idx
-                    elif role == "right":
-                        self.right_controller_index = idx
-                        
                 # Determine which controller to use
                 active_controller_index = None
                 if self.dual_hand_mode:
                     # In dual hand mode, we'll track both
                     if self.left_controller_index and self.right_controller_index:
-                        self.update_status("Both controllers connected", "success")
+                        self.update_status("Both controllers connected", "success", StatusEvent.CONTROLLERS_CONNECTED,
+                                           {'left': self.left_controller_index, 'right': self.right_controller_index})
                     else:
                         self.update_status("Dual hand mode requires both controllers", "warning")
-                        time.sleep(1)
+                        registry.invalidate()
+                        scheduler.pause(1)
                         continue
                 else:
                     # Single hand mode - use selected hand
@@ -574,99 +810,92 @@ class TrackerLogic:
                         active_controller_index = controller_indices[0]
                         
                     if active_controller_index is None:
-                        self.update_status(f"{self.active_hand} controller not found", "warning")
-                        time.sleep(1)
+                        self.update_status(f"{self.active_hand} controller not found", "warning",
+                                           StatusEvent.CONTROLLER_NOT_FOUND, {'hand': self.active_hand})
+                        registry.invalidate()
+                        scheduler.pause(1)
                         continue
+                        
+                    if active_controller_index != reported_controller:
+                        reported_controller = active_controller_index
+                        self.update_status(f"Controller found at index {active_controller_index}", "success",
+                                           StatusEvent.CONTROLLER_FOUND,
+                                           {'index': active_controller_index,
+                                            'hand': registry.roles.get(active_controller_index, 'unknown')})
                     
-                origin = openvr.TrackingUniverseStanding
-                predicted_seconds = 0.0
-                poses_array = (TrackedDevicePose_t * max_devices)()
+                predicted_seconds = scheduler.predicted_seconds()
                 
                 try:
-                    returned_poses = self.vr_system.getDeviceToAbsoluteTrackingPose(
-                        origin, predicted_seconds, poses_array
-                    )
+                    stage_start = now_ns()
+                    returned_poses = self.pose_buffer.fetch(self.vr_system, origin, predicted_seconds)
+                    profiler.add(STAGE_FETCH, now_ns() - stage_start)
                 except Exception as e:
                     self.update_status(f"Error getting tracking poses: {e}", "error")
                     self.logger.exception("Error in getDeviceToAbsoluteTrackingPose")
-                    time.sleep(1)
+                    scheduler.pause(1)
                     continue
+                    
+                frame_time = self.frame_time = self.clock()
+                if self.trace_recorder:
+                    self.trace_recorder.record(frame_time, self.pose_buffer, registry)
+                
+                stage_start = now_ns()
+                kernel = self.pose_kernel
+                kernel.load_buffer(self.pose_buffer)
                 
+                # Extrapolate poses forward before any relative math
+                if self.pose_predictor:
+                    self.pose_predictor.predict(
+                        kernel.matrices, frame_time,
+                        self.pose_buffer.velocities, self.pose_buffer.angular_velocities
+                    )
+                    
                 if self.dual_hand_mode:
                     # Dual hand mode - process both controllers
                     if len(returned_poses) > max(hmd_index, self.left_controller_index, self.right_controller_index):
-                        hmd_pose = returned_poses[hmd_index]
-                        left_pose = returned_poses[self.left_controller_index]
-                        right_pose = returned_poses[self.right_controller_index]
+                        valid = kernel.valid
                         
-                        if hmd_pose.bPoseIsValid and left_pose.bPoseIsValid and right_pose.bPoseIsValid:
+                        if valid[hmd_index] and valid[self.left_controller_index] and valid[self.right_controller_index]:
                             # Process both hands
-                            self._process_dual_hand_tracking(hmd_pose, left_pose, right_pose)
+                            kernel.solve(hmd_index)
+                            profiler.add(STAGE_MATH, now_ns() - stage_start)
+                            self._process_dual_hand_tracking(hmd_index, self.left_controller_index, self.right_controller_index)
                         else:
                             self.update_status("Invalid pose data for dual hand mode", "warning")
                 else:
                     # Single hand mode
                     if len(returned_poses) > max(hmd_index, active_controller_index):
-                        hmd_pose = returned_poses[hmd_index]
-                        con_pose = returned_poses[active_controller_index]
-                    
-                        if hmd_pose.bPoseIsValid and con_pose.bPoseIsValid:
-                            m = hmd_pose.mDeviceToAbsoluteTracking
-                            n = con_pose.mDeviceToAbsoluteTracking
-                            
-                            hmd_position_world = self.get_position(m)
-                            con_position_world = self.get_position(n)
-                            
-                            hmd_matrix = [
-                                [m[0][0], m[0][1], m[0][2], m[0][3]],
-                                [m[1][0], m[1][1], m[1][2], m[1][3]],
-                                [m[2][0], m[2][1], m[2][2], m[2][3]]
-                            ]
-                            hmd_rotation_world = self.get_rotation(hmd_matrix)
-                            
-                            con_matrix = [
-                                [n[0][0], n[0][1], n[0][2], n[0][3]],
-                                [n[1][0], n[1][1], n[1][2], n[1][3]],
-                                [n[2][0], n[2][1], n[2][2], n[2][3]]
-                            ]
-                            con_rotation_world = self.get_rotation(con_matrix)
-                            
-                            world_diff_x = con_position_world.v[0] - hmd_position_world.v[0]
-                            world_diff_y = con_position_world.v[1] - hmd_position_world.v[1]
-                            world_diff_z = con_position_world.v[2] - hmd_position_world.v[2]
-                            world_diff_vector = openvr.HmdVector3_t()
-                            world_diff_vector.v = (ctypes.c_float * 3)(world_diff_x, world_diff_y, world_diff_z)
+                        if kernel.valid[hmd_index] and kernel.valid[active_controller_index]:
+                            kernel.solve(hmd_index)
                             
-                            hmd_rotation_inverse = self.quaternion_conjugate(hmd_rotation_world)
-                            relative_position = self.rotate_vector_by_quaternion(world_diff_vector, hmd_rotation_inverse)
-                            relative_rotation = self.quaternion_multiply(hmd_rotation_inverse, con_rotation_world)
-                            
-                            # Convert quaternions to Euler angles for game logic
-                            hmd_roll, hmd_pitch, hmd_yaw = self.quaternion_to_euler(hmd_rotation_world)
-                            rel_roll, rel_pitch, rel_yaw = self.quaternion_to_euler(relative_rotation)
+                            relative_rotation = kernel.relative_rotations[active_controller_index]
+                            hmd_roll, hmd_pitch, hmd_yaw = kernel.hmd_euler
+                            rel_roll, rel_pitch, rel_yaw = kernel.relative_euler[active_controller_index].tolist()
                             
                             # InertiaController Bone Pose
-                            inertiaZ, inertiaX, inertiaY = relative_position.v
+                            inertiaZ, inertiaX, inertiaY = kernel.relative_positions[active_controller_index].tolist()
                             inertiaXr, inertiaYr, inertiaZr = rel_roll, rel_pitch, rel_yaw
                             playerZr = hmd_yaw
+                            raw_values = (inertiaX, inertiaY, inertiaZ, inertiaXr, inertiaYr, inertiaZr)
+                            profiler.add(STAGE_MATH, now_ns() - stage_start)
                             
-                            # Apply smoothing if enabled
-                            if self.smoother:
+                            # Apply smoothing if enabled (pending parameter changes apply here)
+                            smoother = self.smoother
+                            if smoother is not None and smoother.begin_frame():
+                                stage_start = now_ns()
+                                
                                 # Smooth position
-                                inertiaX, inertiaY, inertiaZ = self.smoother.smooth_position(
-                                    inertiaX, inertiaY, inertiaZ
+                                inertiaX, inertiaY, inertiaZ = smoother.smooth_position(
+                                    inertiaX, inertiaY, inertiaZ, frame_time
                                 )
                                 
                                 # Smooth controller rotation (quaternion) before converting
-                                smoothed_rot_quat = self.smoother.smooth_quaternion(
-                                    relative_rotation.w, relative_rotation.x, 
-                                    relative_rotation.y, relative_rotation.z
-                                )
-                                smoothed_relative_rotation = openvr.HmdQuaternion_t(*smoothed_rot_quat)
-                                rel_roll, rel_pitch, rel_yaw = self.quaternion_to_euler(smoothed_relative_rotation)
+                                smoothed_rot_quat = smoother.smooth_quaternion(*relative_rotation.tolist(), frame_time)
+                                rel_roll, rel_pitch, rel_yaw = quaternion_to_euler(*smoothed_rot_quat)
                                 
                                 # Update inertia values with smoothed rotation
                                 inertiaXr, inertiaYr, inertiaZr = rel_roll, rel_pitch, rel_yaw
+                                profiler.add(STAGE_SMOOTHING, now_ns() - stage_start)
                             
                             # Store player rotation for gesture callbacks
                             self.last_player_rotation = (hmd_roll, hmd_pitch, hmd_yaw)
@@ -675,125 +904,109 @@ class TrackerLogic:
                             self.update_tracking_data(inertiaX, inertiaY, inertiaZ, inertiaXr, inertiaYr, inertiaZr, 0, 0, playerZr)
                             
                             # Update gesture recognition with smoothed position
-                            if self.gesture_recognizer:
-                                gesture_pos = (inertiaX, inertiaY, inertiaZ)
-                                self.gesture_recognizer.update(gesture_pos)
+                            if self.gesture_recognizer or self.motion_recognizer:
+                                stage_start = now_ns()
+                                if self.gesture_recognizer:
+                                    gesture_pos = (inertiaX, inertiaY, inertiaZ)
+                                    self.gesture_recognizer.update(gesture_pos, frame_time,
+                                                                   (rel_roll, rel_pitch, rel_yaw), self.active_hand)
+                                if self.motion_recognizer:
+                                    # Motion templates are recorded from unsmoothed HMD-relative positions
+                                    self.motion_recognizer.update(
+                                        kernel.relative_positions[active_controller_index].tolist(),
+                                        frame_time, self.active_hand)
+                                profiler.add(STAGE_GESTURE, now_ns() - stage_start)
+                                
+                            if telemetry.frame():
+                                self._publish_telemetry(raw_values, (inertiaX, inertiaY, inertiaZ, inertiaXr, inertiaYr, inertiaZr))
                                 
                         else:
                             self.update_status("Invalid pose data", "warning")
                     else:
                         self.update_status("Could not retrieve pose", "warning")
                     
-                time.sleep(self.config_variables.get('loop_delay', 0.025))
+                profiler.add(STAGE_FRAME, now_ns() - frame_start)
+                scheduler.wait()
                 
             except Exception as e:
                 self.update_status(f"Tracking error: {e}", "error")
-                time.sleep(1)
+                scheduler.pause(1)
                 
+        self.stop_recording()
         self.update_status("Tracking loop ended", "info")
         
-    def _process_dual_hand_tracking(self, hmd_pose, left_pose, right_pose):
-        """Process tracking data for both hands"""
-        # Get HMD transformation
-        m = hmd_pose.mDeviceToAbsoluteTracking
-        hmd_position_world = self.get_position(m)
-        hmd_matrix = [
-            [m[0][0], m[0][1], m[0][2], m[0][3]],
-            [m[1][0], m[1][1], m[1][2], m[1][3]],
-            [m[2][0], m[2][1], m[2][2], m[2][3]]
-        ]
-        hmd_rotation_world = self.get_rotation(hmd_matrix)
-        hmd_rotation_inverse = self.quaternion_conjugate(hmd_rotation_world)
-        
-        # Process right hand (primary weapon hand)
-        r = right_pose.mDeviceToAbsoluteTracking
-        right_position_world = self.get_position(r)
-        right_matrix = [
-            [r[0][0], r[0][1], r[0][2], r[0][3]],
-            [r[1][0], r[1][1], r[1][2], r[1][3]],
-            [r[2][0], r[2][1], r[2][2], r[2][3]]
-        ]
-        right_rotation_world = self.get_rotation(right_matrix)
-        
-        # Calculate right hand relative position
-        right_diff_x = right_position_world.v[0] - hmd_position_world.v[0]
-        right_diff_y = right_position_world.v[1] - hmd_position_world.v[1]
-        right_diff_z = right_position_world.v[2] - hmd_position_world.v[2]
-        right_diff_vector = openvr.HmdVector3_t()
-        right_diff_vector.v = (ctypes.c_float * 3)(right_diff_x, right_diff_y, right_diff_z)
-        
-        right_relative_position = self.rotate_vector_by_quaternion(right_diff_vector, hmd_rotation_inverse)
-        right_relative_rotation = self.quaternion_multiply(hmd_rotation_inverse, right_rotation_world)
-        
-        # Process left hand
-        l = left_pose.mDeviceToAbsoluteTracking
-        left_position_world = self.get_position(l)
-        left_matrix = [
-            [l[0][0], l[0][1], l[0][2], l[0][3]],
-            [l[1][0], l[1][1], l[1][2], l[1][3]],
-            [l[2][0], l[2][1], l[2][2], l[2][3]]
-        ]
-        left_rotation_world = self.get_rotation(left_matrix)
-        
-        # Calculate left hand relative position
-        left_diff_x = left_position_world.v[0] - hmd_position_world.v[0]
-        left_diff_y = left_position_world.v[1] - hmd_position_world.v[1]
-        left_diff_z = left_position_world.v[2] - hmd_position_world.v[2]
-        left_diff_vector = openvr.HmdVector3_t()
-        left_diff_vector.v = (ctypes.c_float * 3)(left_diff_x, left_diff_y, left_diff_z)
-        
-        left_relative_position = self.rotate_vector_by_quaternion(left_diff_vector, hmd_rotation_inverse)
-        left_relative_rotation = self.quaternion_multiply(hmd_rotation_inverse, left_rotation_world)
+    def _process_dual_hand_tracking(self, hmd_index, left_index, right_index):
+        """Process tracking data for both hands from the solved pose kernel"""
+        kernel = self.pose_kernel
+        hmd_rotation_world = kernel.quaternions[hmd_index]
         
+        # Right hand (primary weapon hand) and left hand, relative to the HMD
+        right_relative_position = kernel.relative_positions[right_index]
+        right_relative_rotation = kernel.relative_rotations[right_index]
+        left_relative_position = kernel.relative_positions[left_index]
+        
+        # Motion gestures follow each hand; the time is added to this frame's gesture stage sample
+        motion_ns = 0
+        if self.motion_recognizer:
+            stage_start = time.perf_counter_ns()
+            self.motion_recognizer.update(right_relative_position.tolist(), self.frame_time, 'right')
+            self.motion_recognizer.update(left_relative_position.tolist(), self.frame_time, 'left')
+            motion_ns = time.perf_counter_ns() - stage_start
+            
         # Check for two-handed weapon mode
         if self.config_variables.get('two_handed_weapon_mode', False):
             # Calculate distance between hands
-            hand_distance = self.calculate_distance_xyz(
-                right_relative_position.v[0], right_relative_position.v[1], right_relative_position.v[2],
-                left_relative_position.v[0], left_relative_position.v[1], left_relative_position.v[2]
-            )
+            rx, ry, rz = right_relative_position.tolist()
+            lx, ly, lz = left_relative_position.tolist()
+            hand_distance = self.calculate_distance_xyz(rx, ry, rz, lx, ly, lz)
             
             min_dist = self.config_variables.get('two_handed_min_distance', 0.2)
             max_dist = self.config_variables.get('two_handed_max_distance', 0.8)
             
             if min_dist <= hand_distance <= max_dist:
                 # Two-handed grip detected - average the positions
-                avg_x = (right_relative_position.v[0] + left_relative_position.v[0]) / 2
-                avg_y = (right_relative_position.v[1] + left_relative_position.v[1]) / 2
-                avg_z = (right_relative_position.v[2] + left_relative_position.v[2]) / 2
+                avg_x = (rx + lx) / 2
+                avg_y = (ry + ly) / 2
+                avg_z = (rz + lz) / 2
                 
                 # Use right hand rotation as primary
                 self._update_tracking_from_relative(
                     avg_x, avg_y, avg_z,
                     right_relative_rotation,
-                    hmd_rotation_world
+                    hmd_rotation_world,
+                    motion_ns
                 )
                 return
         
         # Default: Use right hand for weapon
+        rx, ry, rz = right_relative_position.tolist()
         self._update_tracking_from_relative(
-            right_relative_position.v[0], right_relative_position.v[1], right_relative_position.v[2],
+            rx, ry, rz,
             right_relative_rotation,
-            hmd_rotation_world
+            hmd_rotation_world,
+            motion_ns
         )
         
-    def _update_tracking_from_relative(self, rel_x, rel_y, rel_z, relative_rotation, hmd_rotation_world):
-        """Update tracking data from relative position and rotation"""
+    def _update_tracking_from_relative(self, rel_x, rel_y, rel_z, relative_rotation, hmd_rotation_world, motion_ns=0):
+        """Update tracking data from relative position and rotation (w, x, y, z arrays; motion_ns: motion gesture time)"""
+        rot_w, rot_x, rot_y, rot_z = rotation_quat = relative_rotation.tolist()
+        
         # InertiaController Bone Pose
         inertiaZ, inertiaX, inertiaY = rel_z, rel_x, rel_y
-        inertiaZr, inertiaXr, inertiaYr = relative_rotation.x, relative_rotation.y, relative_rotation.z
-        playerXr, playerZr, playerYr = hmd_rotation_world.x, hmd_rotation_world.y, hmd_rotation_world.z
-        
-        # Apply smoothing if enabled
-        if self.smoother:
-            inertiaX, inertiaY, inertiaZ = self.smoother.smooth_position(inertiaX, inertiaY, inertiaZ)
-            smoothed_rot = self.smoother.smooth_rotation(
-                relative_rotation.w, relative_rotation.x, 
-                relative_rotation.y, relative_rotation.z
-            )
+        inertiaZr, inertiaXr, inertiaYr = rot_x, rot_y, rot_z
+        _, playerXr, playerZr, playerYr = hmd_rotation_world.tolist()
+        raw_values = (inertiaX, inertiaY, inertiaZ, inertiaXr, inertiaYr, inertiaZr)
+        
+        # Apply smoothing if enabled (pending parameter changes apply here)
+        smoother = self.smoother
+        if smoother is not None and smoother.begin_frame():
+            stage_start = time.perf_counter_ns()
+            inertiaX, inertiaY, inertiaZ = smoother.smooth_position(inertiaX, inertiaY, inertiaZ, self.frame_time)
+            smoothed_rot = rotation_quat = smoother.smooth_quaternion(rot_w, rot_x, rot_y, rot_z, self.frame_time)
             inertiaXr = smoothed_rot[1]
             inertiaYr = smoothed_rot[2]
             inertiaZr = smoothed_rot[3]
+            self.stage_profiler.add(STAGE_SMOOTHING, time.perf_counter_ns() - stage_start)
         
         # Store player rotation for gesture callbacks
         self.last_player_rotation = (playerXr, playerYr, playerZr)
@@ -801,7 +1014,24 @@ class TrackerLogic:
         # Update tracking data
         self.update_tracking_data(inertiaX, inertiaY, inertiaZ, inertiaXr, inertiaYr, inertiaZr, inertiaZr, playerYr, -inertiaXr)
         
-        # Update gesture recognition
-        if self.gesture_recognizer:
+        # Update gesture recognition (right hand drives the weapon in dual hand mode)
+        recognizer = self.gesture_recognizer
+        if recognizer:
+            stage_start = time.perf_counter_ns()
             gesture_pos = (inertiaX, inertiaY, inertiaZ)
-            self.gesture_recognizer.update(gesture_pos)
\ No newline at end of file
+            rotation = quaternion_to_euler(*rotation_quat) if recognizer.needs_orientation else None
+            recognizer.update(gesture_pos, self.frame_time, rotation, 'right')
+            self.stage_profiler.add(STAGE_GESTURE, time.perf_counter_ns() - stage_start + motion_ns)
+        elif motion_ns:
+            self.stage_profiler.add(STAGE_GESTURE, motion_ns)
+            
+        if self.telemetry.frame():
+            self._publish_telemetry(raw_values, (inertiaX, inertiaY, inertiaZ, inertiaXr, inertiaYr, inertiaZr))
+            
+    def _publish_telemetry(self, raw_values, smoothed_values):
+        """Publish a telemetry snapshot (called from the tracking thread when one is due)"""
+        gestures = {}
+        if self.gesture_recognizer:
+            for zone_id in self.gesture_recognizer.gesture_zones:
+                gestures[zone_id] = self.gesture_recognizer.get_zone_status(zone_id, self.frame_time)
+        self.telemetry.publish(self.frame_time, raw_values, smoothed_values, gestures)
\ No newline at end of file
@@ -0,0 +1,398 @@
+"""
+VR runtime backends for the tracker
+OpenVR for real hardware and a synthetic headless backend for load testing
+"""
+
+import math
+import time
+from collections import deque
+import numpy as np
+import openvr
+from typing import Callable, Dict, Optional
+
+
+BACKEND_TYPES = ('openvr', 'synthetic')
+
+
+class VRBackend:
+    """Interface for the VR runtime used by TrackerLogic"""
+    
+    name = "VR backend"
+    
+    # Optional frame timestamp source replacing TrackerLogic.clock
+    clock: Optional[Callable[[], float]] = None
+    
+    def init(self):
+        """
+        Start the runtime
+        
+        Returns:
+            IVRSystem (or compatible) instance
+        """
+        raise NotImplementedError
+        
+    def shutdown(self):
+        """Stop the runtime"""
+        pass
+        
+
+class OpenVRBackend(VRBackend):
+    """SteamVR through pyopenvr"""
+    
+    name = "OpenVR"
+    
+    def init(self):
+        return openvr.init(openvr.VRApplication_Background)
+        
+    def shutdown(self):
+        openvr.shutdown()
+        
+
+class SyntheticVRSystem:
+    """
+    Procedural stand-in for IVRSystem
+    
+    Device 0 is the HMD, followed by the controllers and generic trackers.
+    Every frame all devices move on smooth periodic paths with analytic
+    velocities; devices can randomly drop out for a number of frames and
+    the first two controllers can periodically swap hands. Time advances
+    one frame per getDeviceToAbsoluteTrackingPose call.
+    """
+    
+    def __init__(self, controllers: int = 2, trackers: int = 0, frame_rate: float = 90.0,
+                 dropout_rate: float = 0.0, dropout_frames: int = 10,
+                 role_swap_interval: float = 0.0, seed: int = 0):
+        """
+        Args:
+            controllers: Number of hand controllers
+            trackers: Number of generic trackers
+            frame_rate: Simulated frame rate (advances the synthetic clock)
+            dropout_rate: Per-frame probability that a device starts dropping out
+            dropout_frames: Frames a dropout lasts
+            role_swap_interval: Seconds between left/right role swaps (0 disables)
+            seed: Random seed for dropouts
+        """
+        count = 1 + controllers + trackers
+        if count > openvr.k_unMaxTrackedDeviceCount:
+            raise ValueError(f"Too many synthetic devices: {count}")
+            
+        self.device_count = count
+        self.frame_rate = frame_rate
+        self.dropout_rate = dropout_rate
+        self.dropout_frames = dropout_frames
+        self.swap_frames = int(round(role_swap_interval * frame_rate)) if role_swap_interval > 0 else 0
+        self.rng = np.random.default_rng(seed)
+        
+        # Run control for load tests
+        self.frame = 0
+        self.max_frames = 0
+        self.on_finished: Optional[Callable[[], None]] = None
+        
+        # Statistics
+        self.generation_time = 0.0
+        self.dropouts = 0
+        self.role_changes = 0
+        
+        # Topology
+        self.classes = [openvr.TrackedDeviceClass_HMD]
+        self.classes += [openvr.TrackedDeviceClass_Controller] * controllers
+        self.classes += [openvr.TrackedDeviceClass_GenericTracker] * trackers
+        self.roles = {}
+        if controllers >= 1:
+            self.roles[1] = openvr.TrackedControllerRole_RightHand
+        if controllers >= 2:
+            self.roles[2] = openvr.TrackedControllerRole_LeftHand
+            
+        self._events = deque((openvr.VREvent_TrackedDeviceActivated, i) for i in range(count))
+        
+        # Motion parameters: head at standing height, hands in front of the body
+        phase = np.linspace(0.0, 2 * math.pi, count, endpoint=False)
+        self.base = np.zeros((count, 3))
+        self.base[:, 1] = 1.2
+        self.base[0] = (0.0, 1.6, 0.0)
+        self.base[1:, 0] = np.where(np.arange(1, count) % 2, 0.2, -0.2)
+        self.base[1:, 2] = -0.35
+        self.radius = np.full(count, 0.12)
+        self.radius[0] = 0.02
+        self.omega = 2 * math.pi * (0.4 + 0.1 * np.arange(count))
+        self.phase = phase
+        self.yaw_amplitude = np.full(count, 0.6)
+        
+        # Scratch buffers
+        self._angle = np.zeros(count)
+        self._cos = np.zeros(count)
+        self._sin = np.zeros(count)
+        self._yaw = np.zeros(count)
+        self._yaw_cos = np.zeros(count)
+        self._yaw_sin = np.zeros(count)
+        self._matrices = np.zeros((count, 3, 4))
+        self._matrices[:, 1, 1] = 1.0
+        self._velocities = np.zeros((count, 3))
+        self._angular_velocities = np.zeros((count, 3))
+        self._random = np.zeros(count)
+        self._dropout_remaining = np.zeros(count, dtype=np.int64)
+        self._valid = np.ones(count, dtype=bool)
+        
+        self._poses = None
+        self._records = None
+        
+    def clock(self) -> float:
+        """Synthetic frame time in seconds"""
+        return 1000.0 + self.frame / self.frame_rate
+        
+    # --- IVRSystem subset ---
+    
+    def getDeviceToAbsoluteTrackingPose(self, origin, predicted_seconds, poses):
+        """Generate the next frame into the pose array"""
+        start = time.perf_counter()
+        self.frame += 1
+        t = self.frame / self.frame_rate + predicted_seconds
+        
+        if self.swap_frames and self.frame % self.swap_frames == 0:
+            self._swap_roles()
+            
+        # Circular path in the XZ plane with a vertical bob, plus yaw oscillation
+        angle = self._angle
+        np.multiply(self.omega, t, out=angle)
+        np.add(angle, self.phase, out=angle)
+        np.cos(angle, out=self._cos)
+        np.sin(angle, out=self._sin)
+        
+        m = self._matrices
+        np.multiply(self.radius, self._cos, out=m[:, 0, 3])
+        np.multiply(self.radius, self._sin, out=m[:, 2, 3])
+        np.multiply(m[:, 2, 3], 0.5, out=m[:, 1, 3])
+        np.add(m[:, :, 3], self.base, out=m[:, :, 3])
+        
+        np.multiply(self.yaw_amplitude, self._sin, out=self._yaw)
+        np.cos(self._yaw, out=self._yaw_cos)
+        np.sin(self._yaw, out=self._yaw_sin)
+        np.copyto(m[:, 0, 0], self._yaw_cos)
+        np.copyto(m[:, 0, 2], self._yaw_sin)
+        np.negative(self._yaw_sin, out=m[:, 2, 0])
+        np.copyto(m[:, 2, 2], self._yaw_cos)
+        
+        # Analytic derivatives of the path
+        v = self._velocities
+        np.multiply(self._sin, self.radius, out=v[:, 0])
+        np.multiply(v[:, 0], -self.omega, out=v[:, 0])
+        np.multiply(self._cos, self.radius, out=v[:, 2])
+        np.multiply(v[:, 2], self.omega, out=v[:, 2])
+        np.multiply(v[:, 2], 0.5, out=v[:, 1])
+        w = self._angular_velocities
+        np.multiply(self._cos, self.yaw_amplitude, out=w[:, 1])
+        np.multiply(w[:, 1], self.omega, out=w[:, 1])
+        
+        if self.dropout_rate > 0:
+            self._update_dropouts()
+            
+        if poses is not self._poses:
+            from pose_acquisition import pose_dtype
+            self._poses = poses
+            self._records = np.frombuffer(poses, dtype=pose_dtype())[:self.device_count]
+            self._records['connected'] = True
+            
+        records = self._records
+        records['matrix'] = m
+        records['velocity'] = v
+        records['angular_velocity'] = w
+        records['valid'] = self._valid
+        
+        self.generation_time += time.perf_counter() - start
+        if self.max_frames and self.frame >= self.max_frames and self.on_finished:
+            self.on_finished()
+        return poses
+        
+    def pollNextEvent(self, event) -> bool:
+        if not self._events:
+            return False
+        event.eventType, event.trackedDeviceIndex = self._events.popleft()
+        return True
+        
+    def isTrackedDeviceConnected(self, index: int) -> bool:
+        return 0 <= index < self.device_count
+        
+    def getTrackedDeviceClass(self, index: int) -> int:
+        if 0 <= index < self.device_count:
+            return self.classes[index]
+        return openvr.TrackedDeviceClass_Invalid
+        
+    def getControllerRoleForTrackedDeviceIndex(self, index: int) -> int:
+        return self.roles.get(index, openvr.TrackedControllerRole_Invalid)
+        
+    def getFloatTrackedDeviceProperty(self, index: int, prop: int) -> float:
+        if prop == openvr.Prop_DisplayFrequency_Float:
+            return self.frame_rate
+        return 0.0
+        
+    def getTimeSinceLastVsync(self):
+        return False, 0.0, 0
+        
+    # --- Simulation ---
+    
+    def _update_dropouts(self):
+        """Start new dropouts at random and count down active ones"""
+        remaining = self._dropout_remaining
+        self.rng.random(out=self._random)
+        starting = (self._random < self.dropout_rate) & (remaining == 0)
+        self.dropouts += int(np.count_nonzero(starting))
+        remaining[starting] = self.dropout_frames
+        np.equal(remaining, 0, out=self._valid)
+        np.subtract(remaining, 1, out=remaining, where=remaining > 0)
+        
+    def _swap_roles(self):
+        """Swap the hands of the first two controllers"""
+        if 1 not in self.roles or 2 not in self.roles:
+            return
+        self.roles[1], self.roles[2] = self.roles[2], self.roles[1]
+        self._events.append((openvr.VREvent_TrackedDeviceRoleChanged, 1))
+        self._events.append((openvr.VREvent_TrackedDeviceRoleChanged, 2))
+        self.role_changes += 1
+        
+
+class SyntheticBackend(VRBackend):
+    """Headless backend generating procedural poses, for load tests without SteamVR"""
+    
+    name = "Synthetic VR"
+    
+    def __init__(self, deterministic_clock: bool = True, **system_params):
+        """
+        Args:
+            deterministic_clock: Drive frame timestamps from the synthetic frame counter
+            system_params: Parameters for SyntheticVRSystem
+        """
+        self.deterministic_clock = deterministic_clock
+        self.system_params = system_params
+        self.vr_system = None
+        
+    def init(self):
+        self.vr_system = SyntheticVRSystem(**self.system_params)
+        if self.deterministic_clock:
+            self.clock = self.vr_system.clock
+        return self.vr_system
+        
+    def shutdown(self):
+        self.vr_system = None
+        self.clock = None
+        
+
+def create_backend(config: Dict) -> VRBackend:
+    """
+    Create the VR backend selected in the configuration
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        VRBackend instance
+    """
+    backend_type = config.get('vr_backend', 'openvr')
+    if backend_type == 'synthetic':
+        return SyntheticBackend(
+            controllers=config.get('synthetic_controllers', 2),
+            trackers=config.get('synthetic_trackers', 0),
+            frame_rate=config.get('synthetic_frame_rate', 90.0),
+            dropout_rate=config.get('synthetic_dropout_rate', 0.0),
+            dropout_frames=config.get('synthetic_dropout_frames', 10),
+            role_swap_interval=config.get('synthetic_role_swap_interval', 0.0),
+            seed=config.get('synthetic_seed', 0)
+        )
+    elif backend_type == 'openvr':
+        return OpenVRBackend()
+    else:
+        raise ValueError(f"Unknown VR backend: {backend_type}")
+        
+
+class LoadTestBenchmark:
+    """Runs the full tracking loop against the synthetic backend"""
+    
+    # Pipeline stages reported by the profiler: label -> (module, function)
+    STAGES = {
+        'device_poll': ('device_registry.py', 'poll'),
+        'pose_fetch': ('pose_acquisition.py', 'fetch'),
+        'synthetic_generation': ('vr_backend.py', 'getDeviceToAbsoluteTrackingPose'),
+        'kernel_load': ('pose_math.py', 'load_buffer'),
+        'prediction': ('pose_prediction.py', 'predict'),
+        'pose_solve': ('pose_math.py', 'solve'),
+        'smooth_position': ('data_smoothing.py', 'smooth_position'),
+        'smooth_rotation': ('data_smoothing.py', 'smooth_quaternion'),
+        'output': ('tracker_logic.py', 'update_tracking_data'),
+        'gestures': ('gesture_recognition.py', 'update'),
+        'status': ('tracker_logic.py', 'update_status'),
+        'pacing': ('frame_scheduler.py', 'wait')
+    }
+    
+    @staticmethod
+    def benchmark_tracking_loop(tracker, frames: int = 10000, profile: bool = False,
+                                **system_params) -> Dict:
+        """
+        Run the tracking loop unpaced for a number of synthetic frames
+        
+        Args:
+            tracker: TrackerLogic instance (its configured outputs are written)
+            frames: Number of frames to run
+            profile: Also report per-stage cost with cProfile (adds overhead)
+            system_params: Parameters for SyntheticVRSystem
+            
+        Returns:
+            Dictionary with benchmark results
+        """
+        saved = (tracker.backend, tracker.config_variables.get('pacing'))
+        backend = SyntheticBackend(**system_params)
+        tracker.backend = backend
+        tracker.config_variables['pacing'] = 'none'
+        
+        if not tracker.init_vr():
+            tracker.backend = saved[0]
+            tracker.config_variables['pacing'] = saved[1]
+            raise RuntimeError("Synthetic backend failed to initialize")
+            
+        system = tracker.vr_system
+        system.max_frames = frames
+        system.on_finished = lambda: setattr(tracker, 'running', False)
+        
+        profiler = None
+        if profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            
+        start = time.perf_counter()
+        try:
+            tracker.running = True
+            if profiler:
+                profiler.runcall(tracker._tracking_loop)
+            else:
+                tracker._tracking_loop()
+        finally:
+            elapsed = time.perf_counter() - start
+            tracker.running = False
+            results = {
+                'frames': system.frame,
+                'elapsed_s': elapsed,
+                'frames_per_second': system.frame / elapsed if elapsed > 0 else 0.0,
+                'avg_frame_time_ms': (elapsed / system.frame) * 1000 if system.frame else 0.0,
+                'generation_ms_per_frame': (system.generation_time / system.frame) * 1000 if system.frame else 0.0,
+                'device_scans': tracker.device_registry.scan_count if tracker.device_registry else 0,
+                'dropouts': system.dropouts,
+                'role_changes': system.role_changes
+            }
+            backend.shutdown()
+            tracker.vr_system = None
+            tracker.clock = time.perf_counter
+            tracker.backend = saved[0]
+            tracker.config_variables['pacing'] = saved[1]
+            
+        if profiler:
+            import os
+            import pstats
+            stats = pstats.Stats(profiler).stats
+            stage_ms = {}
+            for label, (module, function) in LoadTestBenchmark.STAGES.items():
+                total = 0.0
+                for (filename, _, name), (_, _, _, cumulative, _) in stats.items():
+                    if name == function and os.path.basename(filename) == module:
+                        total += cumulative
+                stage_ms[label] = (total / max(system.frame, 1)) * 1000
+            results['stage_ms_per_frame'] = stage_ms
+            
+        return results